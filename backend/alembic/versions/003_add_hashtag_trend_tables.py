@@ -0,0 +1,55 @@
+# backend/alembic/versions/003_add_hashtag_trend_tables.py
+
+"""Add hashtag trend tables
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Hourly usage/success counters per platform + category + tag
+    op.create_table(
+        'hashtag_stats',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('platform', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False, server_default='default'),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.Column('uses', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('successes', sa.Integer(), nullable=False, server_default='0'),
+        sa.UniqueConstraint('platform', 'category', 'bucket_start', 'tag', name='uq_hashtag_stats_bucket'),
+    )
+    op.create_index('ix_hashtag_stats_bucket_start', 'hashtag_stats', ['bucket_start'])
+
+    # Compact top-k per platform + category + window, served by the optimizer
+    op.create_table(
+        'trending_hashtags',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('platform', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False, server_default='default'),
+        sa.Column('window', sa.String(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.Column('uses', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('success_rate', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('computed_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index(
+        'ix_trending_hashtags_lookup', 'trending_hashtags',
+        ['platform', 'category', 'window', 'rank'],
+    )
+
+
+def downgrade():
+    op.drop_table('trending_hashtags')
+    op.drop_table('hashtag_stats')
@@ -0,0 +1,30 @@
+# backend/alembic/versions/004_add_rate_limit_counters.py
+
+"""Add rate limit counters
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fixed-window counters; the limiter weights the previous window for a sliding estimate
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(), primary_key=True),
+        sa.Column('window_start', sa.DateTime(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_rate_limit_counters_window_start', 'rate_limit_counters', ['window_start'])
+
+
+def downgrade():
+    op.drop_table('rate_limit_counters')
@@ -0,0 +1,27 @@
+# backend/alembic/versions/006_add_email_outbox_templates.py
+
+"""Store template name and values for outbox emails
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('email_outbox', sa.Column('template', sa.String(), nullable=True))
+    op.add_column('email_outbox', sa.Column('context', sa.JSON(), nullable=True))
+    op.alter_column('email_outbox', 'html_content', existing_type=sa.Text(), nullable=True)
+
+
+def downgrade():
+    op.alter_column('email_outbox', 'html_content', existing_type=sa.Text(), nullable=False)
+    op.drop_column('email_outbox', 'context')
+    op.drop_column('email_outbox', 'template')
@@ -0,0 +1,32 @@
+# backend/alembic/versions/007_add_unverified_users_index.py
+
+"""Partial index for unverified account cleanup
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY: users bleibt während des Index-Builds beschreibbar
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_unverified_created_at',
+            'users',
+            ['created_at'],
+            postgresql_where=sa.text('is_verified = false'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_unverified_created_at', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+# backend/alembic/versions/008_add_video_media_metadata.py
+
+"""Store probed media metadata on videos
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+MEDIA_COLUMNS = [
+    ('duration_seconds', sa.Float()),
+    ('width', sa.Integer()),
+    ('height', sa.Integer()),
+    ('rotation', sa.Integer()),
+    ('video_codec', sa.String()),
+    ('audio_codec', sa.String()),
+    ('bitrate', sa.Integer()),
+    ('frame_rate', sa.Float()),
+]
+
+
+def upgrade():
+    for name, column_type in MEDIA_COLUMNS:
+        op.add_column('videos', sa.Column(name, column_type, nullable=True))
+
+
+def downgrade():
+    for name, _ in reversed(MEDIA_COLUMNS):
+        op.drop_column('videos', name)
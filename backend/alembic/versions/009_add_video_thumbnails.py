@@ -0,0 +1,29 @@
+# backend/alembic/versions/009_add_video_thumbnails.py
+
+"""Content hash, cover frame and thumbnail frames on videos
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('videos', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('videos', sa.Column('cover_timestamp_ms', sa.Integer(), nullable=True))
+    op.add_column('videos', sa.Column('thumbnail_frames', sa.JSON(), nullable=True))
+    op.create_index('ix_videos_content_hash', 'videos', ['content_hash'])
+
+
+def downgrade():
+    op.drop_index('ix_videos_content_hash', table_name='videos')
+    op.drop_column('videos', 'thumbnail_frames')
+    op.drop_column('videos', 'cover_timestamp_ms')
+    op.drop_column('videos', 'content_hash')
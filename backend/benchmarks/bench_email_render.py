@@ -0,0 +1,77 @@
+"""
+Benchmark: Rendern + MIME-Kodieren einer Email
+
+Vergleicht den bisherigen Weg (HTML per f-String/format, Text separat,
+MIMEMultipart + MIMEText bei jedem Versand) mit den vorkompilierten Templates
+aus services.email_templates (vorkodierte Skelette, nur Platzhalter werden
+pro Email kodiert).
+
+Kein SMTP nötig.
+
+Aufruf (aus backend/):
+    python -m benchmarks.bench_email_render --iterations 2000
+"""
+import argparse
+import statistics
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from services.email_templates import EMAIL_TEMPLATES, VERIFICATION_HTML, html_to_text
+
+
+# Text-Variante wie bisher handgeschrieben, also nicht pro Email erzeugen
+LEGACY_TEXT = html_to_text(VERIFICATION_HTML)
+
+
+def _legacy_message(to_email: str, values: dict) -> bytes:
+    html_content = VERIFICATION_HTML.format(**values)
+    text_content = LEGACY_TEXT.format(**values)
+    message = MIMEMultipart("alternative")
+    message["Subject"] = "Bestätige deine Email-Adresse"
+    message["From"] = "SocialHub <support@example.com>"
+    message["To"] = to_email
+    message.attach(MIMEText(text_content, "plain"))
+    message.attach(MIMEText(html_content, "html"))
+    return message.as_bytes()
+
+
+def _measure(fn, iterations: int) -> list[float]:
+    timings = []
+    for index in range(iterations):
+        start = time.perf_counter()
+        fn(index)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def _report(label: str, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{label:<34} mean={statistics.mean(timings):8.1f} µs  "
+        f"p50={statistics.median(timings):8.1f} µs  p95={p95:8.1f} µs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Email rendering benchmark")
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    template = EMAIL_TEMPLATES["verification"]
+
+    def values(index: int) -> dict:
+        return {"verification_url": f"https://app.example.com/verify-email?token=token{index:040d}"}
+
+    before = _measure(lambda i: _legacy_message(f"user{i}@example.com", values(i)), args.iterations)
+    after = _measure(lambda i: template.render_message(f"user{i}@example.com", values(i)), args.iterations)
+
+    print(f"Iterations: {args.iterations}")
+    _report("before: format + MIMEMultipart", before)
+    _report("after:  render_message()", after)
+    print(f"Speedup (mean): {statistics.mean(before) / statistics.mean(after):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
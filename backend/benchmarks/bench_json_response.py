@@ -0,0 +1,123 @@
+"""
+Benchmark: Serialisieren der Video-Liste (/api/upload/videos/user/{id})
+
+Vergleicht den bisherigen Weg (dict pro Zeile mit isoformat(), dann FastAPIs
+jsonable_encoder + stdlib json wie in JSONResponse) mit den slots-Dataclasses
+aus models.responses, die FastJSONResponse direkt per orjson rendert.
+
+Keine Datenbank nötig (VideoModel-Instanzen im Speicher).
+
+Aufruf (aus backend/):
+    python -m benchmarks.bench_json_response --videos 500 --iterations 200
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from models.database import VideoModel
+from models.responses import VideoItem, VideoList
+from services.thumbnail_service import thumbnail_store
+from utils.json_response import FastJSONResponse
+
+
+def _videos(count: int) -> list[VideoModel]:
+    now = datetime(2024, 6, 1, 12, 0, 0)
+    return [
+        VideoModel(
+            id=f"video-{i:06d}",
+            user_id="user-1",
+            title=f"Video Nummer {i} – Behind the Scenes",
+            description="Ein etwas längerer Beschreibungstext mit Umlauten: äöü ß " * 3,
+            platforms=["youtube", "tiktok", "instagram"],
+            tags=["vlog", "travel", "shorts", f"tag{i}"],
+            privacy_status="public",
+            status="uploaded",
+            upload_results={
+                "youtube": {"success": True, "video_id": f"yt{i}", "url": f"https://youtu.be/yt{i}"},
+                "tiktok": {"success": True, "publish_id": f"tt{i}"},
+                "instagram": {"success": True, "media_id": f"ig{i}"},
+            },
+            errors=None,
+            content_hash=f"{i:064x}",
+            thumbnail_frames=[1000, 4000, 8000],
+            created_at=now - timedelta(minutes=i),
+            updated_at=now - timedelta(minutes=i, seconds=-30),
+        )
+        for i in range(count)
+    ]
+
+
+def _legacy(user_id: str, videos: list[VideoModel]) -> bytes:
+    content = {
+        "user_id": user_id,
+        "total": len(videos),
+        "videos": [
+            {
+                "video_id": v.id,
+                "title": v.title,
+                "description": v.description,
+                "status": v.status,
+                "platforms": v.platforms,
+                "tags": v.tags,
+                "privacy_status": v.privacy_status,
+                "upload_results": v.upload_results or {},
+                "errors": v.errors,
+                "thumbnails": thumbnail_store.urls(v),
+                "created_at": v.created_at.isoformat(),
+                "updated_at": v.updated_at.isoformat() if v.updated_at else None
+            }
+            for v in videos
+        ]
+    }
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def _fast(user_id: str, videos: list[VideoModel]) -> bytes:
+    items = [VideoItem.from_model(v, thumbnail_store.urls(v)) for v in videos]
+    return FastJSONResponse(VideoList.from_items(user_id, items)).body
+
+
+def _measure(fn, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{label:<40} mean={statistics.mean(timings):7.2f} ms  "
+        f"p50={statistics.median(timings):7.2f} ms  p95={p95:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Video list serialisation benchmark")
+    parser.add_argument("--videos", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    videos = _videos(args.videos)
+    if json.loads(_legacy("user-1", videos)) != json.loads(_fast("user-1", videos)):
+        print("⚠️ Ausgabe weicht vom bisherigen Format ab")
+
+    before = _measure(lambda: _legacy("user-1", videos), args.iterations)
+    after = _measure(lambda: _fast("user-1", videos), args.iterations)
+
+    print(f"Videos: {args.videos}, Iterations: {args.iterations}")
+    _report("before: dict + jsonable_encoder + json", before)
+    _report("after:  slots dataclass + orjson", after)
+    print(f"Speedup (mean): {statistics.mean(before) / statistics.mean(after):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: YouTube Client-Setup pro Upload
+
+Vergleicht den Setup-Aufwand von `googleapiclient.discovery.build()` (Discovery-
+Dokument wird bei jedem Aufruf geladen und geparst) mit `build_youtube_service()`
+(einmal geparstes, mitgeliefertes Dokument).
+
+Kein Netzwerk nötig – es werden Dummy-Credentials verwendet.
+
+Aufruf (aus backend/):
+    python -m benchmarks.bench_youtube_client --iterations 200
+"""
+import argparse
+import statistics
+import time
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from services.youtube_service import build_youtube_service, _load_discovery_document
+
+
+def _measure(fn, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{label:<32} mean={statistics.mean(timings):8.3f} ms  "
+        f"p50={statistics.median(timings):8.3f} ms  p95={p95:8.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YouTube client setup benchmark")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    credentials = Credentials(token="dummy-token")
+
+    # Erster Aufruf enthält das einmalige Parsen – separat ausweisen
+    start = time.perf_counter()
+    _load_discovery_document()
+    first_load_ms = (time.perf_counter() - start) * 1000
+
+    before = _measure(lambda: build("youtube", "v3", credentials=credentials), args.iterations)
+    after = _measure(lambda: build_youtube_service(credentials), args.iterations)
+
+    print(f"Iterations: {args.iterations}")
+    print(f"Einmaliges Laden des Discovery-Dokuments: {first_load_ms:.3f} ms")
+    _report("before: discovery.build()", before)
+    _report("after:  build_youtube_service()", after)
+    print(f"Speedup (mean): {statistics.mean(before) / statistics.mean(after):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
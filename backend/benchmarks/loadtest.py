@@ -0,0 +1,658 @@
+"""
+Lasttest: End-to-End Benchmark gegen App + Mock-Plattformen
+
+Startet die Mock-Server (benchmarks.mock_platforms), die App mit mehreren
+uvicorn-Workern gegen eine lokale Postgres, legt Benchmark-User samt
+Plattform-Tokens an und fährt einen realistischen Mix:
+
+- upload:      parallele große Uploads (alle drei Plattformen)
+- upload_e2e:  Upload-Request bis Endstatus (uploaded/partial/failed)
+- status:      Status-Polling einzelner Videos und der Video-Liste
+- login:       Login-Bursts (bcrypt) mit unterschiedlichen Client-IPs
+- optimizer:   /api/optimizer/suggest (OpenAI-Mock)
+- register:    Registrierungen (Verification-Email über den SMTP-Mock)
+
+Ausgabe: Durchsatz, p50/p95/p99 pro Szenario und RSS pro Worker. Mit
+--json-out wird das Ergebnis gespeichert, mit --baseline gegen einen früheren
+Lauf verglichen (Exit-Code 1 bei Regression).
+
+Voraussetzungen:
+    Lokale Postgres mit den init-scripts (pgcrypto-Funktionen), z.B.
+    `docker compose up postgres`. Die Tabellen legt die App beim Start an.
+
+Aufruf (aus backend/):
+    python -m benchmarks.loadtest --database-url postgresql://... --duration 60
+    python -m benchmarks.loadtest --database-url ... --json-out main.json
+    python -m benchmarks.loadtest --database-url ... --baseline main.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import signal
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TERMINAL_STATUSES = {"uploaded", "partial", "failed"}
+BENCH_PASSWORD = "LoadTest-Password-1"
+
+
+# ==========================================
+# Messwerte
+# ==========================================
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, scenario: str, seconds: float, ok: bool, status: str):
+        self.latencies[scenario].append(seconds)
+        self.statuses[scenario][status] += 1
+        if not ok:
+            self.errors[scenario] += 1
+
+    def summary(self, duration: float) -> Dict[str, dict]:
+        result = {}
+        for scenario, values in sorted(self.latencies.items()):
+            result[scenario] = {
+                "count": len(values),
+                "errors": self.errors[scenario],
+                "rps": round(len(values) / duration, 3),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1),
+                "statuses": dict(self.statuses[scenario]),
+            }
+        return result
+
+
+async def timed_request(recorder: Recorder, scenario: str, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        recorder.record(scenario, time.perf_counter() - start, False, type(e).__name__)
+        return None
+    recorder.record(scenario, time.perf_counter() - start, response.status_code < 400, str(response.status_code))
+    return response
+
+
+def fake_client_ip() -> str:
+    return f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
+
+
+# ==========================================
+# Prozesse
+# ==========================================
+
+def start_process(args: List[str], env: dict, log_path: Path) -> subprocess.Popen:
+    log = open(log_path, "wb")
+    return subprocess.Popen(args, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+
+
+def stop_process(process: Optional[subprocess.Popen]):
+    if process is None or process.poll() is not None:
+        return
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+async def wait_for_http(url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"{url} nicht erreichbar nach {timeout}s")
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    """Kindprozesse des uvicorn-Masters (aus /proc)"""
+    pids = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # Feld 4 (ppid) steht nach dem geklammerten Prozessnamen
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        if ppid != master_pid:
+            continue
+        try:
+            cmdline = (entry / "cmdline").read_bytes()
+        except OSError:
+            continue
+        if b"resource_tracker" not in cmdline:
+            pids.append(int(entry.name))
+    return sorted(pids)
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+async def sample_memory(master_pid: int, samples: Dict[int, List[float]], stop: asyncio.Event):
+    while not stop.is_set():
+        # Ohne --workers > 1 gibt es keine Kindprozesse → Master messen
+        pids = worker_pids(master_pid) or [master_pid]
+        for pid in pids:
+            value = rss_mb(pid)
+            if value is not None:
+                samples[pid].append(value)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+# ==========================================
+# Testdaten
+# ==========================================
+
+def seed_users(count: int, domain: str, mock_url: str) -> List[str]:
+    """Legt verifizierte User mit YouTube/TikTok/Instagram-Tokens an"""
+    import bcrypt
+    from google.oauth2.credentials import Credentials
+
+    from config import settings
+    from models.database import SessionLocal, UserModel
+    from services.token_storage import TokenStorage
+
+    token_storage = TokenStorage()
+    hashed = bcrypt.hashpw(BENCH_PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode("utf-8")
+    user_ids = []
+
+    db = SessionLocal()
+    try:
+        for index in range(count):
+            user_id = f"user_{secrets.token_hex(8)}"
+            db.add(UserModel(
+                id=user_id,
+                email=f"bench-{index}@{domain}",
+                hashed_password=hashed,
+                username=f"bench-{index}",
+                is_verified=True,
+            ))
+            user_ids.append(user_id)
+        db.commit()
+    finally:
+        db.close()
+
+    for user_id in user_ids:
+        token_storage.save_youtube_credentials(user_id, Credentials(
+            token=f"ya29.{secrets.token_hex(16)}",
+            refresh_token=f"1//{secrets.token_hex(16)}",
+            token_uri=f"{mock_url}/token",
+            client_id="loadtest",
+            client_secret="loadtest",
+            scopes=["https://www.googleapis.com/auth/youtube.upload"],
+        ), channel_title="Load Test", channel_id=f"UC{secrets.token_hex(8)}")
+        token_storage.save_tiktok_credentials(
+            user_id, f"act.{secrets.token_hex(16)}", f"open_{secrets.token_hex(8)}",
+            f"rft.{secrets.token_hex(16)}", expires_in=30 * 86400
+        )
+        token_storage.save_instagram_credentials(user_id, f"IGQ{secrets.token_hex(24)}", str(random.randint(10 ** 16, 10 ** 17)))
+    return user_ids
+
+
+def _box(box_type: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), box_type) + body
+
+
+def write_upload_fixture(path: Path, size_mb: int, duration: int = 30, fps: int = 30, width: int = 1080, height: int = 1920):
+    """
+    Minimale, aber gültige MP4 (ftyp + moov + mdat), aufgefüllt auf size_mb
+
+    Der Box-Parser im Ingest (media_probe_service) liest daraus 1080x1920 H.264,
+    30 s, 30 fps – alle Preflight-Regeln bestehen. Die Samples selbst sind
+    Zufallsbytes (nicht abspielbar, nicht komprimierbar).
+    """
+    identity_matrix = struct.pack(">9i", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+    frames = duration * fps
+    ftyp = _box(b"ftyp", b"isom", struct.pack(">I", 0x200), b"isomiso2avc1mp41")
+    mvhd = _box(
+        b"mvhd", struct.pack(">IIIII", 0, 0, 0, 1000, duration * 1000),
+        struct.pack(">IH10x", 0x10000, 0x100), identity_matrix, bytes(24), struct.pack(">I", 2)
+    )
+    tkhd = _box(
+        b"tkhd", struct.pack(">IIIIII", 3, 0, 0, 1, 0, duration * 1000),
+        bytes(8), struct.pack(">hhhh", 0, 0, 0, 0), identity_matrix, struct.pack(">II", width << 16, height << 16)
+    )
+    mdhd = _box(b"mdhd", struct.pack(">IIIIIHH", 0, 0, 0, fps, frames, 0x55C4, 0))
+    hdlr = _box(b"hdlr", struct.pack(">II4s12x", 0, 0, b"vide"), b"VideoHandler\0")
+    avc1 = _box(
+        b"avc1", bytes(6), struct.pack(">H16xHHIII", 1, width, height, 0x480000, 0x480000, 0),
+        struct.pack(">H", 1), bytes(32), struct.pack(">Hh", 0x18, -1)
+    )
+    stsd = _box(b"stsd", struct.pack(">II", 0, 1), avc1)
+    stts = _box(b"stts", struct.pack(">IIII", 0, 1, frames, 1))
+    trak = _box(b"trak", tkhd, _box(b"mdia", mdhd, hdlr, _box(b"minf", _box(b"stbl", stsd, stts))))
+    moov = _box(b"moov", mvhd, trak)
+
+    mdat_size = max(8, size_mb * 1024 * 1024 - len(ftyp) - len(moov))
+    with open(path, "wb") as f:
+        f.write(ftyp + moov + struct.pack(">I4s", mdat_size, b"mdat"))
+        remaining = mdat_size - 8
+        while remaining > 0:
+            chunk = min(remaining, 1024 * 1024)
+            f.write(os.urandom(chunk))
+            remaining -= chunk
+
+
+def cleanup_users(domain: str):
+    from models.database import SessionLocal, UserModel, VideoModel, PlatformConnection, EmailOutbox
+
+    db = SessionLocal()
+    try:
+        user_ids = [row.id for row in db.query(UserModel.id).filter(UserModel.email.like(f"%@{domain}"))]
+        if user_ids:
+            db.query(VideoModel).filter(VideoModel.user_id.in_(user_ids)).delete(synchronize_session=False)
+            db.query(PlatformConnection).filter(PlatformConnection.user_id.in_(user_ids)).delete(synchronize_session=False)
+            db.query(UserModel).filter(UserModel.id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(EmailOutbox).filter(EmailOutbox.to_email.like(f"%@{domain}")).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+# ==========================================
+# Szenarien
+# ==========================================
+
+class LoadTest:
+    def __init__(self, args, app_url: str, users: List[dict], video_file: Path, domain: str):
+        self.args = args
+        self.app_url = app_url
+        self.users = users
+        self.video_file = video_file
+        self.domain = domain
+        self.recorder = Recorder()
+        self.video_ids: List[str] = []
+        self.stop = asyncio.Event()
+        self._e2e_tasks = set()
+
+    async def _track_upload(self, client: httpx.AsyncClient, video_id: str, started: float):
+        """Pollt den Status bis zum Endzustand (zählt gleichzeitig als Status-Traffic)"""
+        deadline = started + self.args.upload_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(1.0)
+            response = await timed_request(self.recorder, "status", client, "GET", f"/api/upload/video/{video_id}")
+            if response is not None and response.status_code == 200:
+                status = response.json().get("status")
+                if status in TERMINAL_STATUSES:
+                    self.recorder.record("upload_e2e", time.monotonic() - started, status != "failed", status)
+                    return
+        self.recorder.record("upload_e2e", time.monotonic() - started, False, "timeout")
+
+    async def uploader(self, client: httpx.AsyncClient):
+        while not self.stop.is_set():
+            user = random.choice(self.users)
+            started = time.monotonic()
+            with open(self.video_file, "rb") as video:
+                response = await timed_request(
+                    self.recorder, "upload", client, "POST", "/api/upload/upload_video",
+                    data={
+                        "user_id": user["id"],
+                        "title": f"Load test {secrets.token_hex(4)}",
+                        "description": "Benchmark upload",
+                        "tags": "loadtest,benchmark",
+                        "platforms": self.args.platforms,
+                    },
+                    files={"video": ("loadtest.mp4", video, "video/mp4")},
+                )
+            if response is not None and response.status_code == 200:
+                video_id = response.json()["video_id"]
+                self.video_ids.append(video_id)
+                task = asyncio.create_task(self._track_upload(client, video_id, started))
+                self._e2e_tasks.add(task)
+                task.add_done_callback(self._e2e_tasks.discard)
+            else:
+                await asyncio.sleep(1.0)
+
+    async def poller(self, client: httpx.AsyncClient):
+        while not self.stop.is_set():
+            if self.video_ids and random.random() < 0.8:
+                await timed_request(self.recorder, "status", client, "GET", f"/api/upload/video/{random.choice(self.video_ids)}")
+            else:
+                user = random.choice(self.users)
+                await timed_request(self.recorder, "status", client, "GET", f"/api/upload/videos/user/{user['id']}")
+            await asyncio.sleep(self.args.poll_interval)
+
+    async def login_bursts(self, client: httpx.AsyncClient):
+        while not self.stop.is_set():
+            await asyncio.gather(*(
+                timed_request(
+                    self.recorder, "login", client, "POST", "/api/auth/login",
+                    json={"email": user["email"], "password": BENCH_PASSWORD},
+                    headers={"X-Forwarded-For": fake_client_ip()},
+                )
+                for user in random.sample(self.users, min(self.args.login_burst, len(self.users)))
+            ))
+            try:
+                await asyncio.wait_for(self.stop.wait(), timeout=self.args.login_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def optimizer(self, client: httpx.AsyncClient, user: dict):
+        response = await client.post(
+            "/api/auth/login",
+            json={"email": user["email"], "password": BENCH_PASSWORD},
+            headers={"X-Forwarded-For": fake_client_ip()},
+        )
+        if response.status_code != 200:
+            self.recorder.record("optimizer", 0.0, False, f"login-{response.status_code}")
+            return
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        while not self.stop.is_set():
+            await timed_request(
+                self.recorder, "optimizer", client, "POST", "/api/optimizer/suggest",
+                headers=headers,
+                json={
+                    "user_id": user["id"],
+                    "title_draft": "Wie ich in 10 Minuten Pasta koche",
+                    "description_draft": "Schnelles Rezept für jeden Tag.",
+                    "category": "food",
+                    "platforms": ["youtube", "tiktok", "instagram"],
+                    "video_duration": 45,
+                },
+            )
+
+    async def registrations(self, client: httpx.AsyncClient):
+        interval = 60.0 / self.args.registrations_per_min
+        while not self.stop.is_set():
+            await timed_request(
+                self.recorder, "register", client, "POST", "/api/auth/register",
+                json={"email": f"reg-{secrets.token_hex(6)}@{self.domain}", "password": BENCH_PASSWORD},
+                headers={"X-Forwarded-For": fake_client_ip()},
+            )
+            try:
+                await asyncio.wait_for(self.stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self) -> float:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+        async with httpx.AsyncClient(base_url=self.app_url, timeout=self.args.request_timeout, limits=limits) as client:
+            tasks = [asyncio.create_task(self.uploader(client)) for _ in range(self.args.uploaders)]
+            tasks += [asyncio.create_task(self.poller(client)) for _ in range(self.args.pollers)]
+            tasks += [asyncio.create_task(self.optimizer(client, user)) for user in self.users[:self.args.optimizer_clients]]
+            if self.args.login_burst:
+                tasks.append(asyncio.create_task(self.login_bursts(client)))
+            if self.args.registrations_per_min:
+                tasks.append(asyncio.create_task(self.registrations(client)))
+
+            started = time.monotonic()
+            await asyncio.sleep(self.args.duration)
+            self.stop.set()
+            duration = time.monotonic() - started
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Laufende Uploads noch bis zum Endstatus verfolgen
+            if self._e2e_tasks:
+                await asyncio.gather(*list(self._e2e_tasks), return_exceptions=True)
+            return duration
+
+
+# ==========================================
+# Report / Baseline
+# ==========================================
+
+def print_report(result: dict):
+    print(f"\nDauer: {result['duration_s']:.1f}s  Worker: {result['config']['workers']}  "
+          f"Upload-Größe: {result['config']['upload_mb']} MB")
+    print(f"{'scenario':<12}{'count':>8}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for scenario, stats in result["scenarios"].items():
+        print(
+            f"{scenario:<12}{stats['count']:>8}{stats['errors']:>8}{stats['rps']:>9.2f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+        )
+    print("\nRSS pro Worker:")
+    for worker in result["workers"]:
+        print(f"  pid {worker['pid']:<8} start={worker['rss_start_mb']:.1f} MB  peak={worker['rss_peak_mb']:.1f} MB  "
+              f"ende={worker['rss_end_mb']:.1f} MB")
+    print(f"\nMock-Plattformen: {json.dumps(result['mock'])}")
+
+
+def compare_baseline(result: dict, baseline: dict, max_regression: float) -> List[str]:
+    """p95 höher oder Durchsatz niedriger als die Baseline (+ Toleranz) → Regression"""
+    regressions = []
+    for scenario, before in baseline.get("scenarios", {}).items():
+        after = result["scenarios"].get(scenario)
+        if after is None:
+            regressions.append(f"{scenario}: fehlt im aktuellen Lauf")
+            continue
+        if before["p95_ms"] and after["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{scenario}: p95 {before['p95_ms']:.1f} → {after['p95_ms']:.1f} ms")
+        if before["rps"] and after["rps"] < before["rps"] * (1 - max_regression):
+            regressions.append(f"{scenario}: rps {before['rps']:.2f} → {after['rps']:.2f}")
+        before_error_rate = before["errors"] / max(before["count"], 1)
+        after_error_rate = after["errors"] / max(after["count"], 1)
+        if after_error_rate > before_error_rate + 0.01:
+            regressions.append(f"{scenario}: Fehlerquote {before_error_rate:.1%} → {after_error_rate:.1%}")
+
+    peak_before = max((w["rss_peak_mb"] for w in baseline.get("workers", [])), default=0)
+    peak_after = max((w["rss_peak_mb"] for w in result["workers"]), default=0)
+    if peak_before and peak_after > peak_before * (1 + max_regression):
+        regressions.append(f"RSS peak {peak_before:.1f} → {peak_after:.1f} MB")
+    return regressions
+
+
+# ==========================================
+# Main
+# ==========================================
+
+async def run(args) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="smm-loadtest-"))
+    mock_url = f"http://127.0.0.1:{args.mock_http_port}"
+    app_url = f"http://127.0.0.1:{args.app_port}"
+    domain = f"lt-{secrets.token_hex(3)}.example.com"
+
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": args.database_url,
+        "BACKEND_URL": app_url,
+        "JWT_SECRET": env.get("JWT_SECRET") or secrets.token_hex(32),
+        "ENCRYPTION_KEY": env.get("ENCRYPTION_KEY") or "loadtest-encryption-key",
+        "TEMP_DIR": str(workdir / "temp"),
+        "DATA_DIR": str(workdir / "data"),
+        "TOKEN_DIR": str(workdir / "tokens"),
+        "PROMETHEUS_MULTIPROC_DIR": str(workdir / "prometheus"),
+        "MEDIA_SIGNING_KEY": secrets.token_hex(16),
+        "YOUTUBE_API_ROOT": f"{mock_url}/",
+        "TIKTOK_API_BASE": mock_url,
+        "INSTAGRAM_GRAPH_BASE": mock_url,
+        "OPENAI_BASE_URL": f"{mock_url}/v1",
+        "OPENAI_API_KEY": "loadtest",
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(args.mock_smtp_port),
+        "SMTP_STARTTLS": "false",
+        "SMTP_USER": "",
+        "FROM_EMAIL": "noreply@loadtest.example.com",
+        "EMAIL_OUTBOX_POLL_SECONDS": "1",
+        "ENVIRONMENT": "loadtest",
+        "DEBUG": "false",
+    })
+    if args.bcrypt_rounds:
+        env["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    for name in ("temp", "data", "tokens", "prometheus"):
+        (workdir / name).mkdir()
+    # Seeding läuft in diesem Prozess → gleiche Konfiguration wie die App
+    os.environ.update(env)
+
+    mock_args = [
+        sys.executable, "-m", "benchmarks.mock_platforms",
+        "--http-port", str(args.mock_http_port), "--smtp-port", str(args.mock_smtp_port),
+        "--latency-ms", str(args.mock_latency_ms), "--jitter-ms", str(args.mock_jitter_ms),
+        "--failure-rate", str(args.mock_failure_rate),
+    ]
+    for profile in args.profile or []:
+        mock_args += ["--profile", profile]
+    app_args = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(args.app_port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+
+    mock_process = app_process = None
+    memory: Dict[int, List[float]] = defaultdict(list)
+    try:
+        mock_process = start_process(mock_args, env, workdir / "mock.log")
+        await wait_for_http(f"{mock_url}/_stats", 15)
+        app_process = start_process(app_args, env, workdir / "app.log")
+        await wait_for_http(f"{app_url}/health", 60)
+        print(f"✅ App + Mocks laufen (Logs: {workdir})")
+
+        user_ids = seed_users(args.users, domain, mock_url)
+        users = [{"id": user_id, "email": f"bench-{i}@{domain}"} for i, user_id in enumerate(user_ids)]
+        print(f"✅ {len(users)} Benchmark-User angelegt")
+
+        video_file = workdir / "upload.mp4"
+        write_upload_fixture(video_file, args.upload_mb)
+
+        memory_stop = asyncio.Event()
+        memory_task = asyncio.create_task(sample_memory(app_process.pid, memory, memory_stop))
+        load_test = LoadTest(args, app_url, users, video_file, domain)
+        print(f"🚀 Lasttest läuft ({args.duration}s) ...")
+        duration = await load_test.run()
+        memory_stop.set()
+        await memory_task
+
+        async with httpx.AsyncClient() as client:
+            mock_stats = (await client.get(f"{mock_url}/_stats")).json()
+
+        return {
+            "config": {
+                "workers": args.workers,
+                "duration": args.duration,
+                "uploaders": args.uploaders,
+                "upload_mb": args.upload_mb,
+                "platforms": args.platforms,
+                "pollers": args.pollers,
+                "login_burst": args.login_burst,
+                "optimizer_clients": args.optimizer_clients,
+                "registrations_per_min": args.registrations_per_min,
+                "mock_latency_ms": args.mock_latency_ms,
+                "mock_failure_rate": args.mock_failure_rate,
+            },
+            "duration_s": round(duration, 3),
+            "scenarios": load_test.recorder.summary(duration),
+            "workers": [
+                {
+                    "pid": pid,
+                    "rss_start_mb": round(values[0], 1),
+                    "rss_peak_mb": round(max(values), 1),
+                    "rss_end_mb": round(values[-1], 1),
+                    "rss_mean_mb": round(statistics.mean(values), 1),
+                }
+                for pid, values in sorted(memory.items()) if values
+            ],
+            "mock": mock_stats,
+        }
+    finally:
+        stop_process(app_process)
+        stop_process(mock_process)
+        if not args.keep_data:
+            try:
+                cleanup_users(domain)
+            except Exception as e:
+                print(f"⚠️ Aufräumen der Benchmark-Daten fehlgeschlagen: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test with mock platform APIs")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="lokale Postgres (Default: $DATABASE_URL)")
+    parser.add_argument("--duration", type=int, default=60, help="Sekunden Last")
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn Worker")
+    parser.add_argument("--app-port", type=int, default=8765)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--bcrypt-rounds", type=int, default=0, help="0 = Produktions-Default")
+
+    mix = parser.add_argument_group("Lastmix")
+    mix.add_argument("--uploaders", type=int, default=4, help="parallele Upload-Clients")
+    mix.add_argument("--upload-mb", type=int, default=50)
+    mix.add_argument("--platforms", default="youtube,tiktok,instagram")
+    mix.add_argument("--upload-timeout", type=float, default=600)
+    mix.add_argument("--pollers", type=int, default=20, help="Status-Polling Clients")
+    mix.add_argument("--poll-interval", type=float, default=0.5)
+    mix.add_argument("--login-burst", type=int, default=20, help="Logins pro Burst (0 = aus)")
+    mix.add_argument("--login-interval", type=float, default=10)
+    mix.add_argument("--optimizer-clients", type=int, default=2)
+    mix.add_argument("--registrations-per-min", type=float, default=6)
+    mix.add_argument("--request-timeout", type=float, default=300)
+
+    mocks = parser.add_argument_group("Mock-Plattformen")
+    mocks.add_argument("--mock-http-port", type=int, default=9100)
+    mocks.add_argument("--mock-smtp-port", type=int, default=9125)
+    mocks.add_argument("--mock-latency-ms", type=float, default=80)
+    mocks.add_argument("--mock-jitter-ms", type=float, default=30)
+    mocks.add_argument("--mock-failure-rate", type=float, default=0.0)
+    mocks.add_argument("--profile", action="append", help="SERVICE=LATENCY_MS[:FAILURE_RATE], siehe mock_platforms")
+
+    output = parser.add_argument_group("Ausgabe")
+    output.add_argument("--json-out", help="Ergebnis als JSON speichern")
+    output.add_argument("--baseline", help="früheres --json-out Ergebnis zum Vergleich")
+    output.add_argument("--max-regression", type=float, default=0.15, help="Toleranz (0.15 = 15%%)")
+    output.add_argument("--keep-data", action="store_true", help="Benchmark-User/Videos nicht löschen")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url oder DATABASE_URL erforderlich")
+
+    result = asyncio.run(run(args))
+    print_report(result)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(result, indent=2))
+        print(f"\n💾 Ergebnis gespeichert: {args.json_out}")
+
+    if args.baseline:
+        regressions = compare_baseline(result, json.loads(Path(args.baseline).read_text()), args.max_regression)
+        if regressions:
+            print("\n❌ Regressionen gegenüber Baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n✅ Keine Regression gegenüber Baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Mock-Server für die Plattform-APIs (Benchmarks / Lasttests)
+
+Ein Prozess, zwei Listener:
+- HTTP: YouTube Data API (resumable Upload + Delete), TikTok Open API
+  (Init, Datei-Upload, Token-Refresh, Status), Instagram Graph API (Container,
+  Status, Publish, Token-Refresh) und OpenAI Chat Completions
+- SMTP: minimaler Relay ohne TLS/Auth (Backend mit SMTP_STARTTLS=false)
+
+Latenz und Fehlerrate sind pro Dienst einstellbar. Fehler sind 503 (HTTP) bzw.
+451 (SMTP) – also die transienten Fehler, die das Backend in Produktion sieht.
+
+Der Instagram-Mock lädt das Video wie die echte API von der signierten URL
+herunter, bevor der Container auf FINISHED geht.
+
+Aufruf (aus backend/):
+    python -m benchmarks.mock_platforms --http-port 9100 --smtp-port 9125 \\
+        --latency-ms 80 --failure-rate 0.01 --profile youtube=400:0.02
+
+Zähler: GET /_stats
+"""
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+SERVICES = ("youtube", "tiktok", "instagram", "openai", "smtp")
+
+
+@dataclass
+class LatencyProfile:
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    failure_rate: float = 0.0
+
+    async def delay(self):
+        seconds = max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        await asyncio.sleep(seconds)
+
+    def should_fail(self) -> bool:
+        return random.random() < self.failure_rate
+
+
+class MockState:
+    def __init__(self, profiles: Dict[str, LatencyProfile]):
+        self.profiles = profiles
+        self.requests = defaultdict(int)
+        self.failures = defaultdict(int)
+        self.bytes_received = defaultdict(int)
+        self.smtp_messages = 0
+        self.containers: Dict[str, str] = {}
+
+    async def enter(self, service: str) -> bool:
+        """Latenz simulieren; False = diesen Request fehlschlagen lassen"""
+        self.requests[service] += 1
+        profile = self.profiles[service]
+        await profile.delay()
+        if profile.should_fail():
+            self.failures[service] += 1
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "requests": dict(self.requests),
+            "failures": dict(self.failures),
+            "bytes_received": dict(self.bytes_received),
+            "smtp_messages": self.smtp_messages,
+        }
+
+
+def _unavailable(service: str) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"code": 503, "message": f"{service} mock: simulated failure", "status": "UNAVAILABLE"}},
+        status_code=503,
+    )
+
+
+async def _drain(request: Request, service: str, state: MockState) -> int:
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+    state.bytes_received[service] += size
+    return size
+
+
+# ==========================================
+# HTTP Mocks
+# ==========================================
+
+def build_app(state: MockState) -> Starlette:
+
+    # ---------- YouTube ----------
+
+    async def youtube_start_upload(request: Request):
+        if not await state.enter("youtube"):
+            return _unavailable("youtube")
+        await request.body()
+        session = secrets.token_hex(8)
+        return Response(status_code=200, headers={"Location": f"{request.base_url}upload/youtube/v3/session/{session}"})
+
+    async def youtube_upload_session(request: Request):
+        size = await _drain(request, "youtube", state)
+        if not await state.enter("youtube"):
+            return _unavailable("youtube")
+        return JSONResponse({
+            "kind": "youtube#video",
+            "id": secrets.token_urlsafe(8),
+            "status": {"uploadStatus": "uploaded"},
+            "fileDetails": {"fileSize": str(size)},
+        })
+
+    async def youtube_delete(request: Request):
+        if not await state.enter("youtube"):
+            return _unavailable("youtube")
+        return Response(status_code=204)
+
+    # ---------- TikTok ----------
+
+    async def tiktok_init(request: Request):
+        if not await state.enter("tiktok"):
+            return _unavailable("tiktok")
+        await request.body()
+        publish_id = f"v_inbox_file~v2.{secrets.token_hex(8)}"
+        return JSONResponse({
+            "data": {"publish_id": publish_id, "upload_url": f"{request.base_url}tiktok/upload/{publish_id}"},
+            "error": {"code": "ok", "message": ""},
+        })
+
+    async def tiktok_upload(request: Request):
+        await _drain(request, "tiktok", state)
+        if not await state.enter("tiktok"):
+            return _unavailable("tiktok")
+        return Response(status_code=201)
+
+    async def tiktok_status(request: Request):
+        if not await state.enter("tiktok"):
+            return _unavailable("tiktok")
+        return JSONResponse({"data": {"status": "SEND_TO_USER_INBOX"}, "error": {"code": "ok"}})
+
+    async def tiktok_token(request: Request):
+        if not await state.enter("tiktok"):
+            return _unavailable("tiktok")
+        return JSONResponse({
+            "access_token": f"act.{secrets.token_hex(16)}",
+            "refresh_token": f"rft.{secrets.token_hex(16)}",
+            "expires_in": 86400,
+            "open_id": "mock-open-id",
+        })
+
+    # ---------- Instagram ----------
+
+    async def _ingest(container_id: str, video_url: str):
+        """Wie die Graph API: Video von der (signierten) URL laden"""
+        try:
+            async with httpx.AsyncClient(timeout=300) as client:
+                async with client.stream("GET", video_url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        state.bytes_received["instagram"] += len(chunk)
+            state.containers[container_id] = "FINISHED"
+        except Exception:
+            state.containers[container_id] = "ERROR"
+
+    async def instagram_create_container(request: Request):
+        if not await state.enter("instagram"):
+            return _unavailable("instagram")
+        form = await request.form()
+        container_id = str(random.randint(10 ** 16, 10 ** 17))
+        state.containers[container_id] = "IN_PROGRESS"
+        asyncio.create_task(_ingest(container_id, form.get("video_url", "")))
+        return JSONResponse({"id": container_id})
+
+    async def instagram_container_status(request: Request):
+        if not await state.enter("instagram"):
+            return _unavailable("instagram")
+        container_id = request.path_params["object_id"]
+        status = state.containers.get(container_id)
+        if status is None:
+            return JSONResponse({"error": {"message": "Unknown object", "code": 100}}, status_code=400)
+        return JSONResponse({"status_code": status, "id": container_id})
+
+    async def instagram_publish(request: Request):
+        if not await state.enter("instagram"):
+            return _unavailable("instagram")
+        form = await request.form()
+        state.containers.pop(form.get("creation_id", ""), None)
+        return JSONResponse({"id": str(random.randint(10 ** 16, 10 ** 17))})
+
+    async def instagram_token(request: Request):
+        if not await state.enter("instagram"):
+            return _unavailable("instagram")
+        return JSONResponse({"access_token": f"IGQ{secrets.token_hex(24)}", "token_type": "bearer", "expires_in": 5184000})
+
+    # ---------- OpenAI ----------
+
+    async def openai_chat(request: Request):
+        if not await state.enter("openai"):
+            return _unavailable("openai")
+        body = await request.json()
+        content = json.dumps({"title": "Optimized mock title", "description": "Optimized mock description #mock"})
+        return JSONResponse({
+            "id": f"chatcmpl-{secrets.token_hex(8)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 300, "completion_tokens": 40, "total_tokens": 340},
+        })
+
+    async def stats(request: Request):
+        return JSONResponse(state.stats())
+
+    return Starlette(routes=[
+        Route("/upload/youtube/v3/videos", youtube_start_upload, methods=["POST"]),
+        Route("/upload/youtube/v3/session/{session}", youtube_upload_session, methods=["PUT", "POST"]),
+        Route("/youtube/v3/videos", youtube_delete, methods=["DELETE"]),
+        Route("/v2/post/publish/inbox/video/init/", tiktok_init, methods=["POST"]),
+        Route("/v2/post/publish/status/fetch/", tiktok_status, methods=["POST"]),
+        Route("/v2/oauth/token/", tiktok_token, methods=["POST"]),
+        Route("/tiktok/upload/{publish_id}", tiktok_upload, methods=["PUT"]),
+        Route("/v21.0/{ig_user_id}/media", instagram_create_container, methods=["POST"]),
+        Route("/v21.0/{ig_user_id}/media_publish", instagram_publish, methods=["POST"]),
+        Route("/v21.0/{object_id}", instagram_container_status, methods=["GET"]),
+        Route("/refresh_access_token", instagram_token, methods=["GET"]),
+        Route("/access_token", instagram_token, methods=["GET"]),
+        Route("/v1/chat/completions", openai_chat, methods=["POST"]),
+        Route("/_stats", stats, methods=["GET"]),
+    ])
+
+
+# ==========================================
+# SMTP Mock
+# ==========================================
+
+async def _smtp_session(state: MockState, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    async def reply(line: str):
+        writer.write(f"{line}\r\n".encode("ascii"))
+        await writer.drain()
+
+    await reply("220 mock-smtp ESMTP ready")
+    try:
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            command = raw.decode("utf-8", "replace").strip().upper()
+
+            if command.startswith(("EHLO", "HELO")):
+                await reply("250-mock-smtp\r\n250-8BITMIME\r\n250 SIZE 52428800")
+            elif command.startswith(("MAIL FROM", "RCPT TO", "RSET", "NOOP")):
+                await reply("250 OK")
+            elif command == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    line = await reader.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    size += len(line)
+                state.requests["smtp"] += 1
+                state.bytes_received["smtp"] += size
+                profile = state.profiles["smtp"]
+                await profile.delay()
+                if profile.should_fail():
+                    state.failures["smtp"] += 1
+                    await reply("451 4.3.0 mock: simulated failure")
+                else:
+                    state.smtp_messages += 1
+                    await reply(f"250 OK queued as {secrets.token_hex(6)}")
+            elif command == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+# ==========================================
+# Main
+# ==========================================
+
+def parse_profiles(args) -> Dict[str, LatencyProfile]:
+    profiles = {
+        service: LatencyProfile(args.latency_ms, args.jitter_ms, args.failure_rate)
+        for service in SERVICES
+    }
+    # --profile youtube=400:0.02  (Latenz in ms [: Fehlerrate])
+    for spec in args.profile or []:
+        service, _, values = spec.partition("=")
+        if service not in profiles:
+            raise SystemExit(f"Unbekannter Dienst '{service}' (erlaubt: {', '.join(SERVICES)})")
+        latency, _, failure = values.partition(":")
+        profile = profiles[service]
+        profiles[service] = LatencyProfile(
+            float(latency) if latency else profile.latency_ms,
+            profile.jitter_ms,
+            float(failure) if failure else profile.failure_rate,
+        )
+    return profiles
+
+
+async def serve(host: str, http_port: int, smtp_port: int, profiles: Dict[str, LatencyProfile]):
+    state = MockState(profiles)
+    smtp_server = await asyncio.start_server(
+        lambda r, w: _smtp_session(state, r, w), host=host, port=smtp_port
+    )
+    config = uvicorn.Config(build_app(state), host=host, port=http_port, log_level="warning")
+    async with smtp_server:
+        await uvicorn.Server(config).serve()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock platform APIs + SMTP for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=9100)
+    parser.add_argument("--smtp-port", type=int, default=9125)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--profile", action="append", help="SERVICE=LATENCY_MS[:FAILURE_RATE], mehrfach möglich")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.host, args.http_port, args.smtp_port, parse_profiles(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: Startzeit eines Workers (Import von main.py)
+
+Startet `python -X importtime -c "import main"` mehrfach in frischen Prozessen,
+wertet die Importzeiten aus und zeigt die teuersten Module. Schlägt fehl
+(Exit-Code 1), wenn das Budget überschritten wird oder eines der schweren
+SDKs aus utils.lazy_imports.HEAVY_MODULES schon beim Start geladen wird.
+
+Keine Datenbank nötig.
+
+Aufruf (aus backend/):
+    python -m benchmarks.startup_budget --runs 5 --budget-ms 2000
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from utils.lazy_imports import HEAVY_MODULES
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# "import time:      self [us] |  cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _run_once() -> tuple:
+    """Ein frischer Prozess; Returns: (Wall-Zeit ms, {modul: (self_us, cumulative_us, tiefe)})"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise SystemExit(f"❌ import main fehlgeschlagen:\n{completed.stderr[-2000:]}")
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return wall_ms, modules
+
+
+def _is_heavy(name: str, heavy: str) -> bool:
+    return name == heavy or name.startswith(heavy + ".")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-Zeit von main.py gegen ein Budget prüfen")
+    parser.add_argument("--runs", type=int, default=5, help="frische Prozesse")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "2000")),
+                        help="maximale Median-Importzeit von main (Default: $STARTUP_BUDGET_MS oder 2000)")
+    parser.add_argument("--top", type=int, default=15, help="teuerste Top-Level-Imports anzeigen")
+    parser.add_argument("--json-out", help="Ergebnis als JSON speichern")
+    args = parser.parse_args()
+
+    wall_times, import_times, runs = [], [], []
+    for _ in range(args.runs):
+        wall_ms, modules = _run_once()
+        wall_times.append(wall_ms)
+        import_times.append(modules.get("main", (0, 0, 0))[1] / 1000)
+        runs.append(modules)
+
+    # Aufschlüsselung aus dem schnellsten Lauf (wenigsten Störungen durch Page-Cache etc.)
+    fastest = runs[import_times.index(min(import_times))]
+    top_level = sorted(
+        ((name, cumulative) for name, (_, cumulative, depth) in fastest.items() if depth <= 1 and name != "main"),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:args.top]
+    eager = [heavy for heavy in HEAVY_MODULES if any(_is_heavy(name, heavy) for name in fastest)]
+
+    import_median = statistics.median(import_times)
+    print(f"Läufe:            {args.runs}")
+    print(f"import main:      median {import_median:.0f} ms, min {min(import_times):.0f} ms, max {max(import_times):.0f} ms")
+    print(f"Prozess gesamt:   median {statistics.median(wall_times):.0f} ms")
+    print(f"Module geladen:   {len(fastest)}")
+    print("\nTeuerste Imports (kumuliert, schnellster Lauf):")
+    for name, cumulative in top_level:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if import_median > args.budget_ms:
+        failures.append(f"Budget überschritten: {import_median:.0f} ms > {args.budget_ms:.0f} ms")
+    if eager:
+        failures.append(f"Schwere Module beim Start geladen: {', '.join(eager)}")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps({
+            "runs": args.runs,
+            "budget_ms": args.budget_ms,
+            "import_ms": {"median": round(import_median, 1), "min": round(min(import_times), 1), "max": round(max(import_times), 1)},
+            "wall_ms_median": round(statistics.median(wall_times), 1),
+            "modules_loaded": len(fastest),
+            "top_imports_ms": {name: round(cumulative / 1000, 1) for name, cumulative in top_level},
+            "eager_heavy_modules": eager,
+            "passed": not failures,
+        }, indent=2))
+
+    print()
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"✅ Innerhalb des Budgets ({args.budget_ms:.0f} ms), keine schweren SDKs beim Start")
+
+
+if __name__ == "__main__":
+    main()
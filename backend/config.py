@@ -15,16 +15,27 @@ class Settings:
     JWT_SECRET: str = os.getenv("JWT_SECRET")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_EXPIRE_DAYS: int = int(os.getenv("JWT_EXPIRE_DAYS", 30))
+
+    # Password Hashing
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
     
     # Email
     SMTP_HOST: str = os.getenv("SMTP_HOST")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", 587))
     SMTP_USER: str = os.getenv("SMTP_USER")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD")
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
     FROM_EMAIL: str = os.getenv("FROM_EMAIL")
     FROM_NAME: str = os.getenv("FROM_NAME", "SocialHub")
     EMAIL_VERIFICATION_EXPIRE_HOURS: int = int(os.getenv("EMAIL_VERIFICATION_EXPIRE_HOURS", 24))
     PASSWORD_RESET_EXPIRE_HOURS: int = int(os.getenv("PASSWORD_RESET_EXPIRE_HOURS", 1))
+    SMTP_TIMEOUT_SECONDS: int = int(os.getenv("SMTP_TIMEOUT_SECONDS", 15))
+    SMTP_IDLE_TIMEOUT_SECONDS: int = int(os.getenv("SMTP_IDLE_TIMEOUT_SECONDS", 60))
+    EMAIL_OUTBOX_BATCH_SIZE: int = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 20))
+    EMAIL_OUTBOX_POLL_SECONDS: int = int(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", 5))
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 8))
 
     
        # OAuth
@@ -36,12 +47,69 @@ class Settings:
     INSTAGRAM_CLIENT_SECRET: str = os.getenv("INSTAGRAM_CLIENT_SECRET", "")
     INSTAGRAM_REDIRECT_URI: str = os.getenv("INSTAGRAM_REDIRECT_URI", "http://localhost:8000/api/instagram/callback")
 
+    # Platform API Endpoints (überschreibbar für Mock-Server, z.B. benchmarks/loadtest)
+    YOUTUBE_API_ROOT: str = os.getenv("YOUTUBE_API_ROOT", "")
+    TIKTOK_API_BASE: str = os.getenv("TIKTOK_API_BASE", "https://open.tiktokapis.com")
+    INSTAGRAM_GRAPH_BASE: str = os.getenv("INSTAGRAM_GRAPH_BASE", "https://graph.instagram.com")
+
     
     # Files
     TEMP_DIR: str = os.getenv("TEMP_DIR", "/app/temp")
     TOKEN_DIR: str = os.getenv("TOKEN_DIR", "/app/tokens")
     DATA_DIR: str = os.getenv("DATA_DIR", "/app/data")
     MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", 500))
+    TEMP_DIR_MAX_GB: float = float(os.getenv("TEMP_DIR_MAX_GB", 20))
+    TEMP_DIR_MIN_FREE_GB: float = float(os.getenv("TEMP_DIR_MIN_FREE_GB", 2))
+    TEMP_ORPHAN_MAX_AGE_MINUTES: int = int(os.getenv("TEMP_ORPHAN_MAX_AGE_MINUTES", 60))
+    TEMP_STALE_UPLOAD_HOURS: int = int(os.getenv("TEMP_STALE_UPLOAD_HOURS", 24))
+
+    # Media Serving (signierte Temp-URLs für Instagram)
+    MEDIA_SIGNING_KEY: str = os.getenv("MEDIA_SIGNING_KEY", "")
+    MEDIA_URL_TTL_SECONDS: int = int(os.getenv("MEDIA_URL_TTL_SECONDS", 3600))
+    MEDIA_ACCEL_REDIRECT_PREFIX: str = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "")
+
+    # Transcoding (plattformspezifische Varianten, benötigt ffmpeg)
+    TRANSCODE_ENABLED: bool = os.getenv("TRANSCODE_ENABLED", "false").lower() == "true"
+    TRANSCODE_WORKERS: int = int(os.getenv("TRANSCODE_WORKERS", 0))  # 0 = CPU-Kerne / WEB_CONCURRENCY
+    # Anzahl uvicorn-Worker (uvicorn liest dieselbe Variable) – jeder hat einen eigenen Transcode-Pool
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", 1))
+    TRANSCODE_CACHE_DIR: str = os.getenv("TRANSCODE_CACHE_DIR", os.path.join(os.getenv("TEMP_DIR", "/app/temp"), "variants"))
+    TRANSCODE_CACHE_MAX_GB: float = float(os.getenv("TRANSCODE_CACHE_MAX_GB", 10))
+    TRANSCODE_TIMEOUT_SECONDS: int = int(os.getenv("TRANSCODE_TIMEOUT_SECONDS", 1800))
+
+    # Thumbnails (Cover + Vorschaubilder, benötigt ffmpeg)
+    THUMBNAIL_DIR: str = os.getenv("THUMBNAIL_DIR", os.path.join(os.getenv("DATA_DIR", "/app/data"), "thumbnails"))
+    THUMBNAIL_FRAMES: int = int(os.getenv("THUMBNAIL_FRAMES", 3))
+    YOUTUBE_SET_THUMBNAIL: bool = os.getenv("YOUTUBE_SET_THUMBNAIL", "false").lower() == "true"
+
+    # Upload Dispatch
+    UPLOAD_DISPATCH_CONCURRENCY: int = int(os.getenv("UPLOAD_DISPATCH_CONCURRENCY", 2))
+    # Admission Control (pro Worker): darüber → 503 + Retry-After, bevor der Body gelesen wird
+    UPLOAD_MAX_INFLIGHT_MB: int = int(os.getenv("UPLOAD_MAX_INFLIGHT_MB", 2048))
+    UPLOAD_MAX_QUEUED_JOBS: int = int(os.getenv("UPLOAD_MAX_QUEUED_JOBS", 20))
+    DB_POOL_MAX_SATURATION: float = float(os.getenv("DB_POOL_MAX_SATURATION", 0.9))
+    UPLOAD_BATCH_MAX_ITEMS: int = int(os.getenv("UPLOAD_BATCH_MAX_ITEMS", 20))
+    PLATFORM_DELETE_CONCURRENCY: int = int(os.getenv("PLATFORM_DELETE_CONCURRENCY", 3))
+
+    # Response-Kompression (br nur mit installiertem brotli) + Static Pages
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+    STATIC_PAGES_MAX_AGE: int = int(os.getenv("STATIC_PAGES_MAX_AGE", 86400))
+
+    # Monitoring (leer = /metrics ohne Token)
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
+    # Tracing (none | file | otlp)
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")
+    TRACING_FILE: str = os.getenv("TRACING_FILE", os.path.join(os.getenv("DATA_DIR", "/app/data"), "traces.jsonl"))
+    TRACING_OTLP_ENDPOINT: str = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACING_SAMPLE_RATIO: float = float(os.getenv("TRACING_SAMPLE_RATIO", 1.0))
+    TRACING_SERVICE_NAME: str = os.getenv("TRACING_SERVICE_NAME", "smm-backend")
+
+    # Scheduler Jobs
+    UNVERIFIED_ACCOUNT_TTL_HOURS: int = int(os.getenv("UNVERIFIED_ACCOUNT_TTL_HOURS", 2))
+    CLEANUP_BATCH_SIZE: int = int(os.getenv("CLEANUP_BATCH_SIZE", 500))
     
     # OpenAI
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
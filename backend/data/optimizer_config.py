@@ -62,7 +62,7 @@ PLATFORM_PEAK_TIMES: dict = {
     },
 }
 
-# Platform-specific constraints for text optimization
+# Platform-specific constraints for text optimization and upload preflight
 PLATFORM_CONSTRAINTS: dict = {
     "youtube": {
         "title_max_chars": 100,
@@ -70,6 +70,9 @@ PLATFORM_CONSTRAINTS: dict = {
         "tags_max_count": 30,
         "tags_max_total_chars": 500,
         "description_note": "Use timestamps, chapters, and links. First 2 lines are shown without expanding.",
+        # Media limits (checked by preflight_service before upload)
+        "max_file_size_mb": 256 * 1024,
+        "max_duration_seconds": 12 * 3600,
     },
     "tiktok": {
         "title_max_chars": 150,  # Caption
@@ -77,6 +80,13 @@ PLATFORM_CONSTRAINTS: dict = {
         "tags_max_count": 20,
         "tags_max_total_chars": 300,
         "description_note": "Caption with hashtags. Hooks in first 3 seconds are critical.",
+        # Media limits (Content Posting API)
+        "max_file_size_mb": 4 * 1024,
+        "min_duration_seconds": 3,
+        "max_duration_seconds": 10 * 60,
+        "min_short_side_px": 360,
+        "frame_rate_range": (23, 60),
+        "video_codecs": ["h264", "hevc", "vp8", "vp9"],
     },
     "instagram": {
         "title_max_chars": 2200,  # Caption (Reels)
@@ -84,6 +94,14 @@ PLATFORM_CONSTRAINTS: dict = {
         "tags_max_count": 30,
         "tags_max_total_chars": 400,
         "description_note": "First 125 chars visible without 'more'. Hashtags at end or first comment.",
+        # Media limits (Graph API Reels)
+        "max_file_size_mb": 1024,
+        "min_duration_seconds": 3,
+        "max_duration_seconds": 15 * 60,
+        "aspect_ratio_range": (0.01, 10.0),
+        "max_width_px": 1920,
+        "frame_rate_range": (23, 60),
+        "video_codecs": ["h264", "hevc"],
     },
 }
 
@@ -1,15 +1,31 @@
-﻿import os
-from fastapi import FastAPI
+﻿from utils.lazy_imports import startup_report  # zuerst: misst die Importzeit dieses Moduls
+import os
+import asyncio
+import hmac
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from config import settings
-from models.database import init_db,SessionLocal, UserModel
-from routers import youtube, tiktok, instagram, upload, user, static_pages, auth
-from fastapi.staticfiles import StaticFiles
+from models.database import init_db,SessionLocal, UserModel, engine, TimedQueuePool
+from routers import youtube, tiktok, instagram, upload, user, static_pages, auth, media
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime, timedelta
+from sqlalchemy import delete, select
 from routers.optimizer import router as optimizer_router
+from services.trend_service import SNAPSHOT_RELOAD_SECONDS, load_snapshot, refresh_trending_hashtags
+from services.password_service import password_hasher
+from services.rate_limit_service import rate_limiter
+from services.email_service import email_outbox
+from services.scheduler_service import scheduler_leader, leader_only
+from services.temp_storage_service import temp_storage
+from services.metrics_service import DB_POOL_CHECKOUT_SECONDS, monitor_event_loop_lag, render_metrics
+from services.tracing_service import tracer, TracingMiddleware, instrument_http_clients, instrument_sqlalchemy
+from services.transcode_service import transcoder
+from utils.json_response import FastJSONResponse
+from services.compression_service import CompressionMiddleware
+from services.admission_service import AdmissionMiddleware, admission
 
+startup_report.mark_imports_done()
 
 
 # Logging Setup
@@ -24,11 +40,11 @@ app = FastAPI(
     title="Social Media Upload Manager",
     version="1.0.0",
     description="Multi-Platform Video Upload Manager",
-    redirect_slashes=False
+    redirect_slashes=False,
+    default_response_class=FastJSONResponse
 )
 
 os.makedirs(settings.TEMP_DIR, exist_ok=True)
-app.mount("/api/videos/temp", StaticFiles(directory=settings.TEMP_DIR), name="temp_videos")
 
 # CORS Middleware - dynamisch aus ENV
 allowed_origins = [
@@ -49,20 +65,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Admission Control für Uploads (innen → abgewiesene Requests erscheinen im Tracing)
+app.add_middleware(AdmissionMiddleware)
+
+# Kompression (innerhalb von Tracing → Span misst inkl. Komprimieren)
+app.add_middleware(CompressionMiddleware, min_size=settings.COMPRESSION_MIN_SIZE)
+
+# Tracing (äußerste Middleware → Span umfasst den kompletten Request)
+app.add_middleware(TracingMiddleware)
+if tracer.enabled:
+    instrument_http_clients()
+    instrument_sqlalchemy(engine)
+
+# DB-Instrumentierung hier statt in models.database (Models importieren keine Services)
+TimedQueuePool.observe_wait = DB_POOL_CHECKOUT_SECONDS.observe
+
 # Database initialization
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"🚀 Starting application in {settings.ENVIRONMENT} mode...")
+    startup_report.log()
+    static_pages.precompress_static_pages()
     try:
         init_db()
         logger.info("✅ Database tables initialized")
+        scheduler_leader.ensure()
         scheduler.start()
         logger.info("✅ Scheduler gestartet")
+        email_outbox.start()
+        app.state.loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    loop_lag_task = getattr(app.state, "loop_lag_task", None)
+    if loop_lag_task:
+        loop_lag_task.cancel()
+    email_outbox.stop()
+    scheduler_leader.release()
+    transcoder.shutdown()
+    tracer.flush()
+
+
 # Include Routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(youtube.router, prefix="/api/youtube")
@@ -70,6 +117,7 @@ app.include_router(tiktok.router, prefix="/api/tiktok")
 app.include_router(instagram.router, prefix="/api/instagram")
 app.include_router(upload.router, prefix="/api/upload")
 app.include_router(user.router, prefix="/api/user")
+app.include_router(media.router, prefix="/api/videos")
 app.include_router(static_pages.router)
 app.include_router(optimizer_router) 
 # Health Check
@@ -80,9 +128,40 @@ async def health_check():
         "service": "Social Media Upload Manager",
         "version": "1.0.0",
         "environment": settings.ENVIRONMENT,
-        "debug": settings.DEBUG
+        "debug": settings.DEBUG,
+        "password_hashing": password_hasher.stats(),
+        "email_outbox": email_outbox.stats(),
+        "scheduler": scheduler_leader.stats(),
+        "temp_storage": temp_storage.stats(),
+        "tracing": tracer.stats(),
+        "transcoding": transcoder.stats(),
+        "startup": startup_report.stats(),
+        "admission": admission.stats()
     }
 
+# Readiness für den Load Balancer: dieselben Signale wie die Upload-Admission
+@app.get("/ready")
+async def readiness():
+    rejection = admission.check()
+    if rejection is not None:
+        return FastJSONResponse(
+            {"ready": False, "reason": rejection.reason, "signals": admission.signals()},
+            status_code=503,
+            headers={"Retry-After": str(rejection.retry_after)}
+        )
+    return {"ready": True, "signals": admission.signals()}
+
+# Prometheus Metrics (über alle Worker aggregiert, siehe metrics_service)
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str = Header(None)):
+    # Ohne Token gesperrt – die API hängt öffentlich hinter Traefik
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    body, content_type = render_metrics()
+    return Response(content=body, headers={"Content-Type": content_type})
+
 # Root
 @app.get("/")
 async def root():
@@ -92,16 +171,30 @@ async def root():
         "health": "/health",
         "environment": settings.ENVIRONMENT
     }
+# Jobs laufen in jedem Worker an, aber nur der Leader (Advisory Lock) führt sie aus
 @scheduler.scheduled_job("interval", hours=1)
+@leader_only
 def cleanup_unverified_accounts():
     db = SessionLocal()
     try:
-        cutoff = datetime.now() - timedelta(hours=2)
-        deleted = db.query(UserModel).filter(
-            UserModel.is_verified == False,
-            UserModel.created_at < cutoff
-        ).delete()
-        db.commit()
+        cutoff = datetime.now() - timedelta(hours=settings.UNVERIFIED_ACCOUNT_TTL_HOURS)
+        batch_size = settings.CLEANUP_BATCH_SIZE
+        deleted = 0
+        # In kleinen Batches (partieller Index ix_users_unverified_created_at),
+        # damit nie lange Locks auf users gehalten werden
+        while True:
+            batch = select(UserModel.id).where(
+                UserModel.is_verified == False,
+                UserModel.created_at < cutoff
+            ).order_by(UserModel.created_at).limit(batch_size).with_for_update(skip_locked=True)
+            count = db.execute(
+                delete(UserModel).where(UserModel.id.in_(batch)),
+                execution_options={"synchronize_session": False}
+            ).rowcount
+            db.commit()
+            deleted += count
+            if count < batch_size:
+                break
         if deleted:
             logger.info(f"🗑️ {deleted} unverifizierte Accounts gelöscht")
     except Exception as e:
@@ -110,6 +203,71 @@ def cleanup_unverified_accounts():
     finally:
         db.close()
 
+@scheduler.scheduled_job("interval", minutes=15)
+@leader_only
+def refresh_hashtag_trends():
+    db = SessionLocal()
+    try:
+        refresh_trending_hashtags(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Hashtag-Trends Aggregation fehlgeschlagen: {str(e)}")
+    finally:
+        db.close()
+
+
+# Jeder Worker lädt seinen Trend-Snapshot selbst (Scheduler-Thread, sofort beim Start),
+# damit der Optimizer-Request nie auf die DB wartet
+@scheduler.scheduled_job("interval", seconds=SNAPSHOT_RELOAD_SECONDS, next_run_time=datetime.now())
+def reload_trend_snapshot():
+    load_snapshot()
+
+
+@scheduler.scheduled_job("interval", hours=1)
+@leader_only
+def cleanup_rate_limit_counters():
+    db = SessionLocal()
+    try:
+        rate_limiter.cleanup(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Rate-Limit Cleanup fehlgeschlagen: {str(e)}")
+    finally:
+        db.close()
+
+
+@scheduler.scheduled_job("interval", hours=24)
+@leader_only
+def cleanup_email_outbox():
+    db = SessionLocal()
+    try:
+        deleted = email_outbox.cleanup(db)
+        if deleted:
+            logger.info(f"🗑️ {deleted} verschickte Emails aus der Outbox gelöscht")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Email-Outbox Cleanup fehlgeschlagen: {str(e)}")
+    finally:
+        db.close()
+
+
+@scheduler.scheduled_job("interval", minutes=10)
+@leader_only
+def sweep_temp_dir():
+    db = SessionLocal()
+    try:
+        report = temp_storage.sweep(db)
+        if report["deleted"] or report["failed_stale_uploads"]:
+            logger.info(
+                f"🧹 Temp-GC: {report['deleted']} Dateien gelöscht, "
+                f"{report['reclaimed_bytes'] / 1024 / 1024:.1f} MB freigegeben"
+            )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Temp-GC fehlgeschlagen: {str(e)}")
+    finally:
+        db.close()
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,156 @@
+"""
+Response-Payloads der heißen Endpoints
+Schlanke slots-Dataclasses statt handgebauter dicts – orjson serialisiert sie direkt
+(datetime als ISO-8601, identisch zu isoformat()), FastAPI nutzt sie als response_model für die Doku
+
+Abgeleitete Felder (Thumbnail-URLs, Media-Summary) berechnen die Router und reichen sie herein
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from models.database import PlatformConnection, UserModel, VideoModel
+
+
+# ==========================================
+# Videos
+# ==========================================
+
+@dataclass(slots=True)
+class VideoItem:
+    """Ein Video in der Liste eines Users"""
+    video_id: str
+    title: str
+    description: Optional[str]
+    status: str
+    platforms: List[str]
+    tags: Optional[List[str]]
+    privacy_status: Optional[str]
+    upload_results: Dict[str, Any]
+    errors: Optional[Dict[str, Any]]
+    thumbnails: Optional[Dict[str, Any]]
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, video: VideoModel, thumbnails: Optional[Dict[str, Any]]) -> "VideoItem":
+        return cls(
+            video_id=video.id,
+            title=video.title,
+            description=video.description,
+            status=video.status,
+            platforms=video.platforms,
+            tags=video.tags,
+            privacy_status=video.privacy_status,
+            upload_results=video.upload_results or {},
+            errors=video.errors,
+            thumbnails=thumbnails,
+            created_at=video.created_at,
+            updated_at=video.updated_at,
+        )
+
+
+@dataclass(slots=True)
+class VideoDetail:
+    """Status eines einzelnen Videos (inkl. technischer Metadaten)"""
+    video_id: str
+    status: str
+    title: str
+    description: Optional[str]
+    platforms: List[str]
+    tags: Optional[List[str]]
+    privacy_status: Optional[str]
+    upload_results: Dict[str, Any]
+    errors: Optional[Dict[str, Any]]
+    media: Optional[Dict[str, Any]]
+    thumbnails: Optional[Dict[str, Any]]
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_model(
+        cls,
+        video: VideoModel,
+        media: Optional[Dict[str, Any]],
+        thumbnails: Optional[Dict[str, Any]]
+    ) -> "VideoDetail":
+        return cls(
+            video_id=video.id,
+            status=video.status,
+            title=video.title,
+            description=video.description,
+            platforms=video.platforms,
+            tags=video.tags,
+            privacy_status=video.privacy_status,
+            upload_results=video.upload_results or {},
+            errors=video.errors,
+            media=media,
+            thumbnails=thumbnails,
+            created_at=video.created_at,
+            updated_at=video.updated_at,
+        )
+
+
+@dataclass(slots=True)
+class VideoList:
+    user_id: str
+    total: int
+    videos: List[VideoItem]
+
+    @classmethod
+    def from_items(cls, user_id: str, items: List[VideoItem]) -> "VideoList":
+        return cls(user_id=user_id, total=len(items), videos=items)
+
+
+# ==========================================
+# Profil (/api/auth/me)
+# ==========================================
+
+@dataclass(slots=True)
+class ConnectedPlatform:
+    platform: str
+    username: Optional[str]
+    channelId: Optional[str]
+    connectedAt: Optional[datetime]
+    needsReconnect: bool
+
+    @classmethod
+    def from_model(cls, connection: PlatformConnection, needs_reconnect: bool = False) -> "ConnectedPlatform":
+        return cls(
+            platform=connection.platform,
+            username=connection.username,
+            channelId=connection.channel_id,
+            connectedAt=connection.created_at,
+            needsReconnect=needs_reconnect,
+        )
+
+
+@dataclass(slots=True)
+class CurrentUser:
+    id: str
+    email: str
+    username: Optional[str]
+    is_verified: bool
+    connected_platforms: List[ConnectedPlatform]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_model(
+        cls,
+        user: UserModel,
+        connections: List[PlatformConnection],
+        needs_reconnect: Iterable[str] = ()
+    ) -> "CurrentUser":
+        """needs_reconnect: Plattformen, deren Verbindung neu autorisiert werden muss"""
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            is_verified=user.is_verified,
+            connected_platforms=[
+                ConnectedPlatform.from_model(c, c.platform in needs_reconnect) for c in connections
+            ],
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
@@ -10,6 +10,7 @@ class VideoStatus(str, Enum):
     UPLOADED = "uploaded"
     PARTIAL = "partial"
     FAILED = "failed"
+    DELETING = "deleting"
 
 
 class Video(BaseModel):
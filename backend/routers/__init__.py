@@ -1,6 +1,3 @@
-from . import youtube, tiktok, instagram, upload, user, static_pages
-
-__all__ = ["youtube", "tiktok", "instagram", "upload", "user", "static_pages"]
-
-
+from . import youtube, tiktok, instagram, upload, user, static_pages, media
 
+__all__ = ["youtube", "tiktok", "instagram", "upload", "user", "static_pages", "media"]
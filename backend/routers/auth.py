@@ -1,13 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta
 import secrets
-import bcrypt
 import logging
-from utils.auth import create_access_token, decode_access_token  # ✅ NUR diese beiden
+from utils.auth import create_access_token, decode_access_token, verify_access_token
 from models.database import UserModel, get_db, PlatformConnection
+from models.responses import CurrentUser
+from utils.json_response import FastJSONResponse
+from utils.http_cache import cache_headers, is_not_modified, not_modified, weak_etag
 from services.email_service import EmailService
+from services.password_service import password_hasher
+from services.rate_limit_service import rate_limiter, get_client_ip
+from services.youtube_service import connection_needs_reconnect
 from config import settings
 from typing import Optional
 
@@ -51,13 +57,13 @@ class UpdateMeRequest(BaseModel):
 # Helper Functions
 # ==========================================
 
-def hash_password(password: str) -> str:
-    """Hash password with bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    """Hash password with bcrypt (bounded thread pool)"""
+    return await password_hasher.hash(password)
 
-def verify_password(password: str, hashed: str) -> bool:
-    """Verify password against hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    """Verify password against hash (bounded thread pool)"""
+    return await password_hasher.verify(password, hashed)
 
 def generate_verification_token() -> str:
     """Generate secure verification token"""
@@ -93,7 +99,7 @@ async def change_password(
             raise HTTPException(404, "User not found")
         
         # Verify current password
-        if not verify_password(request.current_password, user.hashed_password):
+        if not await verify_password(request.current_password, user.hashed_password):
             raise HTTPException(401, "Aktuelles Passwort ist falsch")
         
         # Validate new password
@@ -101,7 +107,7 @@ async def change_password(
             raise HTTPException(400, "Neues Passwort muss mindestens 8 Zeichen lang sein")
         
         # Update password
-        user.hashed_password = hash_password(request.new_password)
+        user.hashed_password = await hash_password(request.new_password)
         user.updated_at = datetime.now()
         
         db.commit()
@@ -124,11 +130,13 @@ async def change_password(
 # ==========================================
 
 @router.post("/register")
-async def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, http_request: Request, db: Session = Depends(get_db)):
     """
     Registriert neuen User und sendet Verification Email
     """
     try:
+        await rate_limiter.check("register", ip=get_client_ip(http_request))
+        
         # Check if email already exists
         existing_user = db.query(UserModel).filter(UserModel.email == request.email).first()
         if existing_user:
@@ -147,7 +155,7 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
         new_user = UserModel(
             id=user_id,
             email=request.email,
-            hashed_password=hash_password(request.password),
+            hashed_password=await hash_password(request.password),
             is_verified=False,
             verification_token=verification_token,
             verification_token_expires=verification_expires,
@@ -155,13 +163,10 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
         )
         
         db.add(new_user)
-        db.commit()
         
-        # Send verification email
-        email_sent = email_service.send_verification_email(request.email, verification_token)
-        
-        if not email_sent:
-            logger.warning(f"⚠️  Verification Email konnte nicht gesendet werden an {request.email}")
+        # Verification Email in die Outbox (gleiche Transaktion wie der User)
+        email_service.queue_verification_email(db, request.email, verification_token)
+        db.commit()
         
         logger.info(f"✅ User registriert: {request.email}")
         
@@ -169,7 +174,7 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
             "status": "success",
             "message": "Registrierung erfolgreich. Bitte überprüfe deine Emails.",
             "user_id": user_id,
-            "email_sent": email_sent
+            "email_queued": True
         }
         
     except HTTPException:
@@ -207,11 +212,10 @@ async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db
         user.verification_token_expires = None
         user.updated_at = datetime.now()
         
+        # Welcome Email in die Outbox
+        email_service.queue_welcome_email(db, user.email, user.email.split('@')[0])
         db.commit()
         
-        # Send welcome email
-        email_service.send_welcome_email(user.email, user.email.split('@')[0])
-        
         logger.info(f"✅ Email verifiziert: {user.email}")
         
         return {
@@ -228,11 +232,13 @@ async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db
 
 
 @router.post("/resend-verification")
-async def resend_verification(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
+async def resend_verification(request: ForgotPasswordRequest, http_request: Request, db: Session = Depends(get_db)):
     """
     Sendet Verification Email erneut
     """
     try:
+        await rate_limiter.check("resend-verification", ip=get_client_ip(http_request), email=request.email)
+        
         user = db.query(UserModel).filter(UserModel.email == request.email).first()
         
         if not user:
@@ -253,11 +259,10 @@ async def resend_verification(request: ForgotPasswordRequest, db: Session = Depe
         user.verification_token_expires = verification_expires
         user.updated_at = datetime.now()
         
+        # Email in die Outbox
+        email_service.queue_verification_email(db, user.email, verification_token)
         db.commit()
         
-        # Send email
-        email_service.send_verification_email(user.email, verification_token)
-        
         logger.info(f"✅ Verification Email erneut gesendet: {user.email}")
         
         return {
@@ -277,11 +282,13 @@ async def resend_verification(request: ForgotPasswordRequest, db: Session = Depe
 # ==========================================
 
 @router.post("/login")
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, http_request: Request, db: Session = Depends(get_db)):
     """
     Login mit Email + Password
     """
     try:
+        await rate_limiter.check("login", ip=get_client_ip(http_request), email=request.email)
+        
         # ✅ Find user (DIESER CODE FEHLTE!)
         user = db.query(UserModel).filter(UserModel.email == request.email).first()
         
@@ -289,9 +296,15 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
             raise HTTPException(401, "Ungültige Email oder Passwort")
         
         # ✅ Check password (DIESER CODE FEHLTE!)
-        if not verify_password(request.password, user.hashed_password):
+        if not await verify_password(request.password, user.hashed_password):
             raise HTTPException(401, "Ungültige Email oder Passwort")
         
+        # Rehash-on-Login: Work-Factor geändert → Hash aktualisieren
+        if password_hasher.needs_rehash(user.hashed_password):
+            user.hashed_password = await hash_password(request.password)
+            db.commit()
+            logger.info(f"🔁 Passwort-Hash aktualisiert für User: {user.email}")
+        
         # ✅ Check if verified (DIESER CODE FEHLTE!)
         if not user.is_verified:
             raise HTTPException(403, "Bitte verifiziere zuerst deine Email-Adresse")
@@ -322,7 +335,8 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
                     "platform": p.platform,
                     "username": p.username if hasattr(p, 'username') else None,
                     "channelId": p.channel_id if hasattr(p, 'channel_id') else None,
-                    "connectedAt": p.created_at.isoformat() if p.created_at else None
+                    "connectedAt": p.created_at.isoformat() if p.created_at else None,
+                    "needsReconnect": connection_needs_reconnect(p)
                 }
                 for p in platforms
             ]
@@ -357,11 +371,13 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
 # ==========================================
 
 @router.post("/forgot-password")
-async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
+async def forgot_password(request: ForgotPasswordRequest, http_request: Request, db: Session = Depends(get_db)):
     """
     Sendet Password Reset Email
     """
     try:
+        await rate_limiter.check("forgot-password", ip=get_client_ip(http_request), email=request.email)
+        
         user = db.query(UserModel).filter(UserModel.email == request.email).first()
         
         if not user:
@@ -379,11 +395,10 @@ async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(
         user.reset_token_expires = reset_expires
         user.updated_at = datetime.now()
         
+        # Reset Email in die Outbox
+        email_service.queue_password_reset_email(db, user.email, reset_token)
         db.commit()
         
-        # Send reset email
-        email_service.send_password_reset_email(user.email, reset_token)
-        
         logger.info(f"✅ Password Reset Email gesendet: {user.email}")
         
         return {
@@ -391,6 +406,8 @@ async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(
             "message": "Falls die Email existiert, wurde ein Reset Link gesendet."
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Forgot Password fehlgeschlagen: {str(e)}")
         raise HTTPException(500, "Fehler beim Senden der Email")
@@ -419,7 +436,7 @@ async def reset_password(request: ResetPasswordRequest, db: Session = Depends(ge
             raise HTTPException(400, "Passwort muss mindestens 8 Zeichen lang sein")
         
         # Update password
-        user.hashed_password = hash_password(request.new_password)
+        user.hashed_password = await hash_password(request.new_password)
         user.reset_token = None
         user.reset_token_expires = None
         user.updated_at = datetime.now()
@@ -439,36 +456,65 @@ async def reset_password(request: ResetPasswordRequest, db: Session = Depends(ge
         logger.error(f"❌ Reset Password fehlgeschlagen: {str(e)}")
         raise HTTPException(500, "Passwort Reset fehlgeschlagen")
 
-@router.get("/me")
+def _connected_platform_filter(user_id: str) -> list:
+    return [
+        PlatformConnection.user_id == user_id,
+        PlatformConnection.connected == True,
+        PlatformConnection.platform != "tiktok_pkce"  # ← NEU
+    ]
+
+
+def _profile_version(db: Session, user_id: str) -> Optional[tuple]:
+    """
+    Version von /me in einer Abfrage: users.updated_at + Anzahl/jüngste Änderung der Verbindungen
+
+    Returns:
+        (user_updated_at, connection_count, connections_updated_at) oder None (User fehlt)
+    """
+    return db.query(
+        UserModel.updated_at,
+        func.count(PlatformConnection.id),
+        func.max(PlatformConnection.updated_at)
+    ).outerjoin(
+        PlatformConnection, and_(*_connected_platform_filter(user_id))
+    ).filter(UserModel.id == user_id).group_by(UserModel.id, UserModel.updated_at).first()
+
+
+def _profile_cache(user_id: str, version: tuple):
+    """ETag + Last-Modified (jüngster Zeitstempel aus User und Verbindungen)"""
+    timestamps = [ts for ts in (version[0], version[2]) if ts is not None]
+    return weak_etag("me", user_id, *version), (max(timestamps) if timestamps else None)
+
+
+@router.get("/me", response_model=CurrentUser)
 async def get_current_user(
+    request: Request,
     authorization: str = Header(...),
     db: Session = Depends(get_db)
 ):
     """
     Gibt aktuellen User zurück (mit verbundenen Plattformen)
+
+    Wird vom Frontend gepollt: If-None-Match mit unveränderter Version → 304
+    nach einer reinen Versionsabfrage (ohne User/Plattformen zu laden)
     """
     try:
-        logger.info(f"📥 /auth/me called with Authorization: {authorization[:50]}...")
-        
         # Extract token from "Bearer <token>"
         if not authorization.startswith("Bearer "):
             logger.error("❌ Authorization header does not start with 'Bearer '")
             raise HTTPException(401, "Invalid authorization header")
         
         token = authorization.replace("Bearer ", "")
-        logger.info(f"🔑 Token extracted: {token[:30]}...")
-        
-        # Decode token
-        payload = decode_access_token(token)
-        logger.info(f"✅ Token decoded: {payload}")
-        
-        user_id = payload.get("user_id")
-        
-        if not user_id:
-            logger.error("❌ No user_id in token payload")
-            raise HTTPException(401, "Invalid token")
         
-        logger.info(f"👤 User ID from token: {user_id}")
+        # Decode token (gecacht, ohne DB)
+        user_id = verify_access_token(token)["user_id"]
+
+        if request.headers.get("if-none-match") or request.headers.get("if-modified-since"):
+            version = _profile_version(db, user_id)
+            if version is not None:
+                etag, last_modified = _profile_cache(user_id, version)
+                if is_not_modified(request, etag, last_modified):
+                    return not_modified(etag, last_modified, vary="Authorization")
         
         # Get user from DB
         user = db.query(UserModel).filter(UserModel.id == user_id).first()
@@ -477,47 +523,24 @@ async def get_current_user(
             logger.error(f"❌ User not found in DB: {user_id}")
             raise HTTPException(404, "User not found")
         
-        logger.info(f"✅ User found: {user.email}")
-        
         # Get connected platforms
-        connected_platforms = []
+        platforms = []
         try:
-            from models.database import PlatformConnection
-            
-            platforms = db.query(PlatformConnection).filter(
-                PlatformConnection.user_id == user_id,
-                PlatformConnection.connected == True,
-                PlatformConnection.platform != "tiktok_pkce"  # ← NEU
-            ).all()
-
-            
-            logger.info(f"📊 Found {len(platforms)} connected platforms")
-            
-            connected_platforms = [
-                {
-                    "platform": p.platform,
-                    "username": p.username if hasattr(p, 'username') else None,
-                    "channelId": p.channel_id if hasattr(p, 'channel_id') else None,
-                    "connectedAt": p.created_at.isoformat() if p.created_at else None
-                }
-                for p in platforms
-            ]
-        except ImportError:
-            logger.warning("⚠️ PlatformConnection Model nicht gefunden")
+            platforms = db.query(PlatformConnection).filter(*_connected_platform_filter(user_id)).all()
         except Exception as e:
             logger.error(f"❌ Error getting platforms: {e}")
-        
-        logger.info(f"✅ Returning user data with {len(connected_platforms)} platforms")
-        
-        return {
-            "id": user.id,
-            "email": user.email,
-            "username": user.username if hasattr(user, 'username') else None,
-            "is_verified": user.is_verified,
-            "connected_platforms": connected_platforms,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at and hasattr(user, 'updated_at') else None
-        }
+
+        # Version aus den gelesenen Zeilen – identisch zu _profile_version
+        connections_updated = max((p.updated_at for p in platforms if p.updated_at), default=None)
+        etag, last_modified = _profile_cache(user_id, (user.updated_at, len(platforms), connections_updated))
+
+        # Direkt per orjson rendern (ohne jsonable_encoder)
+        return FastJSONResponse(
+            CurrentUser.from_model(
+                user, platforms, {p.platform for p in platforms if connection_needs_reconnect(p)}
+            ),
+            headers=cache_headers(etag, last_modified, vary="Authorization")
+        )
         
     except HTTPException:
         raise
@@ -2,17 +2,22 @@
 from fastapi import APIRouter, Request as FastAPIRequest, HTTPException
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
+import asyncio
 import logging
-import httpx
 from urllib.parse import quote
 
 from config import settings
+from utils.lazy_imports import lazy_module
 from services.instagram_service import instagram_upload_video
+from services.metrics_service import TOKEN_REFRESH_SECONDS, timed
 from services.user_service import UserService
 from services.token_storage import TokenStorage
 
 
 logger = logging.getLogger(__name__)
+
+# HTTP-Client erst bei OAuth/Token-Refresh laden
+httpx = lazy_module("httpx")
 router = APIRouter(prefix="", tags=["Instagram"])
 
 user_service = UserService()
@@ -212,7 +217,7 @@ async def get_long_lived_token(short_lived_token: str) -> str:
     """
     Converts short-lived token to long-lived token (valid 60 days).
     """
-    url = "https://graph.instagram.com/access_token"
+    url = f"{settings.INSTAGRAM_GRAPH_BASE.rstrip('/')}/access_token"
 
     params = {
         "grant_type": "ig_exchange_token",
@@ -253,19 +258,20 @@ async def refresh_instagram_token(request: RefreshRequest):
         if not creds or "access_token" not in creds:
             raise HTTPException(404, "Keine Instagram Credentials gefunden")
 
-        url = "https://graph.instagram.com/refresh_access_token"
+        url = f"{settings.INSTAGRAM_GRAPH_BASE.rstrip('/')}/refresh_access_token"
 
         params = {
             "grant_type": "ig_refresh_token",
             "access_token": creds["access_token"]
         }
 
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(url, params=params)
-            result = resp.json()
+        with timed(TOKEN_REFRESH_SECONDS, platform="instagram"):
+            async with httpx.AsyncClient(timeout=15) as client:
+                resp = await client.get(url, params=params)
+                result = resp.json()
 
-            if "access_token" not in result:
-                raise ValueError(f"Token refresh failed: {result}")
+                if "access_token" not in result:
+                    raise ValueError(f"Token refresh failed: {result}")
 
         token_storage.save_instagram_credentials(
             request.user_id,
@@ -311,7 +317,7 @@ async def disconnect_instagram(request: DisconnectRequest):
 # Upload Helper
 # ==========================================
 
-async def upload_to_instagram(user_id: str, video_path: str, title: str):
+async def upload_to_instagram(user_id: str, video_path: str, title: str, duration_seconds: float = None):
     """
     Helper function for Instagram video upload.
 
@@ -330,11 +336,15 @@ async def upload_to_instagram(user_id: str, video_path: str, title: str):
     if not ig_creds:
         raise ValueError("Instagram nicht verbunden – bitte zuerst authentifizieren")
 
-    result = instagram_upload_video(
+    # requests + time.sleep-Polling → Thread; der Worker muss die signierte Media-URL
+    # für Instagrams Abruf währenddessen selbst ausliefern können
+    result = await asyncio.to_thread(
+        instagram_upload_video,
         ig_user_id=ig_creds["user_id"],
         access_token=ig_creds["access_token"],
         video_path=video_path,
-        caption=title
+        caption=title,
+        duration_seconds=duration_seconds
     )
 
     logger.info(f"Instagram upload successful for user {user_id}")
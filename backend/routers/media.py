@@ -0,0 +1,64 @@
+﻿"""
+Media Router
+Liefert Temp-Videos über signierte, Range-fähige URLs aus (Instagram Ingestion)
+und Thumbnails (content-adressiert, unveränderlich)
+"""
+import mimetypes
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+
+from config import settings
+from services.media_service import (
+    RangeFileResponse,
+    accel_redirect_response,
+    resolve_temp_file,
+    verify_media_signature,
+)
+from services.thumbnail_service import MEDIA_TYPES, thumbnail_store
+
+router = APIRouter(tags=["Media"])
+
+
+@router.api_route("/temp/{filename}", methods=["GET", "HEAD"])
+async def serve_temp_video(
+    filename: str,
+    request: Request,
+    expires: int = Query(...),
+    sig: str = Query(...),
+):
+    """Temp-Video ausliefern – nur mit gültiger, nicht abgelaufener Signatur"""
+    if not verify_media_signature(filename, expires, sig):
+        raise HTTPException(403, "Ungültige oder abgelaufene Signatur")
+
+    path = resolve_temp_file(filename)
+    if not path:
+        raise HTTPException(404, "Datei nicht gefunden")
+
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        # nginx kennt nur TEMP_DIR – Dateien außerhalb (z.B. verlegter Variant-Cache) liefert das Backend
+        try:
+            relative = path.resolve().relative_to(Path(settings.TEMP_DIR).resolve()).as_posix()
+        except ValueError:
+            relative = None
+        if relative is not None:
+            return accel_redirect_response(relative, media_type)
+
+    return RangeFileResponse(path, request.headers, media_type=media_type)
+
+
+@router.get("/thumbnails/{filename}")
+async def serve_thumbnail(filename: str):
+    """Thumbnail ausliefern – Dateiname enthält den Content-Hash, daher ein Jahr cachebar"""
+    path = thumbnail_store.resolve(filename)
+    if not path:
+        raise HTTPException(404, "Thumbnail nicht gefunden")
+
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[path.suffix.lstrip(".")],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
@@ -5,13 +5,15 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.database import get_db
-from routers.auth import get_current_user
+from models.database import get_db, VideoModel
+from utils.auth import get_current_user_claims
 from services.optimizer_service import (
     generate_suggestions,
     get_trending_hashtags,
     get_best_times_for_user,
 )
+from services.media_probe_service import media_summary
+from services.trend_service import TREND_WINDOWS, DEFAULT_WINDOW
 
 router = APIRouter(prefix="/api/optimizer", tags=["optimizer"])
 
@@ -21,12 +23,13 @@ router = APIRouter(prefix="/api/optimizer", tags=["optimizer"])
 # ---------------------------------------------------------------------------
 
 class SuggestRequest(BaseModel):
-    user_id: int
+    user_id: str
     title_draft: str = Field(default="", max_length=500)
     description_draft: str = Field(default="", max_length=10000)
     category: str = Field(default="default", max_length=100)
     platforms: list[str] = Field(default_factory=list)
     video_duration: Optional[int] = Field(default=None, ge=0)
+    video_id: Optional[str] = Field(default=None, max_length=100)
 
 
 class PlatformSuggestion(BaseModel):
@@ -49,11 +52,12 @@ class SuggestResponse(BaseModel):
 async def suggest(
     body: SuggestRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_claims),
 ):
     """
     Generate AI-powered suggestions for title, description, hashtags, and upload times.
     Requires authentication. User can only request suggestions for their own user_id.
+    With `video_id` the probed media metadata of an uploaded video (duration, format) is used.
     """
     # Authorization: users can only optimize their own content
     if current_user["user_id"] != body.user_id:
@@ -62,6 +66,16 @@ async def suggest(
     if not body.platforms:
         raise HTTPException(status_code=400, detail="At least one platform must be specified.")
 
+    media = None
+    if body.video_id:
+        video = db.query(VideoModel).filter(
+            VideoModel.id == body.video_id,
+            VideoModel.user_id == body.user_id
+        ).first()
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found.")
+        media = media_summary(video)
+
     result = await generate_suggestions(
         db=db,
         user_id=body.user_id,
@@ -70,6 +84,7 @@ async def suggest(
         category=body.category,
         platforms=body.platforms,
         video_duration=body.video_duration,
+        media=media,
     )
     return result
 
@@ -78,23 +93,26 @@ async def suggest(
 async def trending_hashtags(
     platform: str = Query(..., description="Platform: youtube, tiktok, instagram"),
     category: str = Query(default="default", description="Content category"),
-    current_user: dict = Depends(get_current_user),
+    window: str = Query(default=DEFAULT_WINDOW, description="Time window: 24h, 7d"),
+    current_user: dict = Depends(get_current_user_claims),
 ) -> dict:
     """Return trending hashtags for a given platform and category."""
     platform = platform.lower()
     if platform not in ["youtube", "tiktok", "instagram"]:
         raise HTTPException(status_code=400, detail="Invalid platform.")
+    if window not in TREND_WINDOWS:
+        raise HTTPException(status_code=400, detail="Invalid window.")
 
-    tags = await get_trending_hashtags(platform=platform, category=category)
-    return {"platform": platform, "category": category, "hashtags": tags}
+    tags = await get_trending_hashtags(platform=platform, category=category, window=window)
+    return {"platform": platform, "category": category, "window": window, "hashtags": tags}
 
 
 @router.get("/best-times")
 async def best_times(
-    user_id: int = Query(...),
+    user_id: str = Query(...),
     platform: str = Query(...),
     db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_claims),
 ) -> dict:
     """Return personalized best upload times for a user/platform combination."""
     if current_user["user_id"] != user_id:
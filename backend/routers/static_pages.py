@@ -2,16 +2,16 @@
 Static Pages Router
 Stellt Terms of Service und Privacy Policy bereit
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
+from services.compression_service import StaticAsset
+
 router = APIRouter(tags=["Static Pages"])
 
 
-@router.get("/terms", response_class=HTMLResponse)
-async def terms_of_service():
-    """Terms of Service - Für TikTok App Registration"""
-    return """
+# Terms of Service - Für TikTok App Registration
+TERMS_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -158,10 +158,8 @@ async def terms_of_service():
     """
 
 
-@router.get("/privacy", response_class=HTMLResponse)
-async def privacy_policy():
-    """Privacy Policy - Für TikTok App Registration"""
-    return """
+# Privacy Policy - Für TikTok App Registration
+PRIVACY_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -375,4 +373,32 @@ async def privacy_policy():
         </div>
     </body>
     </html>
-    """
\ No newline at end of file
+    """
+
+
+# ==========================================
+# Auslieferung (einmal gerendert, vorkomprimiert, ETag/304)
+# ==========================================
+
+STATIC_PAGES = {
+    "terms": StaticAsset(TERMS_HTML.encode("utf-8"), "text/html; charset=utf-8"),
+    "privacy": StaticAsset(PRIVACY_HTML.encode("utf-8"), "text/html; charset=utf-8"),
+}
+
+
+def precompress_static_pages():
+    """Beim Start aufrufen – danach kostet ein Aufruf nur noch das Senden"""
+    for page in STATIC_PAGES.values():
+        page.prepare()
+
+
+@router.get("/terms", response_class=HTMLResponse)
+async def terms_of_service(request: Request):
+    """Terms of Service - Für TikTok App Registration"""
+    return STATIC_PAGES["terms"].response(request)
+
+
+@router.get("/privacy", response_class=HTMLResponse)
+async def privacy_policy(request: Request):
+    """Privacy Policy - Für TikTok App Registration"""
+    return STATIC_PAGES["privacy"].response(request)
@@ -1,20 +1,25 @@
 ﻿from fastapi import APIRouter, Request as FastAPIRequest, HTTPException
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
+import asyncio
 import logging
-import requests
 import hashlib
 import base64
 import secrets
-import httpx
 from datetime import datetime, timedelta
 from config import settings
-from services.tiktok_service import tiktok_upload_video
+from utils.lazy_imports import lazy_module
+from services.tiktok_service import tiktok_upload_video, TIKTOK_API_BASE
+from services.metrics_service import TOKEN_REFRESH_SECONDS, timed
 from utils.utils import build_tiktok_caption
 from services.user_service import UserService
 from services.token_storage import TokenStorage
 
 logger = logging.getLogger(__name__)
+
+# HTTP-Clients erst bei OAuth/Token-Refresh laden
+requests = lazy_module("requests")
+httpx = lazy_module("httpx")
 router = APIRouter(prefix="", tags=["TikTok"])
 
 user_service = UserService()
@@ -184,7 +189,7 @@ async def exchange_code_for_token(code: str, code_verifier: str) -> tuple[str, s
     Returns:
         tuple: (access_token, open_id, refresh_token)
     """
-    url = "https://open.tiktokapis.com/v2/oauth/token/"
+    url = f"{TIKTOK_API_BASE}/v2/oauth/token/"
     
     data = {
         "client_key": settings.TIKTOK_CLIENT_KEY,
@@ -248,7 +253,7 @@ async def refresh_tiktok_token(request: RefreshRequest):
         if not creds or "refresh_token" not in creds:
             raise HTTPException(404, "Keine TikTok Credentials gefunden")
         
-        url = "https://open.tiktokapis.com/v2/oauth/token/"
+        url = f"{TIKTOK_API_BASE}/v2/oauth/token/"
         
         data = {
             "client_key": settings.TIKTOK_CLIENT_KEY,
@@ -261,9 +266,10 @@ async def refresh_tiktok_token(request: RefreshRequest):
             "Content-Type": "application/x-www-form-urlencoded"
         }
         
-        resp = requests.post(url, data=data, headers=headers, timeout=10)
-        resp.raise_for_status()
-        result = resp.json()
+        with timed(TOKEN_REFRESH_SECONDS, platform="tiktok"):
+            resp = requests.post(url, data=data, headers=headers, timeout=10)
+            resp.raise_for_status()
+            result = resp.json()
         
         # Save new tokens
         token_storage.save_tiktok_credentials(
@@ -319,7 +325,7 @@ async def disconnect_tiktok(request: DisconnectRequest):
 # ==========================================
 
 async def upload_to_tiktok(user_id: str, video_path: str, title: str,
-                           description: str, tags_list: list):
+                           description: str, tags_list: list, cover_timestamp_ms: int = None):
     from models.database import SessionLocal, PlatformConnection
     
     # Token-Gültigkeit prüfen + ggf. auto-refreshen
@@ -340,17 +346,18 @@ async def upload_to_tiktok(user_id: str, video_path: str, title: str,
 
         if needs_refresh and conn.refresh_token:
             logger.info(f"🔄 TikTok Token abgelaufen – Auto-Refresh für User {user_id}")
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    "https://open.tiktokapis.com/v2/oauth/token/",
-                    data={
-                        "client_key": settings.TIKTOK_CLIENT_KEY,
-                        "client_secret": settings.TIKTOK_CLIENT_SECRET,
-                        "grant_type": "refresh_token",
-                        "refresh_token": conn.refresh_token
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                )
+            with timed(TOKEN_REFRESH_SECONDS, platform="tiktok"):
+                async with httpx.AsyncClient() as client:
+                    resp = await client.post(
+                        f"{TIKTOK_API_BASE}/v2/oauth/token/",
+                        data={
+                            "client_key": settings.TIKTOK_CLIENT_KEY,
+                            "client_secret": settings.TIKTOK_CLIENT_SECRET,
+                            "grant_type": "refresh_token",
+                            "refresh_token": conn.refresh_token
+                        },
+                        headers={"Content-Type": "application/x-www-form-urlencoded"}
+                    )
             result = resp.json()
             access_token = result.get("access_token", conn.access_token)
             new_refresh = result.get("refresh_token", conn.refresh_token)
@@ -371,11 +378,14 @@ async def upload_to_tiktok(user_id: str, video_path: str, title: str,
 
     # Rest bleibt gleich ↓
     caption = build_tiktok_caption(title, description, tags_list)
-    result = tiktok_upload_video(
+    # requests-basierter Upload → Thread, sonst steht der Event-Loop des Workers
+    result = await asyncio.to_thread(
+        tiktok_upload_video,
         access_token=tiktok_creds["access_token"],
         open_id=tiktok_creds["open_id"],
         video_path=video_path,
-        caption=caption
+        caption=caption,
+        cover_timestamp_ms=cover_timestamp_ms
     )
     logger.info(f"✅ TikTok Upload erfolgreich für User {user_id}")
     return result
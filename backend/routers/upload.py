@@ -1,14 +1,24 @@
-﻿from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks, Depends
+﻿from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks, Depends, Request
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
+import json
 import logging
 
+from config import settings
 from services.file_service import FileService
 from services.video_service import VideoService
-from models.database import get_db
-from models.video import Video
+from services.dispatch_service import upload_dispatcher
+from services.tracing_service import current_context
+from services.media_probe_service import MediaProbeError, media_summary, probe_media_async
+from services.transcode_service import transcoder
+from services.thumbnail_service import thumbnail_store
+from models.database import get_db, VideoModel
+from models.video import Video, VideoStatus
+from models.responses import VideoDetail, VideoItem, VideoList
+from utils.json_response import FastJSONResponse
+from utils.http_cache import cache_headers, is_not_modified, not_modified, weak_etag
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Upload"])
@@ -25,6 +35,11 @@ class DeleteVideoRequest(BaseModel):
     user_id: str
 
 
+class BulkDeleteRequest(BaseModel):
+    user_id: str
+    video_ids: List[str]
+
+
 class UpdateVideoRequest(BaseModel):
     user_id: str
     title: Optional[str] = None
@@ -33,45 +48,100 @@ class UpdateVideoRequest(BaseModel):
     privacy_status: Optional[str] = None
 
 
+# ================================================================================
+# Helpers
+# ================================================================================
+
+VIDEO_EXTENSIONS = [".mp4", ".mov", ".avi", ".mkv", ".webm"]
+
+UPLOAD_VIDEO_REQUIRED = ("user_id", "title", "platforms")
+
+# /upload_video parst den Body selbst → Formular-Schema für die Doku von Hand
+UPLOAD_VIDEO_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["user_id", "video", "title", "platforms"],
+                    "properties": {
+                        "user_id": {"type": "string"},
+                        "video": {"type": "string", "format": "binary"},
+                        "title": {"type": "string"},
+                        "description": {"type": "string", "default": ""},
+                        "tags": {"type": "string", "default": ""},
+                        "privacy_status": {"type": "string", "default": "private"},
+                        "platforms": {"type": "string", "description": "Komma-getrennt"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def _is_video(content_type: str, filename: str) -> bool:
+    content_type = content_type or ""
+    filename = filename or ""
+    return (
+        content_type.startswith("video/") or
+        any(filename.lower().endswith(ext) for ext in VIDEO_EXTENSIONS)
+    )
+
+
+def _is_video_upload(upload: UploadFile) -> bool:
+    return _is_video(upload.content_type, upload.filename)
+
+
+def _split_list(value, lower: bool = False) -> List[str]:
+    """Akzeptiert Komma-String oder Liste"""
+    if isinstance(value, str):
+        value = value.split(",")
+    items = [str(v).strip() for v in (value or []) if str(v).strip()]
+    return [v.lower() for v in items] if lower else items
+
+
 # ================================================================================
 # Upload
 # ================================================================================
 
-@router.post("/upload_video")
+@router.post("/upload_video", openapi_extra=UPLOAD_VIDEO_OPENAPI)
 async def upload_video(
+    request: Request,
     background_tasks: BackgroundTasks,
-    user_id: str = Form(...),
-    video: UploadFile = File(...),
-    title: str = Form(...),
-    description: str = Form(""),
-    tags: str = Form(""),
-    privacy_status: str = Form("private"),
-    platforms: str = Form(...),
     db: Session = Depends(get_db)
 ):
+    """
+    Felder wie bisher (multipart/form-data): user_id, video, title, description,
+    tags, privacy_status, platforms – der Body wird selbst geparst, damit das Video
+    ohne Zwischenkopie direkt in TEMP_DIR landet
+    """
+    temp_video_path = None
     try:
+        fields, upload = await file_service.receive_upload_stream(request, "video", accept=_is_video)
+        temp_video_path = upload.path
+
+        missing = [name for name in UPLOAD_VIDEO_REQUIRED if not fields.get(name, "").strip()]
+        if missing:
+            file_service.delete_file(temp_video_path)
+            raise HTTPException(status_code=422, detail=f"Pflichtfelder fehlen: {', '.join(missing)}")
+
+        user_id = fields["user_id"]
+        title = fields["title"]
+        description = fields.get("description", "")
+        privacy_status = fields.get("privacy_status") or "private"
         logger.info(f"📤 Video-Upload Request von User {user_id}")
 
-        content_type = video.content_type or ""
-        filename = video.filename or ""
-
-        is_video = (
-            content_type.startswith("video/") or
-            any(filename.lower().endswith(ext) for ext in [".mp4", ".mov", ".avi", ".mkv", ".webm"])
-        )
-
-        if not is_video:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Hochgeladene Datei ist kein Video (Type: {content_type})"
-            )
-
-        platform_list = [p.strip().lower() for p in platforms.split(",") if p.strip()]
-        tags_list = [t.strip() for t in tags.split(",") if t.strip()]
+        platform_list = _split_list(fields["platforms"], lower=True)
+        tags_list = _split_list(fields.get("tags", ""))
 
-        # Temp-Datei speichern
-        temp_video_path = await file_service.save_temp_file(video)
-        logger.info(f"💾 Temp file saved: {temp_video_path}")
+        # Technische Metadaten (Thread-Pool, blockiert den Event Loop nicht)
+        try:
+            media = await probe_media_async(temp_video_path)
+        except MediaProbeError as e:
+            file_service.delete_file(temp_video_path)
+            raise HTTPException(status_code=400, detail=f"Datei ist kein gültiges Video: {e}")
 
         # Video in DB anlegen – file_path wird mitgespeichert
         video_record = video_service.create_video(
@@ -82,14 +152,17 @@ async def upload_video(
             tags=tags_list,
             platforms=platform_list,
             privacy_status=privacy_status,
-            file_path=temp_video_path
+            file_path=temp_video_path,
+            media=media,
+            content_hash=upload.sha256
         )
 
-        # Background Upload starten
+        # Der Dispatch-Job erzeugt zuerst Thumbnails + Cover, dann den Upload
         background_tasks.add_task(
-            video_service.process_video_upload,
+            upload_dispatcher.run,
             video_record.id,
-            temp_video_path
+            temp_video_path,
+            trace_context=current_context()
         )
 
         logger.info(f"✅ Video {video_record.id} erstellt - Background Upload gestartet")
@@ -99,6 +172,8 @@ async def upload_video(
             "status": video_record.status,
             "message": "Upload gestartet",
             "platforms": video_record.platforms,
+            "media": media_summary(video_record),
+            "preflight_errors": transcoder.preflight(platform_list, media_summary(video_record), temp_video_path),
             "created_at": video_record.created_at.isoformat()
         }
 
@@ -106,33 +181,164 @@ async def upload_video(
         raise
     except Exception as e:
         logger.error(f"❌ Video-Upload fehlgeschlagen: {str(e)}", exc_info=True)
+        # Keine verwaiste Temp-Datei hinterlassen
+        if temp_video_path:
+            file_service.delete_file(temp_video_path)
         raise HTTPException(status_code=500, detail=f"Upload fehlgeschlagen: {str(e)}")
 
 
+@router.post("/upload_videos")
+async def upload_videos(
+    background_tasks: BackgroundTasks,
+    user_id: str = Form(...),
+    videos: List[UploadFile] = File(...),
+    manifest: str = Form(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Batch-Upload: mehrere Videos in einem Request
+
+    manifest: JSON-Liste, ein Eintrag pro Datei (gleiche Reihenfolge wie `videos`)
+        [{"title": "...", "description": "...", "tags": "a,b", "platforms": ["youtube"],
+          "privacy_status": "private"}, ...]
+    """
+    try:
+        logger.info(f"📤 Batch-Upload Request von User {user_id}: {len(videos)} Dateien")
+
+        try:
+            items = json.loads(manifest)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Manifest ist kein gültiges JSON")
+
+        if not isinstance(items, list) or len(items) != len(videos):
+            raise HTTPException(
+                status_code=400,
+                detail="Manifest muss eine Liste mit einem Eintrag pro Datei sein"
+            )
+
+        if len(videos) > settings.UPLOAD_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Maximal {settings.UPLOAD_BATCH_MAX_ITEMS} Videos pro Batch"
+            )
+
+        results = []
+        accepted = []
+
+        # Validieren + jede Datei auf Disk streamen
+        for index, (video, item) in enumerate(zip(videos, items)):
+            result = {"index": index, "filename": video.filename}
+            results.append(result)
+
+            if not isinstance(item, dict):
+                result["error"] = "Ungültiger Manifest-Eintrag"
+                continue
+            if not _is_video_upload(video):
+                result["error"] = f"Datei ist kein Video (Type: {video.content_type or ''})"
+                continue
+
+            title = str(item.get("title") or "").strip()
+            platform_list = _split_list(item.get("platforms"), lower=True)
+            if not title:
+                result["error"] = "Titel fehlt"
+                continue
+            if not platform_list:
+                result["error"] = "Keine Plattform angegeben"
+                continue
+
+            try:
+                temp_video_path = await file_service.save_temp_file(video)
+            except HTTPException as e:
+                result["error"] = e.detail
+                continue
+            except Exception as e:
+                result["error"] = f"Datei konnte nicht gespeichert werden: {str(e)}"
+                continue
+
+            try:
+                media = await probe_media_async(temp_video_path)
+            except MediaProbeError as e:
+                file_service.delete_file(temp_video_path)
+                result["error"] = f"Datei ist kein gültiges Video: {e}"
+                continue
+            result["media"] = media.as_columns() if media else None
+            result["preflight_errors"] = transcoder.preflight(platform_list, result["media"], temp_video_path)
+
+            accepted.append((result, {
+                "title": title,
+                "description": item.get("description") or "",
+                "tags": _split_list(item.get("tags")),
+                "platforms": platform_list,
+                "privacy_status": item.get("privacy_status") or "private",
+                "file_path": temp_video_path,
+                "media": media,
+            }))
+
+        # Alle Videos mit einem Bulk-INSERT anlegen
+        try:
+            rows = video_service.create_videos(db, user_id, [data for _, data in accepted])
+        except Exception:
+            db.rollback()
+            for _, data in accepted:
+                file_service.delete_file(data["file_path"])
+            raise
+
+        jobs = []
+        for (result, _), row in zip(accepted, rows):
+            result.update({
+                "video_id": row["id"],
+                "status": row["status"],
+                "platforms": row["platforms"],
+            })
+            jobs.append((row["id"], row["file_path"]))
+
+        # Alle Videos auf einmal einreihen (Parallelität begrenzt) – jeder Job
+        # erzeugt seine Thumbnails selbst, statt erst den ganzen Batch abzuwarten
+        if jobs:
+            background_tasks.add_task(upload_dispatcher.run_batch, jobs, trace_context=current_context())
+
+        logger.info(f"✅ Batch-Upload: {len(jobs)}/{len(videos)} Videos eingereiht")
+
+        return {
+            "total": len(videos),
+            "accepted": len(jobs),
+            "rejected": len(videos) - len(jobs),
+            "message": "Batch-Upload gestartet",
+            "results": results
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Batch-Upload fehlgeschlagen: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Batch-Upload fehlgeschlagen: {str(e)}")
+
+
 # ================================================================================
 # Video Status & Info
 # ================================================================================
 
-@router.get("/video/{video_id}")
-async def get_video_status(video_id: str, db: Session = Depends(get_db)):
+@router.get("/video/{video_id}", response_model=VideoDetail)
+async def get_video_status(video_id: str, request: Request, db: Session = Depends(get_db)):
     try:
+        # Wird ständig gepollt: erst nur die Version lesen, unverändert → 304
+        version = video_service.get_video_version(db, video_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail=f"Video {video_id} nicht gefunden")
+        etag = weak_etag("video", video_id, version)
+        if is_not_modified(request, etag, version):
+            return not_modified(etag, version)
+
         video = video_service.get_video(db, video_id)
         if not video:
             raise HTTPException(status_code=404, detail=f"Video {video_id} nicht gefunden")
 
-        return {
-            "video_id": video.id,
-            "status": video.status,
-            "title": video.title,
-            "description": video.description,
-            "platforms": video.platforms,
-            "tags": video.tags,
-            "privacy_status": video.privacy_status,
-            "upload_results": video.upload_results or {},
-            "errors": video.errors,
-            "created_at": video.created_at.isoformat(),
-            "updated_at": video.updated_at.isoformat() if video.updated_at else None
-        }
+        # ETag aus der tatsächlich gelesenen Zeile (falls sich zwischendurch etwas geändert hat)
+        version = video.updated_at or video.created_at
+        return FastJSONResponse(
+            VideoDetail.from_model(video, media_summary(video), thumbnail_store.urls(video)),
+            headers=cache_headers(weak_etag("video", video_id, version), version)
+        )
 
     except HTTPException:
         raise
@@ -141,31 +347,14 @@ async def get_video_status(video_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Fehler beim Abrufen des Videos: {str(e)}")
 
 
-@router.get("/videos/user/{user_id}")
+@router.get("/videos/user/{user_id}", response_model=VideoList)
 async def get_user_videos(user_id: str, db: Session = Depends(get_db)):
     try:
         videos = video_service.get_user_videos(db, user_id)
 
-        return {
-            "user_id": user_id,
-            "total": len(videos),
-            "videos": [
-                {
-                    "video_id": v.id,
-                    "title": v.title,
-                    "description": v.description,
-                    "status": v.status,
-                    "platforms": v.platforms,
-                    "tags": v.tags,
-                    "privacy_status": v.privacy_status,
-                    "upload_results": v.upload_results or {},
-                    "errors": v.errors,
-                    "created_at": v.created_at.isoformat(),
-                    "updated_at": v.updated_at.isoformat() if v.updated_at else None
-                }
-                for v in videos
-            ]
-        }
+        return FastJSONResponse(VideoList.from_items(
+            user_id, [VideoItem.from_model(v, thumbnail_store.urls(v)) for v in videos]
+        ))
 
     except Exception as e:
         logger.error(f"❌ Fehler beim Abrufen der Videos für User {user_id}: {str(e)}")
@@ -251,28 +440,14 @@ async def delete_video(
             raise HTTPException(status_code=403, detail="Nicht autorisiert")
 
         video_title = video.title
-        platforms = video.platforms or []
-        upload_results = video.upload_results or {}
-
-        # Plattform-Löschung (Best Effort)
-        for platform in platforms:
-            platform_video_id = (upload_results.get(platform) or {}).get("video_id")
-            if not platform_video_id:
-                logger.info(f"ℹ️ Keine Plattform-Video-ID für {platform} – überspringe")
-                continue
-            try:
-                if platform == "youtube":
-                    from routers.youtube import delete_from_youtube
-                    await delete_from_youtube(request.user_id, platform_video_id)
-                elif platform == "tiktok":
-                    from routers.tiktok import delete_from_tiktok
-                    await delete_from_tiktok(request.user_id, platform_video_id)
-                elif platform == "instagram":
-                    from routers.instagram import delete_from_instagram
-                    await delete_from_instagram(request.user_id, platform_video_id)
-                logger.info(f"✅ Video von {platform} gelöscht")
-            except Exception as e:
-                logger.warning(f"⚠️ Platform-Delete fehlgeschlagen ({platform}): {str(e)}")
+        video_hash = video.content_hash
+
+        # Plattform-Löschung (Best Effort, parallel)
+        platform_results = await video_service.delete_from_platforms(
+            request.user_id,
+            video.platforms or [],
+            video.upload_results or {}
+        )
 
         # Lokale Datei löschen (falls noch vorhanden)
         if video.file_path:
@@ -280,11 +455,13 @@ async def delete_video(
 
         # Aus DB löschen
         video_service.delete_video(db, video_id)
+        thumbnail_store.release(db, [video_hash])
 
         return {
             "success": True,
             "message": f"Video '{video_title}' wurde gelöscht",
-            "video_id": video_id
+            "video_id": video_id,
+            "platform_results": platform_results
         }
 
     except HTTPException:
@@ -292,3 +469,65 @@ async def delete_video(
     except Exception as e:
         logger.error(f"❌ Delete fehlgeschlagen für Video {video_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Löschen fehlgeschlagen: {str(e)}")
+
+
+@router.post("/videos/delete", status_code=202)
+async def delete_videos(
+    request: BulkDeleteRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-Delete: prüft Besitz, markiert die Videos und löscht im Hintergrund
+
+    Videos, die der Dispatcher noch hochlädt (pending/processing), landen in
+    "conflict" – sonst verschwände die Temp-Datei mitten im Upload und später
+    fertige Plattform-Posts würden nie gelöscht.
+    """
+    try:
+        video_ids = list(dict.fromkeys(request.video_ids))
+        logger.info(f"🗑️ Bulk-Delete Request: {len(video_ids)} Videos, user_id={request.user_id}")
+
+        # Zeilen sperren, damit der Dispatcher nicht parallel auf processing umschaltet
+        videos = db.query(VideoModel).filter(VideoModel.id.in_(video_ids)).with_for_update().all()
+        found = {v.id: v for v in videos}
+
+        accepted = []
+        not_found = []
+        forbidden = []
+        conflict = []
+        for video_id in video_ids:
+            video = found.get(video_id)
+            if not video:
+                not_found.append(video_id)
+            elif video.user_id != request.user_id:
+                forbidden.append(video_id)
+            elif video.status in (VideoStatus.PENDING.value, VideoStatus.PROCESSING.value):
+                conflict.append(video_id)
+            else:
+                video.status = VideoStatus.DELETING.value
+                video.updated_at = datetime.now()
+                accepted.append(video_id)
+
+        # Auch ohne Treffer committen → Zeilensperren sofort freigeben
+        db.commit()
+        if accepted:
+            background_tasks.add_task(
+                video_service.delete_videos_background,
+                accepted,
+                request.user_id,
+                trace_context=current_context()
+            )
+
+        return {
+            "success": True,
+            "message": f"{len(accepted)} Videos werden gelöscht",
+            "accepted": accepted,
+            "not_found": not_found,
+            "forbidden": forbidden,
+            "conflict": conflict
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Bulk-Delete fehlgeschlagen: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Löschen fehlgeschlagen: {str(e)}")
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from services.user_service import UserService
 from services.token_storage import TokenStorage
+from services.youtube_service import can_delete
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="", tags=["User Management"])
@@ -22,8 +23,9 @@ async def get_user_status(user_id: str):
     connected_platforms = []
     
     # YouTube
-    if (user_service.get_platform_credentials(user_id, "youtube") or 
-        token_storage.load_youtube_credentials(user_id)):
+    youtube_creds = (user_service.get_platform_credentials(user_id, "youtube") or
+                     token_storage.load_youtube_credentials(user_id))
+    if youtube_creds:
         
         # Get token file timestamp for connected_at
         token_path = Path("tokens") / f"{user_id}_youtube_token.json"
@@ -35,7 +37,9 @@ async def get_user_status(user_id: str):
         connected_platforms.append({
             "platform": "youtube",
             "connected_at": connected_at,
-            "account_id": "N/A"  # Could be extracted from token later
+            "account_id": "N/A",  # Could be extracted from token later
+            # Alte Verbindungen ohne Delete-Scope → Frontend bittet um Neuverbindung
+            "needs_reconnect": not can_delete(youtube_creds)
         })
     
     # TikTok
@@ -1,16 +1,22 @@
 ﻿from fastapi import APIRouter, UploadFile, File, Form, Request as FastAPIRequest, HTTPException, Depends  # âœ… FÃ¼ge Depends hinzu
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session  # âœ… NEU: Import Session
+import asyncio
 import logging
 import json
 
-from services.youtube_service import get_youtube_auth_url, authenticate_youtube_with_code, upload_video_to_youtube
+from services.youtube_service import (
+    get_youtube_auth_url, authenticate_youtube_with_code, upload_video_to_youtube, delete_video_from_youtube,
+    can_delete, YouTubeReconnectRequired
+)
 from config import settings
 from services.user_service import UserService
 from services.file_service import FileService
 from services.token_storage import TokenStorage
 from models.database import get_db  # âœ… NEU: Import get_db
-from google.oauth2.credentials import Credentials
+from utils.lazy_imports import lazy_module
+
+google_credentials = lazy_module("google.oauth2.credentials")
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="", tags=["YouTube"])
@@ -167,7 +173,8 @@ async def youtube_oauth_callback(request: FastAPIRequest, db: Session = Depends(
         if existing_platform:
             logger.info(f"ðŸ“ Updating existing YouTube connection")
             existing_platform.connected = True
-            existing_platform.access_token = credentials.token
+            # access_token bleibt das vollständige Token-JSON aus save_youtube_credentials
+            # (inkl. Scopes – ohne die gilt die Verbindung als "neu verbinden")
             existing_platform.refresh_token = credentials.refresh_token
             existing_platform.token_expiry = credentials.expiry
             existing_platform.updated_at = datetime.now()
@@ -215,13 +222,9 @@ async def youtube_oauth_callback(request: FastAPIRequest, db: Session = Depends(
 
 
 
-def upload_to_youtube(user_id: str, video_path: str, title: str, 
-                     description: str, tags_list: list, privacy_status: str):
+def _get_youtube_credentials(user_id: str) -> "google_credentials.Credentials":
     """
-    Hilfsfunktion für YouTube Upload
-    
-    Returns:
-        dict: Upload-Ergebnis
+    Lädt YouTube Credentials (Memory → DB) als Credentials Objekt
     """
     logger.info(f"🔍 Suche YouTube Credentials für User: {user_id}")
     
@@ -247,7 +250,7 @@ def upload_to_youtube(user_id: str, video_path: str, title: str,
     # ✅ Konvertiere dict zu Credentials Objekt (Import ist jetzt oben)
     if isinstance(youtube_creds, dict):
         logger.info("🔄 Konvertiere dict zu Credentials Objekt")
-        credentials = Credentials(
+        credentials = google_credentials.Credentials(
             token=youtube_creds.get("token"),
             refresh_token=youtube_creds.get("refresh_token"),
             token_uri=youtube_creds.get("token_uri", "https://oauth2.googleapis.com/token"),
@@ -255,9 +258,26 @@ def upload_to_youtube(user_id: str, video_path: str, title: str,
             client_secret=youtube_creds.get("client_secret"),
             scopes=youtube_creds.get("scopes", ["https://www.googleapis.com/auth/youtube.upload"])
         )
+        # Credentials Objekt cachen – weitere Uploads desselben Accounts nutzen
+        # es wieder (inkl. bereits refreshtem Access Token)
+        user_service.set_platform_credentials(user_id, "youtube", credentials)
     else:
         credentials = youtube_creds
     
+    return credentials
+
+
+def upload_to_youtube(user_id: str, video_path: str, title: str, 
+                     description: str, tags_list: list, privacy_status: str,
+                     thumbnail_path: str = None):
+    """
+    Hilfsfunktion für YouTube Upload
+    
+    Returns:
+        dict: Upload-Ergebnis
+    """
+    credentials = _get_youtube_credentials(user_id)
+    
     logger.info(f"🚀 Starte YouTube Upload mit Credentials-Typ: {type(credentials)}")
     
     result = upload_video_to_youtube(
@@ -266,9 +286,27 @@ def upload_to_youtube(user_id: str, video_path: str, title: str,
         title=title,
         description=description,
         tags=tags_list,
-        privacy_status=privacy_status
+        privacy_status=privacy_status,
+        thumbnail_path=thumbnail_path
     )
     
     logger.info(f"✅ YouTube Upload erfolgreich für User {user_id}")
     return result
 
+
+def _delete_blocking(user_id: str, platform_video_id: str):
+    credentials = _get_youtube_credentials(user_id)
+    if not can_delete(credentials):
+        raise YouTubeReconnectRequired("YouTube neu verbinden, um Videos löschen zu können")
+    delete_video_from_youtube(credentials, platform_video_id)
+
+
+async def delete_from_youtube(user_id: str, platform_video_id: str):
+    """
+    Hilfsfunktion für YouTube Delete (Token-Datei + API-Call im Thread)
+
+    Raises:
+        YouTubeReconnectRequired: Verbindung hat nur den alten Upload-Scope
+    """
+    await asyncio.to_thread(_delete_blocking, user_id, platform_video_id)
+    logger.info(f"✅ YouTube Video {platform_video_id} gelöscht für User {user_id}")
@@ -0,0 +1,181 @@
+"""
+Admission Service
+Lastabwurf für Uploads, bevor ein Byte des Bodys gelesen wird
+
+Signale:
+- Temp-Speicher: Quota + Freiplatz inkl. der Bytes, die gerade noch empfangen werden
+- In-flight Ingest: Content-Length aller laufenden Uploads dieses Workers
+- Job-Queue: Upload-Jobs, die im Dispatcher auf einen Slot warten
+- DB-Pool: Anteil ausgecheckter Verbindungen
+
+Über Kapazität → sofort 503 mit Retry-After. /ready liefert dieselben Signale
+für den Load Balancer. In-flight, Queue und Pool gelten pro Worker, Disk für alle.
+"""
+import logging
+from typing import Dict, NamedTuple, Optional
+
+from config import settings
+from models.database import engine
+from services.dispatch_service import upload_dispatcher
+from services.metrics_service import ADMISSION_REJECTED
+from services.temp_storage_service import temp_storage
+from utils.json_response import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Endpoints, deren Body erst nach der Admission gelesen wird
+ADMISSION_PATHS = {"/api/upload/upload_video", "/api/upload/upload_videos"}
+
+# Retry-After je Grund: Disk braucht den Sweeper, Pool/Ingest entspannen sich schnell
+RETRY_AFTER_SECONDS = {
+    "quota": 60,
+    "low_disk": 60,
+    "ingest": 15,
+    "queue": 30,
+    "db_pool": 5,
+}
+
+MESSAGES = {
+    "quota": "Speicher für Uploads aktuell ausgelastet, bitte später erneut versuchen",
+    "low_disk": "Speicher für Uploads aktuell ausgelastet, bitte später erneut versuchen",
+    "ingest": "Zu viele Uploads gleichzeitig, bitte gleich erneut versuchen",
+    "queue": "Upload-Warteschlange voll, bitte später erneut versuchen",
+    "db_pool": "Server ausgelastet, bitte gleich erneut versuchen",
+}
+
+
+class Rejection(NamedTuple):
+    reason: str
+    message: str
+    retry_after: int
+
+
+class AdmissionController:
+    """Entscheidet pro Upload-Request über Annahme oder 503"""
+
+    def __init__(self, max_inflight_bytes: int, max_queued_jobs: int, db_pool_max_saturation: float):
+        self.max_inflight_bytes = max_inflight_bytes
+        self.max_queued_jobs = max_queued_jobs
+        self.db_pool_max_saturation = db_pool_max_saturation
+        # Nur im Event Loop verändert → kein Lock nötig
+        self.inflight_bytes = 0
+        self.inflight_uploads = 0
+        self._rejected: Dict[str, int] = {}
+
+    # ==========================================
+    # Signale
+    # ==========================================
+
+    @staticmethod
+    def db_pool_saturation() -> Optional[float]:
+        pool = engine.pool
+        try:
+            capacity = pool.size() + max(0, getattr(pool, "_max_overflow", 0))
+            return pool.checkedout() / capacity if capacity else None
+        except AttributeError:
+            return None
+
+    def signals(self) -> Dict:
+        saturation = self.db_pool_saturation()
+        return {
+            "temp_usage_bytes": temp_storage.usage(),
+            "temp_max_bytes": temp_storage.max_bytes,
+            "temp_free_bytes": temp_storage.free_bytes(),
+            "inflight_uploads": self.inflight_uploads,
+            "inflight_bytes": self.inflight_bytes,
+            "max_inflight_bytes": self.max_inflight_bytes,
+            "queued_jobs": upload_dispatcher.queued,
+            "running_jobs": upload_dispatcher.running,
+            "max_queued_jobs": self.max_queued_jobs,
+            "db_pool_saturation": round(saturation, 3) if saturation is not None else None,
+        }
+
+    def check(self, incoming_bytes: int = 0) -> Optional[Rejection]:
+        """None = Request darf rein; incoming_bytes = erwartete Größe des neuen Bodys"""
+        if self.inflight_bytes and self.inflight_bytes + incoming_bytes > self.max_inflight_bytes:
+            reason = "ingest"
+        elif upload_dispatcher.queued >= self.max_queued_jobs:
+            reason = "queue"
+        elif (self.db_pool_saturation() or 0) >= self.db_pool_max_saturation:
+            reason = "db_pool"
+        else:
+            # Bytes laufender Uploads stehen noch nicht in TEMP_DIR, sind aber schon zugesagt
+            reason = temp_storage.capacity_problem(self.inflight_bytes + incoming_bytes)
+        if reason is None:
+            return None
+        return Rejection(reason, MESSAGES[reason], RETRY_AFTER_SECONDS[reason])
+
+    def reject(self, rejection: Rejection):
+        self._rejected[rejection.reason] = self._rejected.get(rejection.reason, 0) + 1
+        ADMISSION_REJECTED.labels(reason=rejection.reason).inc()
+        logger.warning(f"⚠️ Upload abgewiesen ({rejection.reason}), Retry-After {rejection.retry_after}s")
+
+    def stats(self) -> Dict:
+        return {**self.signals(), "rejected": dict(self._rejected)}
+
+
+admission = AdmissionController(
+    max_inflight_bytes=settings.UPLOAD_MAX_INFLIGHT_MB * MB,
+    max_queued_jobs=settings.UPLOAD_MAX_QUEUED_JOBS,
+    db_pool_max_saturation=settings.DB_POOL_MAX_SATURATION
+)
+
+
+def rejection_response(rejection: Rejection) -> FastJSONResponse:
+    return FastJSONResponse(
+        {"detail": rejection.message, "reason": rejection.reason},
+        status_code=503,
+        headers={"Retry-After": str(rejection.retry_after)}
+    )
+
+
+class AdmissionMiddleware:
+    """Prüft Upload-Requests vor dem Body und hält ihre Größe bis zur Antwort als in-flight"""
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in ADMISSION_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        try:
+            content_length = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            content_length = 0
+        # Ohne Content-Length (chunked) mit dem Maximum rechnen
+        incoming = content_length or settings.MAX_FILE_SIZE_MB * MB
+
+        rejection = self.controller.check(incoming)
+        if rejection is not None:
+            self.controller.reject(rejection)
+            await rejection_response(rejection)(scope, receive, send)
+            return
+
+        self.controller.inflight_bytes += incoming
+        self.controller.inflight_uploads += 1
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self.controller.inflight_bytes -= incoming
+                self.controller.inflight_uploads -= 1
+
+        async def send_wrapper(message):
+            await send(message)
+            # Background Tasks (Dispatch) laufen nach der Antwort noch im selben Aufruf –
+            # die zählen über die Job-Queue, nicht mehr als Ingest
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                release()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
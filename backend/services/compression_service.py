@@ -0,0 +1,241 @@
+"""
+Compression Service
+Ausgehandelte Response-Kompression (brotli/gzip) als ASGI-Middleware
+
+- Accept-Encoding mit q-Werten; br bevorzugt, gzip als Fallback
+- Nur komprimierbare Typen (JSON, HTML, Text, JS, CSS, SVG) ab COMPRESSION_MIN_SIZE
+- Bereits kodierte Responses (z.B. vorkomprimierte Static Pages), Streams
+  (Video-Dateien), Range-Responses und 204/304 laufen unverändert durch
+- brotli ist optional: ohne das Paket wird nur gzip angeboten
+- StaticAsset: einmal gerenderte Seiten, beim Start vorkomprimiert, mit ETag/304
+"""
+import gzip
+import hashlib
+import logging
+from typing import Optional
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import Response
+
+from config import settings
+from utils.http_cache import etag_matches
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - abhängig von der Installation
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+# Größere Bodies im Thread komprimieren, damit der Event-Loop frei bleibt
+THREAD_THRESHOLD_BYTES = 256 * 1024
+
+
+def supported_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str, available: Optional[tuple] = None) -> Optional[str]:
+    """
+    Wählt die Kodierung aus dem Accept-Encoding Header
+
+    Returns:
+        "br", "gzip" oder None (unkomprimiert)
+    """
+    available = available or supported_encodings()
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:  # Reihenfolge = Präferenz bei gleichem q
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    """static=True: maximale Stufe (einmalig beim Start), sonst schnelle Stufe pro Request"""
+    if encoding == "br":
+        quality = 11 if static else settings.COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    level = 9 if static else settings.COMPRESSION_GZIP_LEVEL
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return any(content_type.startswith(prefix) for prefix in COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Komprimiert einteilige Responses je nach Accept-Encoding"""
+
+    def __init__(self, app, min_size: int = 1024):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            if start_message is not None:
+                start, start_message = start_message, None
+                body = message.get("body", b"")
+                if message.get("more_body", False) or not self._should_compress(start, body):
+                    passthrough = True
+                    await send(self._with_vary(start) if self._varies(start) else start)
+                    await send(message)
+                    return
+                if len(body) > THREAD_THRESHOLD_BYTES:
+                    compressed = await anyio.to_thread.run_sync(compress, body, encoding)
+                else:
+                    compressed = compress(body, encoding)
+                await send(self._compressed_start(start, encoding, len(compressed)))
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, start: dict, body: bytes) -> bool:
+        if start["status"] in (204, 206, 304) or len(body) < self.min_size:
+            return False
+        response_headers = {k.lower(): v for k, v in start.get("headers", [])}
+        if b"content-encoding" in response_headers or b"content-range" in response_headers:
+            return False
+        if b"no-transform" in response_headers.get(b"cache-control", b"").lower():
+            return False
+        return _is_compressible(response_headers.get(b"content-type", b"").decode("latin-1"))
+
+    @staticmethod
+    def _varies(start: dict) -> bool:
+        """Hätte je nach Accept-Encoding anders ausfallen können → Vary für Caches"""
+        response_headers = {k.lower(): v for k, v in start.get("headers", [])}
+        if b"content-encoding" in response_headers:
+            return False
+        return _is_compressible(response_headers.get(b"content-type", b"").decode("latin-1"))
+
+    @staticmethod
+    def _with_vary(start: dict) -> dict:
+        headers = list(start.get("headers", []))
+        if not any(k.lower() == b"vary" and b"accept-encoding" in v.lower() for k, v in headers):
+            headers.append((b"vary", b"Accept-Encoding"))
+        return {**start, "headers": headers}
+
+    @staticmethod
+    def _compressed_start(start: dict, encoding: str, length: int) -> dict:
+        headers = []
+        vary = None
+        for key, value in start.get("headers", []):
+            name = key.lower()
+            if name == b"content-length":
+                continue
+            if name == b"etag" and not value.startswith(b"W/"):
+                # Andere Bytes → starker ETag gilt nicht mehr (wie nginx)
+                value = b"W/" + value
+            if name == b"vary":
+                vary = value
+                if b"accept-encoding" not in value.lower():
+                    value = value + b", Accept-Encoding"
+            headers.append((key, value))
+        if vary is None:
+            headers.append((b"vary", b"Accept-Encoding"))
+        headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"content-length", str(length).encode()))
+        return {**start, "headers": headers}
+
+
+# ==========================================
+# Vorkomprimierte statische Inhalte
+# ==========================================
+
+class StaticAsset:
+    """
+    Einmal gerenderter Inhalt, beim Start in allen Kodierungen vorkomprimiert
+
+    Jede Variante hat einen eigenen starken ETag; 304 nur, wenn If-None-Match den ETag
+    der ausgehandelten Variante enthält (sonst hätte der Client die falschen Bytes im Cache).
+    Die Middleware lässt die Responses wegen Content-Encoding/no-transform in Ruhe.
+    """
+
+    def __init__(self, body: bytes, media_type: str, max_age: Optional[int] = None):
+        self.body = body
+        self.media_type = media_type
+        self.max_age = max_age
+        self._variants: Optional[dict] = None
+
+    def prepare(self):
+        if self._variants is not None:
+            return
+        digest = hashlib.sha256(self.body).hexdigest()[:20]
+        variants = {None: (self.body, f'"{digest}"')}
+        for encoding in supported_encodings():
+            suffix = "br" if encoding == "br" else "gz"
+            variants[encoding] = (compress(self.body, encoding, static=True), f'"{digest}-{suffix}"')
+        self._variants = variants
+
+    def _headers(self, etag: str, encoding: Optional[str]) -> dict:
+        max_age = self.max_age if self.max_age is not None else settings.STATIC_PAGES_MAX_AGE
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={max_age}, no-transform",
+            "Vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return headers
+
+    def response(self, request: Request) -> Response:
+        self.prepare()
+        encoding = negotiate(
+            request.headers.get("accept-encoding", ""),
+            tuple(e for e in self._variants if e is not None),
+        )
+        body, etag = self._variants[encoding]
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, [etag]):
+            return Response(status_code=304, headers=self._headers(etag, None))
+
+        return Response(content=body, media_type=self.media_type, headers=self._headers(etag, encoding))
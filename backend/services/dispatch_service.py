@@ -0,0 +1,77 @@
+"""
+Dispatch Service für Background-Uploads
+Begrenzt, wie viele Videos pro Worker gleichzeitig auf die Plattformen gehen
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from config import settings
+from services.thumbnail_service import thumbnail_store
+from services.tracing_service import SpanContext, tracer
+from services.video_service import VideoService
+
+logger = logging.getLogger(__name__)
+
+
+class UploadDispatcher:
+    """Führt Thumbnails + process_video_upload mit begrenzter Parallelität aus"""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.queued = 0
+        self.running = 0
+
+    async def run(self, video_id: str, temp_file_path: str, trace_context: Optional[SpanContext] = None):
+        """
+        Wartet auf einen freien Slot, erzeugt Thumbnails + Cover-Zeitpunkt
+        und startet dann den Upload (TikTok/YouTube nutzen das Cover bereits)
+
+        Args:
+            trace_context: Trace des auslösenden Requests (Job-Span wird dessen Kind)
+        """
+        with tracer.span("job.upload_video", parent=trace_context, video_id=video_id) as span:
+            self.queued += 1
+            acquired = False
+            wait_start = time.perf_counter()
+            try:
+                await self._semaphore.acquire()
+                acquired = True
+            finally:
+                self.queued -= 1
+                if span:
+                    span.set_attribute("queue_wait_ms", round((time.perf_counter() - wait_start) * 1000, 3))
+
+            self.running += 1
+            try:
+                await thumbnail_store.generate_for_video(video_id, temp_file_path)
+                await VideoService.process_video_upload(video_id, temp_file_path)
+            finally:
+                self.running -= 1
+                if acquired:
+                    self._semaphore.release()
+
+    async def run_batch(self, jobs: List[Tuple[str, str]], trace_context: Optional[SpanContext] = None):
+        """Reiht alle Videos eines Batches auf einmal ein"""
+        logger.info(f"📦 Batch-Dispatch: {len(jobs)} Videos (max. {self.max_concurrency} parallel)")
+        with tracer.span("job.upload_batch", parent=trace_context, videos=len(jobs)):
+            # gather kopiert den Kontext → die einzelnen Jobs hängen am Batch-Span
+            results = await asyncio.gather(
+                *(self.run(video_id, path) for video_id, path in jobs),
+                return_exceptions=True
+            )
+        for (video_id, _), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Dispatch fehlgeschlagen für {video_id}: {result}")
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued,
+            "running": self.running,
+        }
+
+
+upload_dispatcher = UploadDispatcher(settings.UPLOAD_DISPATCH_CONCURRENCY)
@@ -1,363 +1,327 @@
+"""
+Email Service
+Emails werden in der Outbox-Tabelle abgelegt (gleiche Transaktion wie der
+Request) und von einem Hintergrund-Thread über eine persistente, authentifizierte
+SMTP-Verbindung verschickt – mit Batches und Retry/Backoff.
+
+Template-Emails speichern nur Template-Name + Werte; gerendert wird beim Versand
+aus den vorkompilierten Skeletten in email_templates.
+"""
 import smtplib
 import logging
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
-import secrets
-from typing import Optional
+from typing import Dict, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from config import settings
+from models.database import SessionLocal, EmailOutbox
+from services.email_templates import EMAIL_TEMPLATES
 
 logger = logging.getLogger(__name__)
 
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+OUTBOX_RETENTION_DAYS = 7
+
+
+def _build_message(to_email: str, subject: str, html_content: str, text_content: Optional[str] = None) -> MIMEMultipart:
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = f"{settings.FROM_NAME} <{settings.FROM_EMAIL}>"
+    message["To"] = to_email
+
+    # Text zuerst, HTML zuletzt (bevorzugte Variante)
+    if text_content:
+        message.attach(MIMEText(text_content, "plain"))
+    message.attach(MIMEText(html_content, "html"))
+    return message
+
+
+def _is_permanent_error(error: Exception) -> bool:
+    """5xx-Antworten und abgelehnte Empfänger werden nicht wiederholt"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+class EmailOutboxSender:
+    """Hintergrund-Thread, der die Outbox über eine wiederverwendete SMTP-Verbindung abarbeitet"""
+
+    def __init__(self, batch_size: int, poll_seconds: int, max_attempts: int, idle_timeout: int):
+        self.batch_size = max(1, batch_size)
+        self.poll_seconds = max(1, poll_seconds)
+        self.max_attempts = max(1, max_attempts)
+        self.idle_timeout = idle_timeout
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._sent = 0
+        self._retried = 0
+        self._failed = 0
+        self._connects = 0
+
+    # ==========================================
+    # Lifecycle
+    # ==========================================
+
+    def start(self):
+        if not settings.SMTP_HOST:
+            logger.warning("⚠️ SMTP_HOST nicht gesetzt – Emails bleiben in der Outbox")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+        logger.info("✅ Email-Outbox Sender gestartet")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def wake(self):
+        """Neue Emails committed → sofort verarbeiten statt auf das Poll-Intervall zu warten"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                processed = self._process_batch()
+            except Exception as e:
+                logger.error(f"❌ Email-Outbox Batch fehlgeschlagen: {str(e)}")
+                processed = 0
+
+            # Volle Batches direkt weiter abarbeiten, sonst warten
+            if processed < self.batch_size:
+                self._wake.wait(timeout=self.poll_seconds)
+                if self._smtp and time.monotonic() - self._last_used > self.idle_timeout:
+                    self._disconnect()
+        self._disconnect()
+
+    # ==========================================
+    # SMTP-Verbindung
+    # ==========================================
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp and time.monotonic() - self._last_used > self.idle_timeout:
+            # Relays schließen inaktive Verbindungen – lieber neu aufbauen
+            self._disconnect()
+        if self._smtp is None:
+            smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+            try:
+                if settings.SMTP_STARTTLS:
+                    smtp.starttls()
+                if settings.SMTP_USER:
+                    smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+            except Exception:
+                smtp.close()
+                raise
+            self._smtp = smtp
+            self._connects += 1
+        return self._smtp
+
+    def _disconnect(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+    def _send(self, to_email: str, message: Union[bytes, MIMEMultipart]):
+        # Eine Wiederholung, falls der Server die wiederverwendete Verbindung geschlossen hat
+        for attempt in (1, 2):
+            smtp = self._connection()
+            try:
+                if isinstance(message, bytes):
+                    # Vorkodierte Template-Nachricht
+                    smtp.sendmail(settings.FROM_EMAIL, [to_email], message)
+                else:
+                    smtp.send_message(message)
+                self._last_used = time.monotonic()
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # Socket schließen, nicht nur die Referenz verwerfen
+                self._disconnect()
+                if attempt == 2:
+                    raise
+
+    # ==========================================
+    # Outbox
+    # ==========================================
+
+    def _schedule_retry(self, row: EmailOutbox, error: Exception, now: datetime, transient: bool = False):
+        row.attempts += 1
+        row.last_error = str(error)[:1000]
+        if row.attempts >= self.max_attempts or (not transient and _is_permanent_error(error)):
+            row.status = "failed"
+            self._failed += 1
+            logger.error(f"❌ Email endgültig fehlgeschlagen an {row.to_email}: {str(error)}")
+        else:
+            delay = min(RETRY_BASE_SECONDS * 2 ** (row.attempts - 1), RETRY_MAX_SECONDS)
+            row.next_attempt_at = now + timedelta(seconds=delay)
+            self._retried += 1
+            logger.warning(f"⚠️ Email an {row.to_email} fehlgeschlagen, neuer Versuch in {delay}s: {str(error)}")
+
+    def _process_batch(self) -> int:
+        db = SessionLocal()
+        try:
+            now = datetime.now()
+            # SKIP LOCKED: mehrere Worker-Prozesse teilen sich die Outbox ohne Doppelversand
+            rows = db.query(EmailOutbox).filter(
+                EmailOutbox.status == "pending",
+                EmailOutbox.next_attempt_at <= now
+            ).order_by(EmailOutbox.next_attempt_at).limit(self.batch_size).with_for_update(skip_locked=True).all()
+
+            for index, row in enumerate(rows):
+                try:
+                    if row.template:
+                        message = EMAIL_TEMPLATES[row.template].render_message(row.to_email, row.context or {})
+                    else:
+                        message = _build_message(row.to_email, row.subject, row.html_content, row.text_content)
+                    self._send(row.to_email, message)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                    # Problem mit dieser einen Email
+                    self._schedule_retry(row, e, now)
+                    continue
+                except OSError as e:
+                    # Verbindungs-/Login-Fehler: Relay nicht erreichbar → Rest des Batches ebenfalls später
+                    self._disconnect()
+                    for pending in rows[index:]:
+                        self._schedule_retry(pending, e, now, transient=True)
+                    break
+                except Exception as e:
+                    self._schedule_retry(row, e, now)
+                    continue
+
+                row.status = "sent"
+                row.sent_at = datetime.now()
+                row.last_error = None
+                self._sent += 1
+                logger.info(f"✅ Email gesendet an {row.to_email}: {row.subject}")
+
+            db.commit()
+            return len(rows)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def cleanup(self, db: Session) -> int:
+        """Löscht verschickte Emails nach OUTBOX_RETENTION_DAYS"""
+        cutoff = datetime.now() - timedelta(days=OUTBOX_RETENTION_DAYS)
+        deleted = db.query(EmailOutbox).filter(
+            EmailOutbox.status == "sent",
+            EmailOutbox.sent_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "connected": self._smtp is not None,
+            "connects": self._connects,
+            "sent": self._sent,
+            "retried": self._retried,
+            "failed": self._failed,
+        }
+
+
+email_outbox = EmailOutboxSender(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    idle_timeout=settings.SMTP_IDLE_TIMEOUT_SECONDS
+)
+
 
 class EmailService:
-    """Service für Email-Versand"""
+    """Service für Email-Versand (über die Outbox)"""
     
-    def __init__(self):
-        self.smtp_host = settings.SMTP_HOST
-        self.smtp_port = settings.SMTP_PORT
-        self.smtp_user = settings.SMTP_USER
-        self.smtp_password = settings.SMTP_PASSWORD
-        self.from_email = settings.FROM_EMAIL
-        self.from_name = settings.FROM_NAME
+    def _add(self, db: Session, row: EmailOutbox) -> EmailOutbox:
+        db.add(row)
+        event.listen(db, "after_commit", lambda session: email_outbox.wake(), once=True)
+        return row
     
-    def send_email(self, to_email: str, subject: str, html_content: str, text_content: str = None) -> bool:
+    def enqueue(self, db: Session, to_email: str, subject: str, html_content: str, text_content: str = None) -> EmailOutbox:
         """
-        Sendet eine Email
+        Legt eine freie HTML-Email in der Outbox ab
+        
+        Wird mit der Session des Requests committed; nach dem Commit wird der
+        Sender geweckt. Kein SMTP im Request-Pfad.
         
         Args:
+            db: Session des Requests (Commit durch den Aufrufer)
             to_email: Empfänger Email
             subject: Betreff
             html_content: HTML Email Body
             text_content: Plain Text Fallback (optional)
-        
-        Returns:
-            bool: True wenn erfolgreich
         """
-        try:
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = f"{self.from_name} <{self.from_email}>"
-            message["To"] = to_email
-            
-            # Add text content
-            if text_content:
-                part1 = MIMEText(text_content, "plain")
-                message.attach(part1)
-            
-            # Add HTML content
-            part2 = MIMEText(html_content, "html")
-            message.attach(part2)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(message)
-            
-            logger.info(f"✅ Email gesendet an {to_email}: {subject}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Email-Versand fehlgeschlagen: {str(e)}")
-            return False
+        return self._add(db, EmailOutbox(
+            to_email=to_email,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.now()
+        ))
     
-    def send_verification_email(self, to_email: str, verification_token: str) -> bool:
+    def enqueue_template(self, db: Session, to_email: str, template: str, context: Dict[str, str]) -> EmailOutbox:
         """
-        Sendet Verification Email
+        Legt eine Template-Email in der Outbox ab (nur Template-Name + Werte)
         
         Args:
-            to_email: User Email
-            verification_token: Verification Token
-        """
-        verification_url = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
-        
-        subject = "Bestätige deine Email-Adresse"
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f9f9f9;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 12px 30px;
-                    background: #667eea;
-                    color: white !important;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                    font-weight: bold;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 30px;
-                    color: #666;
-                    font-size: 12px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🎉 Willkommen bei Social Media Manager!</h1>
-            </div>
-            <div class="content">
-                <h2>Bestätige deine Email-Adresse</h2>
-                <p>Vielen Dank für deine Registrierung! Bitte bestätige deine Email-Adresse, um deinen Account zu aktivieren.</p>
-                
-                <p style="text-align: center;">
-                    <a href="{verification_url}" class="button">Email bestätigen</a>
-                </p>
-                
-                <p>Oder kopiere diesen Link in deinen Browser:</p>
-                <p style="background: #fff; padding: 10px; border-radius: 5px; word-break: break-all;">
-                    {verification_url}
-                </p>
-                
-                <p><strong>Dieser Link ist 24 Stunden gültig.</strong></p>
-                
-                <p>Falls du dich nicht registriert hast, ignoriere diese Email einfach.</p>
-            </div>
-            <div class="footer">
-                <p>© 2026 Social Media Manager. Alle Rechte vorbehalten.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        Willkommen bei Social Media Manager!
-        
-        Bestätige deine Email-Adresse:
-        {verification_url}
-        
-        Dieser Link ist 24 Stunden gültig.
-        
-        Falls du dich nicht registriert hast, ignoriere diese Email.
+            db: Session des Requests (Commit durch den Aufrufer)
+            to_email: Empfänger Email
+            template: Key in EMAIL_TEMPLATES
+            context: Werte für die Platzhalter
         """
+        compiled = EMAIL_TEMPLATES[template]
+        missing = compiled.fields - context.keys()
+        if missing:
+            raise KeyError(f"Template '{template}': fehlende Werte {sorted(missing)}")
         
-        return self.send_email(to_email, subject, html_content, text_content)
+        return self._add(db, EmailOutbox(
+            to_email=to_email,
+            subject=compiled.subject,
+            template=template,
+            context=context,
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.now()
+        ))
     
-    def send_password_reset_email(self, to_email: str, reset_token: str) -> bool:
-        """
-        Sendet Password Reset Email
-        
-        Args:
-            to_email: User Email
-            reset_token: Reset Token
-        """
+    def queue_verification_email(self, db: Session, to_email: str, verification_token: str) -> EmailOutbox:
+        """Reiht Verification Email ein"""
+        verification_url = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
+        return self.enqueue_template(db, to_email, "verification", {"verification_url": verification_url})
+    
+    def queue_password_reset_email(self, db: Session, to_email: str, reset_token: str) -> EmailOutbox:
+        """Reiht Password Reset Email ein"""
         reset_url = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
-        
-        subject = "Passwort zurücksetzen"
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f9f9f9;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 12px 30px;
-                    background: #f5576c;
-                    color: white !important;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                    font-weight: bold;
-                }}
-                .warning {{
-                    background: #fff3cd;
-                    border-left: 4px solid #ffc107;
-                    padding: 15px;
-                    margin: 20px 0;
-                    border-radius: 5px;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 30px;
-                    color: #666;
-                    font-size: 12px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🔑 Passwort zurücksetzen</h1>
-            </div>
-            <div class="content">
-                <h2>Passwort-Anfrage</h2>
-                <p>Du hast eine Anfrage zum Zurücksetzen deines Passworts gestellt.</p>
-                
-                <p style="text-align: center;">
-                    <a href="{reset_url}" class="button">Neues Passwort setzen</a>
-                </p>
-                
-                <p>Oder kopiere diesen Link in deinen Browser:</p>
-                <p style="background: #fff; padding: 10px; border-radius: 5px; word-break: break-all;">
-                    {reset_url}
-                </p>
-                
-                <div class="warning">
-                    <strong>⚠️ Wichtig:</strong>
-                    <ul>
-                        <li>Dieser Link ist 1 Stunde gültig</li>
-                        <li>Der Link kann nur einmal verwendet werden</li>
-                        <li>Falls du keine Anfrage gestellt hast, ignoriere diese Email</li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer">
-                <p>© 2026 Social Media Manager. Alle Rechte vorbehalten.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        Passwort zurücksetzen
-        
-        Du hast eine Anfrage zum Zurücksetzen deines Passworts gestellt.
-        
-        Link zum Zurücksetzen:
-        {reset_url}
-        
-        Dieser Link ist 1 Stunde gültig und kann nur einmal verwendet werden.
-        
-        Falls du keine Anfrage gestellt hast, ignoriere diese Email.
-        """
-        
-        return self.send_email(to_email, subject, html_content, text_content)
+        return self.enqueue_template(db, to_email, "password_reset", {"reset_url": reset_url})
     
-    def send_welcome_email(self, to_email: str, username: str) -> bool:
-        """
-        Sendet Welcome Email nach erfolgreicher Verification
-        """
-        subject = "Willkommen! Dein Account ist aktiviert"
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f9f9f9;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 12px 30px;
-                    background: #667eea;
-                    color: white !important;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                    font-weight: bold;
-                }}
-                .feature {{
-                    background: white;
-                    padding: 15px;
-                    margin: 10px 0;
-                    border-radius: 5px;
-                    border-left: 4px solid #667eea;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 30px;
-                    color: #666;
-                    font-size: 12px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🎉 Willkommen, {username}!</h1>
-            </div>
-            <div class="content">
-                <h2>Dein Account ist jetzt aktiviert!</h2>
-                <p>Schön, dass du dabei bist. Du kannst jetzt loslegen:</p>
-                
-                <div class="feature">
-                    <strong>📹 Videos hochladen</strong><br>
-                    Lade deine Videos auf mehrere Plattformen gleichzeitig hoch
-                </div>
-                
-                <div class="feature">
-                    <strong>🔗 Plattformen verbinden</strong><br>
-                    Verbinde YouTube, TikTok und Instagram
-                </div>
-                
-                <div class="feature">
-                    <strong>📊 Analytics tracken</strong><br>
-                    Behalte den Überblick über deine Uploads
-                </div>
-                
-                <p style="text-align: center;">
-                    <a href="{settings.FRONTEND_URL}/dashboard" class="button">Zum Dashboard</a>
-                </p>
-            </div>
-            <div class="footer">
-                <p>© 2026 Social Media Manager. Alle Rechte vorbehalten.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return self.send_email(to_email, subject, html_content)
+    def queue_welcome_email(self, db: Session, to_email: str, username: str) -> EmailOutbox:
+        """Reiht Welcome Email nach erfolgreicher Verification ein"""
+        return self.enqueue_template(db, to_email, "welcome", {
+            "username": username,
+            "dashboard_url": f"{settings.FRONTEND_URL}/dashboard"
+        })
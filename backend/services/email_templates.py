@@ -0,0 +1,448 @@
+"""
+Email Templates
+Die Templates werden beim Import einmal kompiliert:
+
+- Skelett aus Literal-Segmenten und Platzhaltern (str.format-Syntax)
+- Literal-Segmente bereits quoted-printable kodiert, MIME-Header vorgefertigt
+- Plain-Text Alternative automatisch aus dem HTML erzeugt
+
+Pro Email werden nur noch die Platzhalter escaped, kodiert und eingesetzt.
+"""
+import html
+import re
+import secrets
+from email import quoprimime
+from email.header import Header
+from email.utils import formataddr, formatdate, make_msgid
+from html.parser import HTMLParser
+from string import Formatter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import settings
+
+EOL = "\r\n"
+# Soft Line Break: hält QP-Zeilen beim Einsetzen der Werte unter 76 Zeichen
+_SOFT_BREAK = b"=\r\n"
+_QP_LINE_LENGTH = 75
+
+
+def _qp_encode(text: str) -> bytes:
+    # quoprimime arbeitet zeichenweise auf "Bytes als latin-1"
+    encoded = quoprimime.body_encode(text.encode("utf-8").decode("latin-1"), maxlinelen=_QP_LINE_LENGTH, eol=EOL)
+    return encoded.encode("ascii")
+
+
+# ==========================================
+# HTML → Plain Text
+# ==========================================
+
+class _TextExtractor(HTMLParser):
+    _SKIP = {"head", "style", "script", "title"}
+    _BLOCK = {"p", "div", "h1", "h2", "h3", "ul", "ol", "table", "tr", "br"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+        self._href: Optional[str] = None
+        self._link_text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip += 1
+        elif tag == "a":
+            self._href = dict(attrs).get("href")
+            self._link_text = []
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "a":
+            # Buttons: Link-Ziel hinter den Text schreiben
+            if self._href and self._href != "".join(self._link_text).strip():
+                self.parts.append(f": {self._href}")
+            self._href = None
+        elif tag in self._BLOCK or tag == "li":
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        text = re.sub(r"\s+", " ", data)
+        self.parts.append(text)
+        if self._href is not None:
+            self._link_text.append(text)
+
+
+def html_to_text(markup: str) -> str:
+    """Einfache Plain-Text Variante eines HTML-Templates (Absätze, Listen, Links)"""
+    parser = _TextExtractor()
+    parser.feed(markup)
+    parser.close()
+    lines = [line.strip() for line in "".join(parser.parts).splitlines()]
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip() + "\n"
+
+
+# ==========================================
+# Kompilierte Skelette
+# ==========================================
+
+class _Skeleton:
+    """Vorkodierte Literal-Segmente + Platzhalter eines Template-Teils"""
+
+    def __init__(self, source: str, escape: Optional[Callable[[str], str]] = None):
+        self.escape = escape
+        self.fields: List[str] = []
+        # (Literal als str, Literal als QP-Bytes, Platzhalter oder None)
+        self.segments: List[Tuple[str, bytes, Optional[str]]] = []
+        for literal, field, _, _ in Formatter().parse(source):
+            if field is not None and not field.isidentifier():
+                raise ValueError(f"Ungültiger Platzhalter: {field!r}")
+            self.segments.append((literal, _qp_encode(literal) if literal else b"", field))
+            if field is not None and field not in self.fields:
+                self.fields.append(field)
+
+    def _value(self, values: Dict[str, str], field: str) -> str:
+        value = str(values[field])
+        return self.escape(value) if self.escape else value
+
+    def render(self, values: Dict[str, str]) -> str:
+        parts = []
+        for literal, _, field in self.segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(self._value(values, field))
+        return "".join(parts)
+
+    def render_qp(self, values: Dict[str, str]) -> bytes:
+        parts = []
+        for _, encoded, field in self.segments:
+            if encoded:
+                parts.append(encoded)
+            if field is not None:
+                if encoded:
+                    parts.append(_SOFT_BREAK)
+                parts.append(_qp_encode(self._value(values, field)))
+                parts.append(_SOFT_BREAK)
+        return b"".join(parts)
+
+
+class EmailTemplate:
+    """Einmal kompiliertes HTML-Email-Template mit automatischer Text-Alternative"""
+
+    def __init__(self, name: str, subject: str, markup: str):
+        self.name = name
+        self.subject = subject
+        self._html = _Skeleton(markup, escape=lambda value: html.escape(value, quote=True))
+        self._text = _Skeleton(html_to_text(markup))
+        self.fields = set(self._html.fields) | set(self._text.fields)
+
+        # Boundary mit "=_" kann in QP-kodiertem Inhalt nicht vorkommen
+        boundary = f"=_smm_{secrets.token_hex(8)}"
+        self._envelope = (
+            f"Subject: {Header(subject, 'utf-8').encode()}{EOL}"
+        ).encode("ascii")
+        self._mime_head = (
+            f"MIME-Version: 1.0{EOL}"
+            f'Content-Type: multipart/alternative; boundary="{boundary}"{EOL}{EOL}'
+            f"--{boundary}{EOL}"
+            f'Content-Type: text/plain; charset="utf-8"{EOL}'
+            f"Content-Transfer-Encoding: quoted-printable{EOL}{EOL}"
+        ).encode("ascii")
+        self._mime_middle = (
+            f"{EOL}--{boundary}{EOL}"
+            f'Content-Type: text/html; charset="utf-8"{EOL}'
+            f"Content-Transfer-Encoding: quoted-printable{EOL}{EOL}"
+        ).encode("ascii")
+        self._mime_tail = f"{EOL}--{boundary}--{EOL}".encode("ascii")
+
+    def _check(self, values: Dict[str, str]):
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Template '{self.name}': fehlende Werte {sorted(missing)}")
+
+    def render(self, values: Dict[str, str]) -> Tuple[str, str]:
+        """Gerenderter (html, text) Inhalt, z.B. für Vorschau oder Logs"""
+        self._check(values)
+        return self._html.render(values), self._text.render(values)
+
+    def render_message(self, to_email: str, values: Dict[str, str]) -> bytes:
+        """Komplette, versandfertige MIME-Nachricht (für smtplib.sendmail)"""
+        self._check(values)
+        headers = (
+            f"From: {formataddr((settings.FROM_NAME, settings.FROM_EMAIL or ''), charset='utf-8')}{EOL}"
+            f"To: {to_email}{EOL}"
+            f"Date: {formatdate(localtime=True)}{EOL}"
+            f"Message-ID: {make_msgid(domain=_message_id_domain())}{EOL}"
+        ).encode("utf-8")
+        return b"".join((
+            self._envelope,
+            headers,
+            self._mime_head,
+            self._text.render_qp(values),
+            self._mime_middle,
+            self._html.render_qp(values),
+            self._mime_tail,
+        ))
+
+
+def _message_id_domain() -> str:
+    # make_msgid() ohne Domain ruft bei jedem Aufruf socket.getfqdn() auf
+    return (settings.FROM_EMAIL or "localhost").rpartition("@")[2] or "localhost"
+
+
+# ==========================================
+# Templates
+# ==========================================
+
+VERIFICATION_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+            border-radius: 10px 10px 0 0;
+        }}
+        .content {{
+            background: #f9f9f9;
+            padding: 30px;
+            border-radius: 0 0 10px 10px;
+        }}
+        .button {{
+            display: inline-block;
+            padding: 12px 30px;
+            background: #667eea;
+            color: white !important;
+            text-decoration: none;
+            border-radius: 5px;
+            margin: 20px 0;
+            font-weight: bold;
+        }}
+        .footer {{
+            text-align: center;
+            margin-top: 30px;
+            color: #666;
+            font-size: 12px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🎉 Willkommen bei Social Media Manager!</h1>
+    </div>
+    <div class="content">
+        <h2>Bestätige deine Email-Adresse</h2>
+        <p>Vielen Dank für deine Registrierung! Bitte bestätige deine Email-Adresse, um deinen Account zu aktivieren.</p>
+
+        <p style="text-align: center;">
+            <a href="{verification_url}" class="button">Email bestätigen</a>
+        </p>
+
+        <p>Oder kopiere diesen Link in deinen Browser:</p>
+        <p style="background: #fff; padding: 10px; border-radius: 5px; word-break: break-all;">
+            {verification_url}
+        </p>
+
+        <p><strong>Dieser Link ist 24 Stunden gültig.</strong></p>
+
+        <p>Falls du dich nicht registriert hast, ignoriere diese Email einfach.</p>
+    </div>
+    <div class="footer">
+        <p>© 2026 Social Media Manager. Alle Rechte vorbehalten.</p>
+    </div>
+</body>
+</html>
+"""
+
+
+PASSWORD_RESET_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+            border-radius: 10px 10px 0 0;
+        }}
+        .content {{
+            background: #f9f9f9;
+            padding: 30px;
+            border-radius: 0 0 10px 10px;
+        }}
+        .button {{
+            display: inline-block;
+            padding: 12px 30px;
+            background: #f5576c;
+            color: white !important;
+            text-decoration: none;
+            border-radius: 5px;
+            margin: 20px 0;
+            font-weight: bold;
+        }}
+        .warning {{
+            background: #fff3cd;
+            border-left: 4px solid #ffc107;
+            padding: 15px;
+            margin: 20px 0;
+            border-radius: 5px;
+        }}
+        .footer {{
+            text-align: center;
+            margin-top: 30px;
+            color: #666;
+            font-size: 12px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🔑 Passwort zurücksetzen</h1>
+    </div>
+    <div class="content">
+        <h2>Passwort-Anfrage</h2>
+        <p>Du hast eine Anfrage zum Zurücksetzen deines Passworts gestellt.</p>
+
+        <p style="text-align: center;">
+            <a href="{reset_url}" class="button">Neues Passwort setzen</a>
+        </p>
+
+        <p>Oder kopiere diesen Link in deinen Browser:</p>
+        <p style="background: #fff; padding: 10px; border-radius: 5px; word-break: break-all;">
+            {reset_url}
+        </p>
+
+        <div class="warning">
+            <strong>⚠️ Wichtig:</strong>
+            <ul>
+                <li>Dieser Link ist 1 Stunde gültig</li>
+                <li>Der Link kann nur einmal verwendet werden</li>
+                <li>Falls du keine Anfrage gestellt hast, ignoriere diese Email</li>
+            </ul>
+        </div>
+    </div>
+    <div class="footer">
+        <p>© 2026 Social Media Manager. Alle Rechte vorbehalten.</p>
+    </div>
+</body>
+</html>
+"""
+
+
+WELCOME_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+            border-radius: 10px 10px 0 0;
+        }}
+        .content {{
+            background: #f9f9f9;
+            padding: 30px;
+            border-radius: 0 0 10px 10px;
+        }}
+        .button {{
+            display: inline-block;
+            padding: 12px 30px;
+            background: #667eea;
+            color: white !important;
+            text-decoration: none;
+            border-radius: 5px;
+            margin: 20px 0;
+            font-weight: bold;
+        }}
+        .feature {{
+            background: white;
+            padding: 15px;
+            margin: 10px 0;
+            border-radius: 5px;
+            border-left: 4px solid #667eea;
+        }}
+        .footer {{
+            text-align: center;
+            margin-top: 30px;
+            color: #666;
+            font-size: 12px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🎉 Willkommen, {username}!</h1>
+    </div>
+    <div class="content">
+        <h2>Dein Account ist jetzt aktiviert!</h2>
+        <p>Schön, dass du dabei bist. Du kannst jetzt loslegen:</p>
+
+        <div class="feature">
+            <strong>📹 Videos hochladen</strong><br>
+            Lade deine Videos auf mehrere Plattformen gleichzeitig hoch
+        </div>
+
+        <div class="feature">
+            <strong>🔗 Plattformen verbinden</strong><br>
+            Verbinde YouTube, TikTok und Instagram
+        </div>
+
+        <div class="feature">
+            <strong>📊 Analytics tracken</strong><br>
+            Behalte den Überblick über deine Uploads
+        </div>
+
+        <p style="text-align: center;">
+            <a href="{dashboard_url}" class="button">Zum Dashboard</a>
+        </p>
+    </div>
+    <div class="footer">
+        <p>© 2026 Social Media Manager. Alle Rechte vorbehalten.</p>
+    </div>
+</body>
+</html>
+"""
+
+
+EMAIL_TEMPLATES: Dict[str, EmailTemplate] = {
+    "verification": EmailTemplate("verification", "Bestätige deine Email-Adresse", VERIFICATION_HTML),
+    "password_reset": EmailTemplate("password_reset", "Passwort zurücksetzen", PASSWORD_RESET_HTML),
+    "welcome": EmailTemplate("welcome", "Willkommen! Dein Account ist aktiviert", WELCOME_HTML),
+}
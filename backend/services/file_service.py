@@ -2,21 +2,33 @@
 File Service für sicheres File-Handling
 """
 import os
-import shutil
+import time
 import logging
 from pathlib import Path
-from typing import Optional
-from fastapi import UploadFile
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, Request, UploadFile
+from starlette.requests import ClientDisconnect
 import uuid
 
+from config import settings
+from services.temp_storage_service import temp_storage
+from services.metrics_service import INGEST_BYTES, SAVE_TEMP_FILE_SECONDS
+from services.upload_stream_service import DirectUploadParser, StreamedFile
+
 logger = logging.getLogger(__name__)
 
+# Lesegröße beim Streamen auf Disk
+CHUNK_SIZE = 1024 * 1024
+# Spielraum für multipart-Overhead + Textfelder bei der Content-Length-Prüfung
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
 
 class FileService:
     """Verwaltet temporäre Dateien sicher"""
     
-    def __init__(self, temp_dir: str = "temp"):
-        self.temp_dir = Path(temp_dir)
+    def __init__(self, temp_dir: Optional[str] = None):
+        # Standard: TEMP_DIR – von dort liefert der Media-Router die Dateien aus
+        self.temp_dir = Path(temp_dir or settings.TEMP_DIR)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
     
     async def save_temp_file(
@@ -33,7 +45,15 @@ class FileService:
         
         Returns:
             str: Pfad zur gespeicherten Datei
+        
+        Raises:
+            HTTPException(503) wenn Temp-Quota oder Freiplatz erschöpft sind
         """
+        # Backpressure, bevor irgendetwas auf Disk landet
+        temp_storage.check_capacity(upload_file.size or 0)
+        
+        filepath = None
+        start = time.perf_counter()
         try:
             # Eindeutigen Dateinamen generieren
             if custom_name:
@@ -45,18 +65,77 @@ class FileService:
             
             filepath = self.temp_dir / filename
             
-            # Datei speichern
+            # Datei in Chunks auf Disk streamen (nicht komplett in den RAM laden)
+            size = 0
             with open(filepath, "wb") as f:
-                content = await upload_file.read()
-                f.write(content)
+                while chunk := await upload_file.read(CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
             
-            logger.info(f"📁 Datei gespeichert: {filepath} ({len(content)} bytes)")
+            temp_storage.track(size)
+            INGEST_BYTES.inc(size)
+            SAVE_TEMP_FILE_SECONDS.observe(time.perf_counter() - start)
+            logger.info(f"📁 Datei gespeichert: {filepath} ({size} bytes)")
             return str(filepath)
             
         except Exception as e:
             logger.error(f"❌ Fehler beim Speichern der Datei: {e}")
+            # Halb geschriebene Datei nicht liegen lassen
+            if filepath is not None:
+                self.delete_file(str(filepath))
             raise
     
+    async def receive_upload_stream(
+        self,
+        request: Request,
+        file_field: str,
+        accept: Optional[Callable[[str, str], bool]] = None
+    ) -> Tuple[Dict[str, str], StreamedFile]:
+        """
+        Parst einen multipart-Request selbst und schreibt die Datei direkt nach TEMP_DIR
+
+        Anders als save_temp_file gibt es keine Zwischenkopie (UploadFile-Spool):
+        jedes Byte wird genau einmal geschrieben, sha256 entsteht nebenbei.
+
+        Args:
+            request: Request mit noch ungelesenem Body
+            file_field: Formularfeld der Datei
+            accept: (content_type, filename) -> bool, Prüfung vor dem ersten Byte
+
+        Returns:
+            (Textfelder, StreamedFile)
+
+        Raises:
+            HTTPException(400/413/503)
+        """
+        max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        try:
+            content_length = int(request.headers.get("content-length") or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > max_bytes + MULTIPART_OVERHEAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Datei zu groß (maximal {settings.MAX_FILE_SIZE_MB} MB)"
+            )
+
+        # Backpressure, bevor irgendetwas gelesen wird
+        temp_storage.check_capacity(content_length)
+
+        start = time.perf_counter()
+        parser = DirectUploadParser(request, file_field, self.temp_dir, max_bytes, accept)
+        try:
+            fields, upload = await parser.parse()
+        except ClientDisconnect:
+            logger.warning("⚠️ Upload vom Client abgebrochen – Teildatei entfernt")
+            raise HTTPException(status_code=400, detail="Upload abgebrochen")
+
+        temp_storage.track(upload.size)
+        INGEST_BYTES.inc(upload.size)
+        SAVE_TEMP_FILE_SECONDS.observe(time.perf_counter() - start)
+        logger.info(f"📁 Datei gestreamt: {upload.path} ({upload.size} bytes)")
+        return fields, upload
+
     def delete_file(self, filepath: str) -> bool:
         """
         Löscht eine Datei sicher
@@ -78,16 +157,6 @@ class FileService:
             logger.warning(f"⚠️ Fehler beim Löschen: {filepath} - {e}")
             return False
     
-    def cleanup_all_temp_files(self):
-        """Löscht alle temporären Dateien"""
-        try:
-            if self.temp_dir.exists():
-                shutil.rmtree(self.temp_dir)
-                self.temp_dir.mkdir(parents=True, exist_ok=True)
-                logger.info("🧹 Alle temporären Dateien gelöscht")
-        except Exception as e:
-            logger.error(f"❌ Cleanup fehlgeschlagen: {e}")
-    
     def get_file_size(self, filepath: str) -> int:
         """Gibt die Dateigröße in Bytes zurück"""
         return Path(filepath).stat().st_size if Path(filepath).exists() else 0
\ No newline at end of file
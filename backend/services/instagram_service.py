@@ -1,20 +1,34 @@
 """
 Instagram Upload Service (Reels via Facebook Graph API)
 """
-import requests
 import logging
 from pathlib import Path
 import time
+from typing import Optional
+
+from config import settings
+from utils.lazy_imports import lazy_module
+from services.metrics_service import INSTAGRAM_CONTAINER_WAIT_SECONDS, timed
 
 logger = logging.getLogger(__name__)
 
+requests = lazy_module("requests")
+
+GRAPH_API_BASE = f"{settings.INSTAGRAM_GRAPH_BASE.rstrip('/')}/v21.0"
+
+# Kurze Clips sind nach wenigen Sekunden verarbeitet → engmaschiger abfragen
+SHORT_CLIP_SECONDS = 60
+SHORT_CLIP_POLL_SECONDS = 2
+DEFAULT_POLL_SECONDS = 5
+
 
 def instagram_upload_video(
     ig_user_id: str,
     access_token: str,
     video_path: str,
     caption: str = "",
-    share_to_feed: bool = True
+    share_to_feed: bool = True,
+    duration_seconds: Optional[float] = None
 ) -> dict:
     try:
         if not Path(video_path).exists():
@@ -26,12 +40,12 @@ def instagram_upload_video(
 
         logger.info("📤 Instagram Reel-Upload startet...")
 
-        # Öffentliche URL aus Dateiname bauen
-        from config import settings
+        # Kurzlebige, signierte URL aus Dateiname bauen
+        from services.media_service import sign_media_url
         filename = Path(video_path).name
-        video_url = f"{settings.BACKEND_URL}/api/videos/temp/{filename}"
+        video_url = sign_media_url(filename)
 
-        logger.info(f"🔗 Video URL: {video_url}")
+        logger.info(f"🔗 Video URL: {video_url.split('?')[0]} (signiert)")
 
         # Schritt 1: Container erstellen
         container_id = _create_reel_container(
@@ -45,7 +59,11 @@ def instagram_upload_video(
         logger.info(f"✅ Container erstellt (ID: {container_id})")
 
         # Schritt 2: Warten bis verarbeitet
-        _wait_for_container_ready(ig_user_id, access_token, container_id)
+        short_clip = duration_seconds is not None and duration_seconds <= SHORT_CLIP_SECONDS
+        _wait_for_container_ready(
+            ig_user_id, access_token, container_id,
+            poll_interval=SHORT_CLIP_POLL_SECONDS if short_clip else DEFAULT_POLL_SECONDS
+        )
 
         # Schritt 3: Veröffentlichen
         media_id = _publish_reel_container(
@@ -79,7 +97,7 @@ def _create_reel_container(
     caption: str,
     share_to_feed: bool
 ) -> str:
-    url = f"https://graph.instagram.com/v21.0/{ig_user_id}/media"
+    url = f"{GRAPH_API_BASE}/{ig_user_id}/media"
 
     data = {
         "media_type": "REELS",
@@ -106,9 +124,10 @@ def _wait_for_container_ready(
     ig_user_id: str,
     access_token: str,
     container_id: str,
-    max_wait_time: int = 300
+    max_wait_time: int = 300,
+    poll_interval: float = DEFAULT_POLL_SECONDS
 ) -> bool:
-    url = f"https://graph.instagram.com/v21.0/{container_id}"
+    url = f"{GRAPH_API_BASE}/{container_id}"
     params = {
         "fields": "status_code",
         "access_token": access_token
@@ -117,30 +136,31 @@ def _wait_for_container_ready(
     start_time = time.time()
     logger.info("⏳ Warte auf Container-Verarbeitung...")
 
-    while True:
-        if time.time() - start_time > max_wait_time:
-            raise TimeoutError("Container-Verarbeitung dauert zu lange")
+    with timed(INSTAGRAM_CONTAINER_WAIT_SECONDS):
+        while True:
+            if time.time() - start_time > max_wait_time:
+                raise TimeoutError("Container-Verarbeitung dauert zu lange")
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            result = response.json()
+            try:
+                response = requests.get(url, params=params, timeout=10)
+                response.raise_for_status()
+                result = response.json()
 
-            status = result.get("status_code")
-            logger.info(f"Container Status: {status}")
+                status = result.get("status_code")
+                logger.info(f"Container Status: {status}")
 
-            if status == "FINISHED":
-                logger.info("✅ Container ist bereit")
-                return True
-            elif status == "ERROR":
-                error_msg = result.get("error", {})
-                raise Exception(f"Container-Verarbeitung fehlgeschlagen: {error_msg}")
+                if status == "FINISHED":
+                    logger.info("✅ Container ist bereit")
+                    return True
+                elif status == "ERROR":
+                    error_msg = result.get("error", {})
+                    raise Exception(f"Container-Verarbeitung fehlgeschlagen: {error_msg}")
 
-            time.sleep(5)
+                time.sleep(poll_interval)
 
-        except requests.RequestException as e:
-            logger.warning(f"⚠️ Status-Abfrage fehlgeschlagen: {e}")
-            time.sleep(5)
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ Status-Abfrage fehlgeschlagen: {e}")
+                time.sleep(poll_interval)
 
 
 def _publish_reel_container(
@@ -148,7 +168,7 @@ def _publish_reel_container(
     access_token: str,
     creation_id: str
 ) -> str:
-    url = f"https://graph.instagram.com/v21.0/{ig_user_id}/media_publish"
+    url = f"{GRAPH_API_BASE}/{ig_user_id}/media_publish"
 
     data = {
         "creation_id": creation_id,
@@ -167,7 +187,7 @@ def _publish_reel_container(
 
 
 def get_media_insights(media_id: str, access_token: str) -> dict:
-    url = f"https://graph.instagram.com/v21.0/{media_id}/insights"
+    url = f"{GRAPH_API_BASE}/{media_id}/insights"
 
     params = {
         "metric": "plays,likes,comments,shares,saved",
@@ -0,0 +1,338 @@
+"""
+Media Probe Service
+Technische Metadaten (Dauer, Auflösung, Codecs, Bitrate, Rotation) direkt beim Ingest
+
+- MP4/MOV/M4V: eigener Box-Parser (liest nur Header + moov, keine Abhängigkeit)
+- Andere Container (oder nicht parsebare MP4s): ffprobe, falls installiert
+- Läuft im Thread-Pool, nie auf dem Event Loop
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import shutil
+import struct
+import subprocess
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+ISO_BMFF_EXTENSIONS = {".mp4", ".mov", ".m4v"}
+MAX_MOOV_BYTES = 64 * 1024 * 1024
+FFPROBE_TIMEOUT_SECONDS = 30
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Container-Boxen, in die der Parser absteigt
+_CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"edts"}
+
+# Boxen, mit denen eine MP4/MOV-Datei beginnen darf (ältere QuickTime-Dateien ohne ftyp)
+_LEADING_BOXES = {b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip", b"pnot", b"uuid"}
+
+# Sample-Entry Fourcc → Codec-Name (wie ffprobe codec_name)
+_CODEC_NAMES = {
+    b"avc1": "h264", b"avc3": "h264",
+    b"hvc1": "hevc", b"hev1": "hevc",
+    b"av01": "av1", b"vp09": "vp9", b"vp08": "vp8",
+    b"mp4v": "mpeg4",
+    b"apcn": "prores", b"apch": "prores", b"apcs": "prores", b"apco": "prores", b"ap4h": "prores",
+    b"mp4a": "aac", b"Opus": "opus", b"ac-3": "ac3", b"ec-3": "eac3", b".mp3": "mp3",
+    b"alac": "alac", b"sowt": "pcm_s16le", b"twos": "pcm_s16be", b"lpcm": "pcm",
+}
+
+
+# Spalten in `videos`, die aus MediaInfo befüllt werden
+MEDIA_COLUMNS = (
+    "duration_seconds", "width", "height", "rotation",
+    "video_codec", "audio_codec", "bitrate", "frame_rate",
+)
+
+
+class MediaProbeError(Exception):
+    """Datei gibt sich als Video aus, ist aber nicht lesbar"""
+
+
+class MediaInfo(NamedTuple):
+    duration_seconds: Optional[float]
+    width: Optional[int]
+    height: Optional[int]
+    rotation: int
+    video_codec: Optional[str]
+    audio_codec: Optional[str]
+    bitrate: Optional[int]          # bit/s über die gesamte Datei
+    frame_rate: Optional[float]
+    container: Optional[str]
+
+    @property
+    def display_size(self):
+        """(Breite, Höhe) wie abgespielt – 90°/270° Rotation vertauscht die Achsen"""
+        if self.width is None or self.height is None:
+            return None
+        if self.rotation in (90, 270):
+            return self.height, self.width
+        return self.width, self.height
+
+    @property
+    def aspect_ratio(self) -> Optional[float]:
+        size = self.display_size
+        if not size or not size[1]:
+            return None
+        return size[0] / size[1]
+
+    def as_columns(self) -> Dict:
+        """Werte für die Media-Spalten in `videos`"""
+        return {name: getattr(self, name) for name in MEDIA_COLUMNS}
+
+
+def media_summary(video) -> Optional[Dict]:
+    """Media-Spalten eines VideoModel als Dict für API-Responses"""
+    if video.duration_seconds is None and video.width is None:
+        return None
+    return {name: getattr(video, name) for name in MEDIA_COLUMNS}
+
+
+# ==========================================
+# ISO-BMFF (MP4/MOV) Box-Parser
+# ==========================================
+
+def _iter_boxes(data: bytes, offset: int = 0, end: Optional[int] = None):
+    end = len(data) if end is None else end
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                raise MediaProbeError("Abgeschnittene Box")
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise MediaProbeError(f"Ungültige Box-Größe für {box_type!r}")
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def _read_moov(path: Path) -> tuple:
+    """Springt über mdat & Co. und liest nur die moov-Box (+ ftyp Brand)"""
+    file_size = path.stat().st_size
+    brand = None
+    with open(path, "rb") as f:
+        offset = 0
+        while offset + 8 <= file_size:
+            f.seek(offset)
+            header = f.read(16)
+            if len(header) < 8:
+                break
+            size, box_type = struct.unpack_from(">I4s", header)
+            header_size = 8
+            if size == 1:
+                if len(header) < 16:
+                    raise MediaProbeError("Abgeschnittener Box-Header")
+                size = struct.unpack_from(">Q", header, 8)[0]
+                header_size = 16
+            elif size == 0:
+                size = file_size - offset
+            if size < header_size:
+                raise MediaProbeError(f"Ungültige Box-Größe für {box_type!r}")
+
+            if box_type == b"ftyp":
+                brand = header[8:12].decode("ascii", "replace").strip() if len(header) >= 12 else None
+            elif box_type == b"moov":
+                if size > MAX_MOOV_BYTES:
+                    raise MediaProbeError("moov-Box zu groß")
+                f.seek(offset)
+                data = f.read(size)
+                if len(data) < size:
+                    raise MediaProbeError("moov-Box abgeschnitten")
+                return data[header_size:], brand, file_size
+            elif offset == 0 and box_type not in _LEADING_BOXES:
+                raise MediaProbeError("Keine ISO-BMFF Datei")
+            offset += size
+    raise MediaProbeError("Keine moov-Box gefunden")
+
+
+def _parse_duration(data: bytes, start: int) -> Optional[float]:
+    """mvhd/mdhd: gleiche Struktur, Version 1 mit 64-Bit Zeitstempeln"""
+    if data[start] == 1:
+        timescale, duration = struct.unpack_from(">IQ", data, start + 20)
+    else:
+        timescale, duration = struct.unpack_from(">II", data, start + 12)
+    return duration / timescale if timescale else None
+
+
+def _parse_tkhd(data: bytes, start: int) -> tuple:
+    body = start + (36 if data[start] == 1 else 24)
+    # reserved(8) layer(2) alternate_group(2) volume(2) reserved(2) → Matrix
+    matrix_offset = body + 16
+    a, b = struct.unpack_from(">ii", data, matrix_offset)
+    width, height = struct.unpack_from(">II", data, matrix_offset + 36)
+    rotation = int(round(math.degrees(math.atan2(b / 65536, a / 65536)))) % 360
+    return width >> 16, height >> 16, rotation
+
+
+def _parse_track(data: bytes, start: int, end: int) -> Dict:
+    track = {}
+    stack = [(start, end)]
+    while stack:
+        box_start, box_end = stack.pop()
+        for box_type, body, box_stop in _iter_boxes(data, box_start, box_end):
+            if box_type in _CONTAINER_BOXES:
+                stack.append((body, box_stop))
+            elif box_type == b"tkhd":
+                track["width"], track["height"], track["rotation"] = _parse_tkhd(data, body)
+            elif box_type == b"mdhd":
+                track["duration"] = _parse_duration(data, body)
+            elif box_type == b"hdlr":
+                track["handler"] = data[body + 8:body + 12]
+            elif box_type == b"stsd":
+                # version/flags(4) entry_count(4) → erster Sample-Entry: size(4) format(4)
+                track["fourcc"] = data[body + 12:body + 16]
+            elif box_type == b"stts":
+                entries = struct.unpack_from(">I", data, body + 4)[0]
+                track["samples"] = sum(
+                    struct.unpack_from(">I", data, body + 8 + i * 8)[0] for i in range(entries)
+                )
+    return track
+
+
+def probe_iso_bmff(path: Path) -> MediaInfo:
+    """Liest Metadaten aus einer MP4/MOV-Datei ohne externe Tools"""
+    try:
+        moov, brand, file_size = _read_moov(path)
+        duration = None
+        video = audio = None
+        for box_type, body, box_end in _iter_boxes(moov):
+            if box_type == b"mvhd":
+                duration = _parse_duration(moov, body)
+            elif box_type == b"trak":
+                track = _parse_track(moov, body, box_end)
+                if track.get("handler") == b"vide" and video is None:
+                    video = track
+                elif track.get("handler") == b"soun" and audio is None:
+                    audio = track
+    except (struct.error, IndexError) as e:
+        # IndexError: abgeschnittene Box (z.B. leerer mvhd/tkhd) beim Lesen des Versions-Bytes
+        raise MediaProbeError(f"Beschädigte Box-Struktur: {e}")
+
+    if video is None:
+        raise MediaProbeError("Keine Videospur gefunden")
+
+    duration = duration or video.get("duration")
+    frame_rate = None
+    if video.get("samples") and video.get("duration"):
+        frame_rate = round(video["samples"] / video["duration"], 3)
+    fourcc = video.get("fourcc", b"")
+
+    return MediaInfo(
+        duration_seconds=round(duration, 3) if duration else None,
+        width=video.get("width") or None,
+        height=video.get("height") or None,
+        rotation=video.get("rotation", 0),
+        video_codec=_CODEC_NAMES.get(fourcc, fourcc.decode("ascii", "replace").strip() or None),
+        audio_codec=_CODEC_NAMES.get(audio["fourcc"], audio["fourcc"].decode("ascii", "replace").strip()) if audio and audio.get("fourcc") else None,
+        bitrate=int(file_size * 8 / duration) if duration else None,
+        frame_rate=frame_rate,
+        container="mov" if brand == "qt" else "mp4",
+    )
+
+
+# ==========================================
+# ffprobe (optional)
+# ==========================================
+
+def _parse_fraction(value: Optional[str]) -> Optional[float]:
+    if not value or value in ("0/0", "N/A"):
+        return None
+    numerator, _, denominator = value.partition("/")
+    try:
+        return round(float(numerator) / float(denominator or 1), 3)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def probe_ffprobe(path: Path) -> MediaInfo:
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        raise MediaProbeError("ffprobe nicht installiert")
+    try:
+        completed = subprocess.run(
+            [ffprobe, "-v", "error", "-print_format", "json", "-show_format", "-show_streams", str(path)],
+            capture_output=True, timeout=FFPROBE_TIMEOUT_SECONDS, check=True
+        )
+        result = json.loads(completed.stdout)
+    except (subprocess.SubprocessError, json.JSONDecodeError) as e:
+        raise MediaProbeError(f"ffprobe fehlgeschlagen: {e}")
+
+    streams = result.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video" and not s.get("disposition", {}).get("attached_pic")), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    if video is None:
+        raise MediaProbeError("Keine Videospur gefunden")
+
+    fmt = result.get("format", {})
+    rotation = 0
+    for side_data in video.get("side_data_list", []):
+        if "rotation" in side_data:
+            rotation = int(-float(side_data["rotation"])) % 360
+    if "rotate" in video.get("tags", {}):
+        rotation = int(video["tags"]["rotate"]) % 360
+
+    duration = float(fmt["duration"]) if fmt.get("duration") not in (None, "N/A") else None
+    bitrate = int(fmt["bit_rate"]) if str(fmt.get("bit_rate", "")).isdigit() else None
+
+    return MediaInfo(
+        duration_seconds=round(duration, 3) if duration else None,
+        width=video.get("width"),
+        height=video.get("height"),
+        rotation=rotation,
+        video_codec=video.get("codec_name"),
+        audio_codec=audio.get("codec_name") if audio else None,
+        bitrate=bitrate,
+        frame_rate=_parse_fraction(video.get("avg_frame_rate")) or _parse_fraction(video.get("r_frame_rate")),
+        container=(fmt.get("format_name") or "").split(",")[0] or None,
+    )
+
+
+# ==========================================
+# Public API
+# ==========================================
+
+def probe_media(file_path: str) -> Optional[MediaInfo]:
+    """
+    Ermittelt technische Metadaten einer Videodatei (blockierend)
+
+    Returns:
+        MediaInfo, oder None wenn der Container ohne ffprobe nicht lesbar ist
+    Raises:
+        MediaProbeError wenn die Datei kein gültiges Video ist
+    """
+    path = Path(file_path)
+    if path.suffix.lower() in ISO_BMFF_EXTENSIONS:
+        try:
+            return probe_iso_bmff(path)
+        except MediaProbeError as e:
+            if not shutil.which("ffprobe"):
+                raise
+            logger.info(f"ℹ️ Box-Parser gescheitert ({e}), versuche ffprobe: {path.name}")
+        return probe_ffprobe(path)
+
+    if shutil.which("ffprobe"):
+        return probe_ffprobe(path)
+    logger.info(f"ℹ️ Kein Probe für {path.suffix} ohne ffprobe: {path.name}")
+    return None
+
+
+def content_hash(file_path: str) -> str:
+    """sha256 des Dateiinhalts – Cache-Key für Varianten und Thumbnails (blockierend)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def probe_media_async(file_path: str) -> Optional[MediaInfo]:
+    """probe_media im Thread-Pool (Event Loop bleibt frei)"""
+    return await asyncio.to_thread(probe_media, file_path)
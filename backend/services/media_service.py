@@ -0,0 +1,222 @@
+"""
+Media Service für das Ausliefern von Temp-Videos (Instagram Ingestion)
+
+- Kurzlebige, HMAC-signierte URLs
+- Range / If-Range / ETag / Content-Length
+- Zero-Copy via ASGI "http.response.zerocopysend" (falls der Server es anbietet)
+  oder Übergabe an nginx per X-Accel-Redirect
+"""
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import stat
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+
+
+# ==========================================
+# Signierte URLs
+# ==========================================
+
+def _signing_key() -> bytes:
+    return (settings.MEDIA_SIGNING_KEY or settings.JWT_SECRET or "").encode("utf-8")
+
+
+def _signature(filename: str, expires: int) -> str:
+    digest = hmac.new(_signing_key(), f"{filename}:{expires}".encode("utf-8"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+
+def sign_media_url(filename: str, ttl_seconds: Optional[int] = None) -> str:
+    """Baut eine öffentliche, zeitlich begrenzte URL für eine Temp-Datei"""
+    expires = int(time.time()) + (ttl_seconds or settings.MEDIA_URL_TTL_SECONDS)
+    return (
+        f"{settings.BACKEND_URL}/api/videos/temp/{quote(filename)}"
+        f"?expires={expires}&sig={_signature(filename, expires)}"
+    )
+
+
+def verify_media_signature(filename: str, expires: int, sig: str) -> bool:
+    if expires < int(time.time()):
+        return False
+    return hmac.compare_digest(_signature(filename, expires), sig)
+
+
+def resolve_temp_file(filename: str) -> Optional[Path]:
+    """Nur einfache Dateinamen direkt in TEMP_DIR oder im Variant-Cache zulassen"""
+    if not filename or filename != Path(filename).name or filename.startswith("."):
+        return None
+    for directory in (settings.TEMP_DIR, settings.TRANSCODE_CACHE_DIR):
+        path = Path(directory) / filename
+        if path.is_file():
+            return path
+    return None
+
+
+# ==========================================
+# Range-fähige Response
+# ==========================================
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parst einen einzelnen Byte-Range ("bytes=a-b", "bytes=a-", "bytes=-n")
+
+    Returns:
+        (start, end) inklusiv, oder None wenn nicht erfüllbar.
+    Raises:
+        ValueError bei syntaktisch ungültigen oder Multi-Ranges (→ Range ignorieren)
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError("unsupported range")
+
+    start_str, _, end_str = spec.strip().partition("-")
+    if start_str == "":
+        suffix = int(end_str)
+        if suffix <= 0:
+            return None
+        return max(size - suffix, 0), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else None
+    if end is not None and start > end:
+        raise ValueError("invalid range")
+    if start >= size:
+        return None
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+class RangeFileResponse(Response):
+    """FileResponse mit Range/If-Range/ETag und optionalem Zero-Copy"""
+
+    def __init__(self, path: Path, request_headers, media_type: str = "video/mp4"):
+        super().__init__(status_code=200, media_type=media_type)
+        self.path = path
+        self.request_headers = request_headers
+        self.offset = 0
+        self.length = 0
+
+    def _prepare(self, stat_result: os.stat_result):
+        size = stat_result.st_size
+        etag = f'"{stat_result.st_mtime_ns:x}-{size:x}"'
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["etag"] = etag
+        self.headers["last-modified"] = last_modified
+        self.headers["cache-control"] = "private, max-age=300"
+
+        if_none_match = self.request_headers.get("if-none-match")
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            self.status_code = 304
+            # Response.__init__ setzt content-length: 0 – bei 304 irreführend (RFC 9110 §15.4.5)
+            del self.headers["content-length"]
+            return
+
+        self.offset, self.length = 0, size
+        range_header = self.request_headers.get("range")
+        if range_header and self._if_range_matches(etag, stat_result.st_mtime):
+            try:
+                byte_range = _parse_range(range_header, size)
+            except ValueError:
+                # Ungültige oder Multi-Ranges ignorieren → komplette Datei (RFC 9110)
+                range_header = None
+
+            if range_header:
+                if byte_range is None:
+                    self.status_code = 416
+                    self.headers["content-range"] = f"bytes */{size}"
+                    self.length = 0
+                    self.headers["content-length"] = "0"
+                    return
+                start, end = byte_range
+                self.status_code = 206
+                self.offset, self.length = start, end - start + 1
+                self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        self.headers["content-length"] = str(self.length)
+
+    def _if_range_matches(self, etag: str, mtime: float) -> bool:
+        if_range = self.request_headers.get("if-range")
+        if not if_range:
+            return True
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return if_range == etag
+        try:
+            return int(parsedate_to_datetime(if_range).timestamp()) == int(mtime)
+        except (TypeError, ValueError):
+            return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise RuntimeError(f"File at path {self.path} is not a file.")
+        self._prepare(stat_result)
+
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+
+        if scope["method"].upper() == "HEAD" or self.status_code in (304, 416) or not self.length:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file.fileno(),
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+
+        fd = await anyio.to_thread.run_sync(os.open, self.path, os.O_RDONLY)
+        try:
+            position, remaining = self.offset, self.length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(os.pread, fd, min(CHUNK_SIZE, remaining), position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            os.close(fd)
+
+
+def accel_redirect_response(filename: str, media_type: str = "video/mp4") -> Response:
+    """Übergibt die Auslieferung an nginx (internal location, relativ zu TEMP_DIR)"""
+    return Response(
+        status_code=200,
+        media_type=media_type,
+        headers={
+            "X-Accel-Redirect": f"{settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{quote(filename)}",
+            "X-Accel-Buffering": "no",
+            "Cache-Control": "private, max-age=300",
+        },
+    )
@@ -0,0 +1,135 @@
+"""
+Metrics Service
+Prometheus Metriken für die Upload-Pipeline
+
+Läuft Uvicorn mit mehreren Workern, muss PROMETHEUS_MULTIPROC_DIR (leeres,
+beschreibbares Verzeichnis) vor dem Start gesetzt sein – dann schreibt jeder
+Worker seine Werte dorthin und /metrics aggregiert über alle Prozesse.
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+# Buckets: Sekunden bis Minuten (Plattform-Uploads, Container-Verarbeitung)
+SLOW_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+# Buckets: Millisekunden-Bereich (Pool-Checkout, Event-Loop-Lag)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+EVENT_LOOP_PROBE_SECONDS = 0.5
+
+
+# ==========================================
+# Metriken
+# ==========================================
+
+INGEST_BYTES = Counter(
+    "smm_ingest_bytes_total",
+    "Bytes der hochgeladenen Dateien, die auf Disk geschrieben wurden"
+)
+SAVE_TEMP_FILE_SECONDS = Histogram(
+    "smm_save_temp_file_seconds",
+    "Dauer von FileService.save_temp_file",
+    buckets=SLOW_BUCKETS
+)
+PLATFORM_UPLOAD_SECONDS = Histogram(
+    "smm_platform_upload_seconds",
+    "Dauer eines Plattform-Uploads",
+    ["platform", "outcome"],
+    buckets=SLOW_BUCKETS
+)
+PREFLIGHT_REJECTED = Counter(
+    "smm_preflight_rejected_total",
+    "Plattform-Uploads, die der Preflight vor dem Upload verworfen hat",
+    ["platform"]
+)
+ADMISSION_REJECTED = Counter(
+    "smm_admission_rejected_total",
+    "Upload-Requests, die vor dem Lesen des Bodys mit 503 abgewiesen wurden",
+    ["reason"]
+)
+TOKEN_REFRESH_SECONDS = Histogram(
+    "smm_token_refresh_seconds",
+    "Latenz von OAuth Token-Refreshes",
+    ["platform", "outcome"]
+)
+INSTAGRAM_CONTAINER_WAIT_SECONDS = Histogram(
+    "smm_instagram_container_wait_seconds",
+    "Wartezeit bis ein Instagram Reel-Container bereit ist",
+    ["outcome"],
+    buckets=SLOW_BUCKETS
+)
+OPENAI_REQUEST_SECONDS = Histogram(
+    "smm_openai_request_seconds",
+    "Latenz der OpenAI API Calls",
+    ["outcome"],
+    buckets=SLOW_BUCKETS
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "smm_db_pool_checkout_seconds",
+    "Wartezeit auf eine Verbindung aus dem SQLAlchemy Pool",
+    buckets=FAST_BUCKETS
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "smm_event_loop_lag_seconds",
+    "Verspätung des Event Loops gegenüber einem periodischen Timer",
+    buckets=FAST_BUCKETS
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels):
+    """Misst die Dauer des Blocks; Label `outcome` = success/error"""
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        histogram.labels(outcome=outcome, **labels).observe(time.perf_counter() - start)
+
+
+# ==========================================
+# Event-Loop Lag
+# ==========================================
+
+async def monitor_event_loop_lag():
+    """Hintergrund-Task: wie viel später als geplant wacht der Loop auf?"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(EVENT_LOOP_PROBE_SECONDS)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - start - EVENT_LOOP_PROBE_SECONDS))
+
+
+# ==========================================
+# Export
+# ==========================================
+
+def is_multiprocess() -> bool:
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Prometheus Text-Format; im Multiprocess-Modus über alle Worker aggregiert"""
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
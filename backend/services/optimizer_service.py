@@ -2,7 +2,9 @@
 
 import os
 import json
+import asyncio
 import logging
+import threading
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 from collections import Counter
@@ -15,16 +17,36 @@ from data.optimizer_config import (
     PLATFORM_CONSTRAINTS,
     HASHTAG_SEEDS,
 )
+from services.trend_service import get_trends, DEFAULT_WINDOW
+from services.metrics_service import OPENAI_REQUEST_SECONDS, timed
+from utils.lazy_imports import lazy_module
 
 logger = logging.getLogger(__name__)
 
-# Optional OpenAI import – graceful fallback if not installed/configured
-try:
-    from openai import AsyncOpenAI
-    _openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) if os.getenv("OPENAI_API_KEY") else None
-except ImportError:
-    _openai_client = None
-    logger.warning("OpenAI package not installed – using template-based suggestions only.")
+# Optional OpenAI SDK – imported on first use (~0.8 s per worker), graceful fallback if not installed/configured
+openai = lazy_module("openai")
+_openai_client = None
+_openai_client_lock = threading.Lock()
+_openai_unavailable = False
+
+
+def _get_openai_client():
+    """Create the AsyncOpenAI client once per process (None = template-based suggestions only)."""
+    global _openai_client, _openai_unavailable
+    if _openai_client is not None or _openai_unavailable:
+        return _openai_client
+    with _openai_client_lock:
+        if _openai_client is None and not _openai_unavailable:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                _openai_unavailable = True
+            else:
+                try:
+                    _openai_client = openai.AsyncOpenAI(api_key=api_key)
+                except ImportError:
+                    _openai_unavailable = True
+                    logger.warning("OpenAI package not installed – using template-based suggestions only.")
+    return _openai_client
 
 
 # ---------------------------------------------------------------------------
@@ -33,17 +55,22 @@ except ImportError:
 
 async def generate_suggestions(
     db: AsyncSession,
-    user_id: int,
+    user_id: str,
     title_draft: str,
     description_draft: str,
     category: str,
     platforms: list[str],
     video_duration: Optional[int] = None,
+    media: Optional[dict] = None,
 ) -> dict:
     """
     Main optimizer function.
     Returns platform-specific suggestions and the best overall upload time.
+    `media` holds the probed technical metadata of an uploaded video (see media_probe_service).
     """
+    if media and video_duration is None and media.get("duration_seconds") is not None:
+        video_duration = round(media["duration_seconds"])
+
     # 1. Fetch user's historical upload data
     user_history = await _get_user_upload_history(db, user_id)
 
@@ -66,6 +93,7 @@ async def generate_suggestions(
             category=category,
             constraints=constraints,
             video_duration=video_duration,
+            media=media,
         )
 
         # Hashtag suggestions
@@ -106,12 +134,15 @@ async def _optimize_text(
     category: str,
     constraints: dict,
     video_duration: Optional[int],
+    media: Optional[dict] = None,
 ) -> dict:
     """Try GPT-4o first, fall back to template-based optimization."""
-    if _openai_client:
+    # First call imports the SDK – keep that off the event loop
+    client = _openai_client or await asyncio.to_thread(_get_openai_client)
+    if client:
         try:
             return await _optimize_text_with_ai(
-                platform, title_draft, description_draft, category, constraints, video_duration
+                platform, title_draft, description_draft, category, constraints, video_duration, media
             )
         except Exception as e:
             logger.error(f"OpenAI optimization failed, using fallback: {e}")
@@ -126,6 +157,7 @@ async def _optimize_text_with_ai(
     category: str,
     constraints: dict,
     video_duration: Optional[int],
+    media: Optional[dict] = None,
 ) -> dict:
     """Use GPT-4o to generate optimized title and description."""
     title_limit = constraints.get("title_max_chars", 100)
@@ -133,6 +165,7 @@ async def _optimize_text_with_ai(
     desc_note = constraints.get("description_note", "")
 
     duration_info = f"Video duration: {video_duration} seconds." if video_duration else ""
+    format_info = _describe_format(media)
 
     system_prompt = (
         "You are an expert social media content optimizer. "
@@ -145,6 +178,7 @@ Optimize the following video metadata for {platform.upper()}.
 
 Category: {category}
 {duration_info}
+{format_info}
 Platform note: {desc_note}
 Title limit: {title_limit} characters
 Description limit: {desc_limit} characters
@@ -165,16 +199,17 @@ Requirements:
 - Write in the same language as the original content
 """
 
-    response = await _openai_client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=0.7,
-        max_tokens=1000,
-        response_format={"type": "json_object"},
-    )
+    with timed(OPENAI_REQUEST_SECONDS):
+        response = await _get_openai_client().chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.7,
+            max_tokens=1000,
+            response_format={"type": "json_object"},
+        )
 
     result = json.loads(response.choices[0].message.content)
 
@@ -185,6 +220,17 @@ Requirements:
     return {"title": title, "description": description}
 
 
+def _describe_format(media: Optional[dict]) -> str:
+    """One prompt line about orientation/resolution of the probed video."""
+    if not media or not media.get("width") or not media.get("height"):
+        return ""
+    width, height = media["width"], media["height"]
+    if media.get("rotation") in (90, 270):
+        width, height = height, width
+    orientation = "vertical" if height > width else "horizontal" if width > height else "square"
+    return f"Video format: {orientation}, {width}x{height}."
+
+
 def _optimize_text_template(
     platform: str,
     title_draft: str,
@@ -329,7 +375,7 @@ def _pick_best_overall_time(all_times: list[str]) -> str:
 # Database Helpers
 # ---------------------------------------------------------------------------
 
-async def _get_user_upload_history(db: AsyncSession, user_id: int) -> list[dict]:
+async def _get_user_upload_history(db: AsyncSession, user_id: str) -> list[dict]:
     """Load user's upload history from videos table + performance table."""
     try:
         # Check upload_performance table first (populated by this service)
@@ -381,13 +427,21 @@ async def _get_user_upload_history(db: AsyncSession, user_id: int) -> list[dict]
         return []
 
 
-async def get_trending_hashtags(platform: str, category: str) -> list[str]:
-    """Public function for the trending-hashtags endpoint."""
-    return _get_hashtags(platform=platform, category=category)
+async def get_trending_hashtags(
+    platform: str, category: str, window: str = DEFAULT_WINDOW
+) -> list[str]:
+    """
+    Public function for the trending-hashtags endpoint.
+    Data-driven trends first, topped up with the static seeds.
+    """
+    trends = get_trends(platform=platform, category=category, window=window)
+    seeds = _get_hashtags(platform=platform, category=category)
+    merged = list(dict.fromkeys(trends + seeds))
+    return merged[:20]
 
 
 async def get_best_times_for_user(
-    db: AsyncSession, user_id: int, platform: str
+    db: AsyncSession, user_id: str, platform: str
 ) -> list[str]:
     """Public function for the best-times endpoint."""
     user_history = await _get_user_upload_history(db, user_id)
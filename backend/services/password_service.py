@@ -0,0 +1,105 @@
+"""
+Password Service
+bcrypt Hashing/Verifikation in einem eigenen, begrenzten Thread-Pool,
+damit der Event Loop bei Login-Bursts nicht blockiert
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from fastapi import HTTPException
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """bcrypt im dedizierten Executor mit Queue-Limit und Metriken"""
+
+    def __init__(self, max_workers: int, max_pending: int, rounds: int):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="bcrypt"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0      # eingereiht + laufend
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                logger.warning(f"⚠️ Passwort-Queue voll ({self._pending}/{self.max_pending})")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server ausgelastet, bitte gleich erneut versuchen",
+                    headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._run, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    def _run(self, fn, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _hash_sync(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds)).decode('utf-8')
+
+    @staticmethod
+    def _verify_sync(password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+    async def hash(self, password: str) -> str:
+        """Hash password with bcrypt (off the event loop)"""
+        return await self._submit(self._hash_sync, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Verify password against hash (off the event loop)"""
+        return await self._submit(self._verify_sync, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """True wenn der Hash mit einem anderen Work-Factor erstellt wurde"""
+        try:
+            # Format: $2b$<rounds>$<salt+hash>
+            return int(hashed.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "rounds": self.rounds,
+            }
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS
+)
@@ -0,0 +1,194 @@
+"""
+Preflight Service
+Prüft jede Plattform-Strecke gegen PLATFORM_CONSTRAINTS, bevor ein Byte den Server verlässt
+
+- Eingabe: technische Metadaten aus media_probe_service + Dateigröße
+- Jede Regel liefert eine konkrete, umsetzbare Fehlermeldung oder None
+- Unbekannte Werte (nicht geprobt) gelten als bestanden – die Plattform entscheidet
+"""
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data.optimizer_config import PLATFORM_CONSTRAINTS
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_LABELS = {"youtube": "YouTube", "tiktok": "TikTok", "instagram": "Instagram"}
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    if minutes >= 60:
+        return f"{minutes // 60}:{minutes % 60:02d}:{secs:02d} h"
+    return f"{minutes}:{secs:02d} min" if minutes else f"{secs} s"
+
+
+def _display_size(media: Dict):
+    width, height = media.get("width"), media.get("height")
+    if not width or not height:
+        return None
+    if media.get("rotation") in (90, 270):
+        return height, width
+    return width, height
+
+
+# ==========================================
+# Regeln
+# ==========================================
+# Signatur: (media, file_size, constraints, label) -> Fehlermeldung oder None
+
+def _check_file_size(media: Dict, file_size: Optional[int], constraints: Dict, label: str) -> Optional[str]:
+    limit_mb = constraints.get("max_file_size_mb")
+    if not limit_mb or file_size is None:
+        return None
+    if file_size > limit_mb * 1024 * 1024:
+        return (
+            f"Datei zu groß für {label}: {file_size / 1024 / 1024:.0f} MB, erlaubt sind maximal {limit_mb} MB. "
+            f"Bitte mit niedrigerer Bitrate exportieren oder kürzen."
+        )
+    return None
+
+
+def _check_duration(media: Dict, file_size: Optional[int], constraints: Dict, label: str) -> Optional[str]:
+    duration = media.get("duration_seconds")
+    if duration is None:
+        return None
+    minimum = constraints.get("min_duration_seconds")
+    maximum = constraints.get("max_duration_seconds")
+    if minimum and duration < minimum:
+        return f"Video zu kurz für {label}: {duration:.1f} s, mindestens {_format_duration(minimum)} erforderlich."
+    if maximum and duration > maximum:
+        return (
+            f"Video zu lang für {label}: {_format_duration(duration)}, erlaubt sind maximal "
+            f"{_format_duration(maximum)}. Bitte kürzen oder Plattform abwählen."
+        )
+    return None
+
+
+def _check_aspect_ratio(media: Dict, file_size: Optional[int], constraints: Dict, label: str) -> Optional[str]:
+    bounds = constraints.get("aspect_ratio_range")
+    size = _display_size(media)
+    if not bounds or not size:
+        return None
+    ratio = size[0] / size[1]
+    if not bounds[0] <= ratio <= bounds[1]:
+        return (
+            f"Seitenverhältnis {size[0]}x{size[1]} wird von {label} nicht unterstützt "
+            f"(erlaubt: {bounds[0]:g}:1 bis {bounds[1]:g}:1). Empfohlen ist 9:16."
+        )
+    return None
+
+
+def _check_resolution(media: Dict, file_size: Optional[int], constraints: Dict, label: str) -> Optional[str]:
+    size = _display_size(media)
+    if not size:
+        return None
+    min_short_side = constraints.get("min_short_side_px")
+    if min_short_side and min(size) < min_short_side:
+        return (
+            f"Auflösung {size[0]}x{size[1]} zu gering für {label}: "
+            f"die kürzere Seite muss mindestens {min_short_side} px haben."
+        )
+    max_width = constraints.get("max_width_px")
+    if max_width and size[0] > max_width:
+        return (
+            f"Auflösung {size[0]}x{size[1]} zu hoch für {label}: maximal {max_width} px Breite. "
+            f"Bitte auf 1080x1920 (Hochformat) exportieren."
+        )
+    return None
+
+
+def _check_frame_rate(media: Dict, file_size: Optional[int], constraints: Dict, label: str) -> Optional[str]:
+    bounds = constraints.get("frame_rate_range")
+    frame_rate = media.get("frame_rate")
+    if not bounds or not frame_rate:
+        return None
+    if not bounds[0] <= frame_rate <= bounds[1]:
+        return (
+            f"Framerate {frame_rate:g} fps wird von {label} nicht unterstützt "
+            f"(erlaubt: {bounds[0]}–{bounds[1]} fps)."
+        )
+    return None
+
+
+def _check_codec(media: Dict, file_size: Optional[int], constraints: Dict, label: str) -> Optional[str]:
+    allowed = constraints.get("video_codecs")
+    codec = media.get("video_codec")
+    if not allowed or not codec:
+        return None
+    if codec not in allowed:
+        return (
+            f"Video-Codec '{codec}' wird von {label} nicht akzeptiert "
+            f"(erlaubt: {', '.join(allowed)}). Bitte als H.264 MP4 exportieren."
+        )
+    return None
+
+
+PREFLIGHT_RULES: List[Callable[[Dict, Optional[int], Dict, str], Optional[str]]] = [
+    _check_file_size,
+    _check_duration,
+    _check_aspect_ratio,
+    _check_resolution,
+    _check_frame_rate,
+    _check_codec,
+]
+
+# Dauer kann ein Transcode nicht ändern – alles andere schon
+TRANSCODE_FIXABLE_RULES = {
+    _check_file_size, _check_aspect_ratio, _check_resolution, _check_frame_rate, _check_codec,
+}
+
+
+# ==========================================
+# Public API
+# ==========================================
+
+def _violations(platform: str, media: Optional[Dict], file_size: Optional[int]) -> List[Tuple[Callable, str]]:
+    constraints = PLATFORM_CONSTRAINTS.get(platform, {})
+    label = PLATFORM_LABELS.get(platform, platform)
+    media = media or {}
+    violations = []
+    for rule in PREFLIGHT_RULES:
+        message = rule(media, file_size, constraints, label)
+        if message:
+            violations.append((rule, message))
+    return violations
+
+
+def check_platform(platform: str, media: Optional[Dict], file_size: Optional[int]) -> List[str]:
+    """Alle verletzten Regeln einer Plattform-Strecke (leer = Upload darf starten)"""
+    return [message for _, message in _violations(platform, media, file_size)]
+
+
+def fixable_by_transcode(platform: str, media: Optional[Dict], file_size: Optional[int]) -> bool:
+    """True, wenn es Verstöße gibt und alle davon ein Transcode beheben kann"""
+    rules = {rule for rule, _ in _violations(platform, media, file_size)}
+    return bool(rules) and rules <= TRANSCODE_FIXABLE_RULES
+
+
+def preflight(platforms: List[str], media: Optional[Dict], file_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Prüft alle Plattformen eines Videos
+
+    Args:
+        platforms: Ziel-Plattformen
+        media: technische Metadaten (media_summary / MediaInfo.as_columns), None = nicht geprobt
+        file_path: lokale Datei für die Größenprüfung
+
+    Returns:
+        {platform: Fehlermeldung} nur für Plattformen, die nicht hochgeladen werden können
+    """
+    file_size = None
+    if file_path:
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            pass
+
+    blocked = {}
+    for platform in platforms:
+        errors = check_platform(platform, media, file_size)
+        if errors:
+            blocked[platform] = " ".join(errors)
+    return blocked
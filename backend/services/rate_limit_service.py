@@ -0,0 +1,193 @@
+"""
+Rate Limit Service
+Sliding-Window Limits für Auth-Endpoints, pro IP und pro Email
+
+- Schneller In-Process Vorfilter (lokale Zähler sind eine Untergrenze der
+  globalen Zähler → lokale Überschreitung ist immer eine echte Überschreitung)
+- Geteilter Zustand über alle Worker in Postgres (rate_limit_counters)
+- Fällt bei DB-Fehlern auf die lokalen Zähler zurück
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from sqlalchemy import text
+
+from models.database import SessionLocal, RateLimitCounter
+
+logger = logging.getLogger(__name__)
+
+# scope -> dimension -> (max requests, window in seconds)
+RATE_LIMITS: Dict[str, Dict[str, Tuple[int, int]]] = {
+    "login": {"ip": (30, 300), "email": (10, 300)},
+    "register": {"ip": (10, 3600)},
+    "forgot-password": {"ip": (10, 3600), "email": (3, 3600)},
+    "resend-verification": {"ip": (10, 3600), "email": (3, 3600)},
+}
+
+_LOCAL_MAX_KEYS = 10000
+
+
+def _sliding_estimate(current: int, previous: int, elapsed: float, window: int) -> float:
+    """Gewichtet das vorherige Fenster anteilig (Sliding Window Counter)"""
+    return current + previous * max(0.0, 1.0 - elapsed / window)
+
+
+def get_client_ip(request: Request) -> str:
+    """Client-IP; hinter nginx der letzte (vom Proxy gesetzte) X-Forwarded-For Eintrag"""
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """Sliding-Window Limiter mit lokalem Vorfilter und geteiltem Postgres-Zustand"""
+
+    def __init__(self, limits: Dict[str, Dict[str, Tuple[int, int]]]):
+        self.limits = limits
+        self._lock = threading.Lock()
+        # key -> (window_start_epoch, current, previous)
+        self._local: Dict[str, Tuple[int, int, int]] = {}
+
+    # ==========================================
+    # Lokaler Vorfilter
+    # ==========================================
+
+    def _local_hit(self, key: str, window: int, now: float) -> Tuple[float, int, int]:
+        window_start = int(now // window * window)
+        with self._lock:
+            start, current, previous = self._local.get(key, (window_start, 0, 0))
+            if start != window_start:
+                previous = current if start == window_start - window else 0
+                current = 0
+            current += 1
+            self._local[key] = (window_start, current, previous)
+            if len(self._local) > _LOCAL_MAX_KEYS:
+                self._prune_local(now)
+        return _sliding_estimate(current, previous, now - window_start, window), window_start, current
+
+    def _prune_local(self, now: float):
+        cutoff = now - 2 * max(w for dims in self.limits.values() for _, w in dims.values())
+        for key in [k for k, (start, _, _) in self._local.items() if start < cutoff]:
+            del self._local[key]
+
+    # ==========================================
+    # Geteilter Zustand (Postgres)
+    # ==========================================
+
+    @staticmethod
+    def _shared_hits(hits: List[Tuple[str, int, int]], now: float) -> List[float]:
+        """
+        Zählt alle Dimensionen eines Requests in einer Session (blockierend, läuft im Thread)
+
+        Args:
+            hits: (key, window, window_start) je Dimension
+        """
+        db = SessionLocal()
+        try:
+            estimates = []
+            for key, window, window_start in hits:
+                current_start = datetime.fromtimestamp(window_start)
+                # Upsert + vorheriges Fenster in einem Statement → ein Roundtrip pro Dimension
+                current, previous = db.execute(
+                    text("""
+                        WITH hit AS (
+                            INSERT INTO rate_limit_counters (key, window_start, count)
+                            VALUES (:key, :window_start, 1)
+                            ON CONFLICT (key, window_start)
+                            DO UPDATE SET count = rate_limit_counters.count + 1
+                            RETURNING count
+                        )
+                        SELECT hit.count, COALESCE((
+                            SELECT count FROM rate_limit_counters
+                            WHERE key = :key AND window_start = :previous_start
+                        ), 0)
+                        FROM hit
+                    """),
+                    {
+                        "key": key,
+                        "window_start": current_start,
+                        "previous_start": current_start - timedelta(seconds=window),
+                    },
+                ).one()
+                estimates.append(_sliding_estimate(current, previous, now - window_start, window))
+            db.commit()
+            return estimates
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ==========================================
+    # Public API
+    # ==========================================
+
+    async def check(self, scope: str, ip: Optional[str] = None, email: Optional[str] = None):
+        """
+        Zählt den Request und wirft 429, wenn ein Limit überschritten ist
+
+        Der DB-Teil läuft im Threadpool, damit die Auth-Handler den Event-Loop nicht blockieren.
+
+        Raises:
+            HTTPException(429) mit Retry-After Header
+        """
+        identifiers = {"ip": ip, "email": email.strip().lower() if email else None}
+        now = time.time()
+
+        # (dimension, key, limit, window, window_start, lokale Schätzung)
+        pending = []
+        for dimension, (limit, window) in self.limits.get(scope, {}).items():
+            value = identifiers.get(dimension)
+            if not value:
+                continue
+            key = f"{scope}:{dimension}:{value}"
+
+            estimate, window_start, _ = self._local_hit(key, window, now)
+            if estimate > limit:
+                self._reject(scope, dimension, window_start, window, now)
+            pending.append((dimension, key, limit, window, window_start, estimate))
+
+        if not pending:
+            return
+
+        try:
+            estimates = await asyncio.to_thread(
+                self._shared_hits, [(key, window, start) for _, key, _, window, start, _ in pending], now
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Rate-Limit DB nicht erreichbar, nur lokal: {e}")
+            estimates = [estimate for *_, estimate in pending]
+
+        for (dimension, _, limit, window, window_start, _), estimate in zip(pending, estimates):
+            if estimate > limit:
+                self._reject(scope, dimension, window_start, window, now)
+
+    @staticmethod
+    def _reject(scope: str, dimension: str, window_start: int, window: int, now: float):
+        retry_after = max(1, math.ceil(window_start + window - now))
+        logger.warning(f"🚫 Rate-Limit erreicht: {scope} ({dimension})")
+        raise HTTPException(
+            status_code=429,
+            detail="Zu viele Anfragen, bitte später erneut versuchen",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    def cleanup(self, db) -> int:
+        """Löscht abgelaufene Zähler (älter als 2 × längstes Fenster)"""
+        longest = max(w for dims in self.limits.values() for _, w in dims.values())
+        cutoff = datetime.now() - timedelta(seconds=2 * longest)
+        deleted = db.query(RateLimitCounter).filter(
+            RateLimitCounter.window_start < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+
+rate_limiter = RateLimiter(RATE_LIMITS)
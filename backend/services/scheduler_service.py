@@ -0,0 +1,112 @@
+"""
+Scheduler Service
+Genau ein Uvicorn-Worker führt die geplanten Jobs aus (Leader).
+
+Die Wahl läuft über ein Postgres Session-Advisory-Lock auf einer dedizierten
+Verbindung: stirbt der Leader-Prozess, gibt Postgres das Lock frei und ein
+anderer Worker übernimmt beim nächsten Heartbeat.
+"""
+import functools
+import logging
+import threading
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from models.database import engine
+
+logger = logging.getLogger(__name__)
+
+# "SMM_SCHD" als 64-bit Lock-Key
+SCHEDULER_LOCK_ID = 0x534D4D5F53434844
+
+
+class SchedulerLeader:
+    """Hält (oder versucht) das Advisory-Lock für die geplanten Jobs"""
+
+    def __init__(self, lock_id: int):
+        self.lock_id = lock_id
+        self._lock = threading.Lock()
+        self._connection: Optional[Connection] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    def ensure(self) -> bool:
+        """
+        Prüft das gehaltene Lock bzw. versucht es zu bekommen
+
+        Returns:
+            True, wenn dieser Worker Leader ist
+        """
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.execute(text("SELECT 1"))
+                    return True
+                except Exception as e:
+                    # Verbindung weg → Postgres hat das Lock bereits freigegeben
+                    logger.warning(f"⚠️ Scheduler-Leader Verbindung verloren: {e}")
+                    self._close()
+
+            connection = None
+            try:
+                # AUTOCOMMIT: kein "idle in transaction" auf der Lock-Verbindung
+                connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+                acquired = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:lock_id)"),
+                    {"lock_id": self.lock_id}
+                ).scalar()
+            except Exception as e:
+                logger.warning(f"⚠️ Scheduler-Leader Lock nicht prüfbar: {e}")
+                if connection is not None:
+                    connection.close()
+                return False
+
+            if not acquired:
+                connection.close()
+                return False
+
+            self._connection = connection
+            logger.info("👑 Dieser Worker ist Scheduler-Leader")
+            return True
+
+    def stats(self) -> dict:
+        return {"is_leader": self.is_leader}
+
+    def release(self):
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.execute(
+                    text("SELECT pg_advisory_unlock(:lock_id)"),
+                    {"lock_id": self.lock_id}
+                )
+                self._connection.close()
+                self._connection = None
+            except Exception:
+                self._close()
+
+    def _close(self):
+        # Verbindung nicht in den Pool zurückgeben – sie könnte das Lock noch halten
+        try:
+            self._connection.invalidate()
+        except Exception:
+            pass
+        self._connection = None
+
+
+scheduler_leader = SchedulerLeader(SCHEDULER_LOCK_ID)
+
+
+def leader_only(job):
+    """Decorator für Scheduler-Jobs: nur auf dem Leader ausführen"""
+    @functools.wraps(job)
+    def wrapper(*args, **kwargs):
+        if not scheduler_leader.ensure():
+            return None
+        return job(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,234 @@
+"""
+Temp Storage Service
+Garbage Collector und Disk-Quota für TEMP_DIR
+
+- Abgleich der Dateien mit videos.file_path
+- Verwaiste Dateien (abgebrochene Requests, alte client_secret.json, Crashes)
+  werden nach Alter gelöscht
+- Obergrenze für TEMP_DIR + Mindest-Freiplatz: neue Uploads werden mit 503
+  abgewiesen, solange sie überschritten ist
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.database import VideoModel
+from models.video import VideoStatus
+
+logger = logging.getLogger(__name__)
+
+GB = 1024 ** 3
+# Dateien, die gerade geschrieben werden, haben ein frisches mtime → nie anfassen
+MIN_AGE_SECONDS = 300
+USAGE_CACHE_SECONDS = 10.0
+ACTIVE_STATUSES = {VideoStatus.PENDING.value, VideoStatus.PROCESSING.value}
+
+
+class TempStorageManager:
+    """Sweeper + Kapazitätsprüfung für das Temp-Verzeichnis"""
+
+    def __init__(
+        self,
+        temp_dir: str,
+        max_bytes: int,
+        min_free_bytes: int,
+        orphan_max_age_seconds: int,
+        stale_upload_seconds: int
+    ):
+        self.temp_dir = Path(temp_dir)
+        self.max_bytes = max_bytes
+        self.min_free_bytes = min_free_bytes
+        self.orphan_max_age_seconds = orphan_max_age_seconds
+        self.stale_upload_seconds = stale_upload_seconds
+        self._lock = threading.Lock()
+        self._usage = 0
+        self._usage_at = 0.0
+        self._usage_loaded = False
+        self._rejected = 0
+        self._last_sweep: Dict = {}
+
+    # ==========================================
+    # Kapazität / Backpressure
+    # ==========================================
+
+    def _scan(self) -> List[Tuple[Path, int, float]]:
+        entries = []
+        try:
+            with os.scandir(self.temp_dir) as it:
+                for entry in it:
+                    if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                        continue
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((Path(entry.path), st.st_size, st.st_mtime))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def usage(self) -> int:
+        """Belegte Bytes in TEMP_DIR (kurz gecacht, gilt über alle Worker)"""
+        now = time.monotonic()
+        with self._lock:
+            if self._usage_loaded and now - self._usage_at < USAGE_CACHE_SECONDS:
+                return self._usage
+        usage = sum(size for _, size, _ in self._scan())
+        with self._lock:
+            self._usage, self._usage_at, self._usage_loaded = usage, now, True
+        return usage
+
+    def track(self, written_bytes: int):
+        """Eigene Schreibvorgänge sofort einrechnen (bis zum nächsten Scan)"""
+        with self._lock:
+            self._usage += written_bytes
+
+    def capacity_problem(self, incoming_bytes: int = 0) -> Optional[str]:
+        """
+        Prüft Quota und Freiplatz ohne abzuweisen
+
+        Returns:
+            None wenn genug Platz ist, sonst "quota" oder "low_disk"
+        """
+        incoming_bytes = max(0, incoming_bytes or 0)
+        free = self.free_bytes()
+        if self.usage() + incoming_bytes > self.max_bytes:
+            return "quota"
+        if free is not None and free - incoming_bytes < self.min_free_bytes:
+            return "low_disk"
+        return None
+
+    def free_bytes(self) -> Optional[int]:
+        try:
+            return shutil.disk_usage(self.temp_dir).free
+        except OSError:
+            return None
+
+    def check_capacity(self, incoming_bytes: int = 0):
+        """
+        Backpressure für neue Uploads
+
+        Raises:
+            HTTPException(503) mit Retry-After, wenn Quota oder Freiplatz nicht reichen
+        """
+        problem = self.capacity_problem(incoming_bytes)
+        if problem:
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"⚠️ Temp-Speicher voll ({problem}) – Upload abgewiesen")
+            raise HTTPException(
+                status_code=503,
+                detail="Speicher für Uploads aktuell ausgelastet, bitte später erneut versuchen",
+                headers={"Retry-After": "60"}
+            )
+
+    # ==========================================
+    # Sweeper
+    # ==========================================
+
+    def _referenced(self, db: Session, paths: List[str]) -> Dict[str, VideoModel]:
+        referenced = {}
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            for video in db.query(VideoModel).filter(VideoModel.file_path.in_(chunk)).all():
+                referenced[video.file_path] = video
+        return referenced
+
+    def _delete(self, path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"⚠️ Temp-Datei nicht löschbar: {path} - {e}")
+            return False
+
+    def sweep(self, db: Session) -> Dict:
+        """
+        Gleicht TEMP_DIR mit der DB ab und räumt auf
+
+        - nicht referenziert + älter als orphan_max_age → löschen
+        - referenziert von abgeschlossenen Videos → löschen, file_path leeren
+        - referenziert von pending/processing, aber älter als stale_upload → Video
+          auf failed setzen, löschen
+        - jüngere Waisen bleiben auch über der Quota liegen: ein laufender Batch-Upload
+          legt die Zeilen erst nach der letzten Datei an (Quota wirkt über die Admission)
+
+        Returns:
+            Report mit gelöschten Dateien und freigegebenen Bytes
+        """
+        now = time.time()
+        entries = self._scan()
+        usage_before = sum(size for _, size, _ in entries)
+
+        candidates = [e for e in entries if now - e[2] > MIN_AGE_SECONDS]
+        referenced = self._referenced(db, [str(path) for path, _, _ in candidates])
+
+        deleted, reclaimed, failed_videos = 0, 0, 0
+        for path, size, mtime in candidates:
+            age = now - mtime
+            video = referenced.get(str(path))
+
+            if video is None:
+                if age <= self.orphan_max_age_seconds:
+                    continue
+            elif video.status in ACTIVE_STATUSES:
+                if age <= self.stale_upload_seconds:
+                    continue
+                video.status = VideoStatus.FAILED.value
+                video.errors = {**(video.errors or {}), "system": "Upload abgebrochen (Temp-Datei abgelaufen)"}
+                video.file_path = None
+                video.updated_at = datetime.now()
+                failed_videos += 1
+            else:
+                video.file_path = None
+
+            if self._delete(path):
+                deleted += 1
+                reclaimed += size
+
+        db.commit()
+
+        usage = usage_before - reclaimed
+        with self._lock:
+            self._usage, self._usage_at, self._usage_loaded = usage, time.monotonic(), True
+
+        report = {
+            "scanned": len(entries),
+            "deleted": deleted,
+            "failed_stale_uploads": failed_videos,
+            "reclaimed_bytes": reclaimed,
+            "usage_bytes": usage,
+            "swept_at": datetime.now().isoformat(),
+        }
+        self._last_sweep = report
+        return report
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "usage_bytes": self._usage if self._usage_loaded else None,
+                "max_bytes": self.max_bytes,
+                "min_free_bytes": self.min_free_bytes,
+                "rejected_uploads": self._rejected,
+                "last_sweep": self._last_sweep,
+            }
+
+
+temp_storage = TempStorageManager(
+    temp_dir=settings.TEMP_DIR,
+    max_bytes=int(settings.TEMP_DIR_MAX_GB * GB),
+    min_free_bytes=int(settings.TEMP_DIR_MIN_FREE_GB * GB),
+    orphan_max_age_seconds=settings.TEMP_ORPHAN_MAX_AGE_MINUTES * 60,
+    stale_upload_seconds=settings.TEMP_STALE_UPLOAD_HOURS * 3600
+)
@@ -0,0 +1,231 @@
+"""
+Thumbnail Service
+Cover-Frame und Vorschaubilder beim Ingest
+
+- Key-Frames per ffmpeg → kleine JPEG/WebP-Renditions (WebP nur, wenn ffmpeg libwebp hat)
+- Content-adressiert unter THUMBNAIL_DIR: {sha256}_{timestamp_ms}_{rendition}.{format}
+  → gleiche Datei = gleiche Bilder, unveränderlich, lange cachebar
+- Ohne ffmpeg werden nur Content-Hash und Cover-Zeitpunkt gespeichert (TikTok-Cover)
+"""
+import asyncio
+import logging
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.database import SessionLocal, VideoModel
+from services.media_probe_service import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Rendition → längste Kante in px
+THUMBNAIL_RENDITIONS = {"small": 320, "large": 1280}
+FFMPEG_TIMEOUT_SECONDS = 60
+DEFAULT_COVER_MS = 1000
+
+THUMBNAIL_FILENAME = re.compile(r"^[0-9a-f]{64}_\d+_(small|large)\.(jpg|webp)$")
+MEDIA_TYPES = {"jpg": "image/jpeg", "webp": "image/webp"}
+
+
+def cover_timestamp_ms(duration_seconds: Optional[float]) -> int:
+    """Cover bei 10 % der Laufzeit (mind. 1 s, höchstens Mitte) – überspringt Schwarzbild/Intro"""
+    if not duration_seconds:
+        return DEFAULT_COVER_MS
+    return int(min(max(duration_seconds * 0.1, 1.0), duration_seconds / 2) * 1000)
+
+
+def frame_timestamps(duration_seconds: Optional[float], count: int) -> List[int]:
+    """Cover + gleichmäßig verteilte weitere Frames"""
+    cover = cover_timestamp_ms(duration_seconds)
+    if count <= 1 or not duration_seconds:
+        return [cover]
+    step = duration_seconds * 1000 / count
+    return [cover] + [int(step * i) for i in range(1, count) if int(step * i) != cover]
+
+
+def _filename(digest: str, timestamp_ms: int, rendition: str, fmt: str) -> str:
+    return f"{digest}_{timestamp_ms}_{rendition}.{fmt}"
+
+
+class ThumbnailStore:
+    """Extraktion, Ablage und URLs der Thumbnails"""
+
+    def __init__(self, directory: str, frame_count: int):
+        self.directory = Path(directory)
+        self.frame_count = max(1, frame_count)
+        self.ffmpeg = shutil.which("ffmpeg")
+        self._formats: Optional[List[str]] = None
+        if not self.ffmpeg:
+            logger.warning("⚠️ ffmpeg nicht gefunden – keine Thumbnails, nur Content-Hash und Cover-Zeitpunkt")
+
+    def formats(self) -> List[str]:
+        """jpg immer, webp nur mit libwebp-Encoder (einmal pro Prozess geprüft)"""
+        if self._formats is None:
+            formats = ["jpg"]
+            if not self.ffmpeg:
+                return formats
+            try:
+                encoders = subprocess.run(
+                    [self.ffmpeg, "-hide_banner", "-encoders"], capture_output=True, timeout=10
+                ).stdout
+                if b"libwebp" in encoders:
+                    formats.append("webp")
+            except (OSError, subprocess.SubprocessError):
+                pass
+            self._formats = formats
+        return self._formats
+
+    # ==========================================
+    # Extraktion (blockierend, im Thread)
+    # ==========================================
+
+    def _extract_frame(self, video_path: str, digest: str, timestamp_ms: int) -> bool:
+        outputs = [
+            (rendition, edge, fmt)
+            for rendition, edge in THUMBNAIL_RENDITIONS.items()
+            for fmt in self.formats()
+        ]
+        if all((self.directory / _filename(digest, timestamp_ms, r, f)).is_file() for r, _, f in outputs):
+            return True
+
+        # Ein Decode, per split auf alle Renditions verteilt
+        labels = [f"o{i}" for i in range(len(outputs))]
+        graph = f"[0:v]split={len(outputs)}" + "".join(f"[s{i}]" for i in range(len(outputs))) + ";"
+        graph += ";".join(
+            f"[s{i}]scale='if(gt(iw,ih),{edge},-2)':'if(gt(iw,ih),-2,{edge})'[{labels[i]}]"
+            for i, (_, edge, _) in enumerate(outputs)
+        )
+
+        command = [
+            self.ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+            "-ss", f"{timestamp_ms / 1000:.3f}", "-i", video_path,
+            "-filter_complex", graph,
+        ]
+        partials = []
+        for label, (rendition, _, fmt) in zip(labels, outputs):
+            partial = self.directory / f".{_filename(digest, timestamp_ms, rendition, fmt)}.{os.getpid()}.part"
+            partials.append((partial, self.directory / _filename(digest, timestamp_ms, rendition, fmt)))
+            command += ["-map", f"[{label}]", "-frames:v", "1"]
+            command += ["-c:v", "libwebp", "-quality", "80", "-f", "webp"] if fmt == "webp" else ["-q:v", "3", "-f", "mjpeg"]
+            command.append(str(partial))
+
+        try:
+            completed = subprocess.run(command, capture_output=True, timeout=FFMPEG_TIMEOUT_SECONDS)
+            if completed.returncode != 0 or not all(p.is_file() and p.stat().st_size for p, _ in partials):
+                logger.warning(
+                    f"⚠️ Thumbnail bei {timestamp_ms} ms fehlgeschlagen: "
+                    f"{completed.stderr.decode('utf-8', 'replace').strip()[-300:]}"
+                )
+                return False
+            for partial, target in partials:
+                os.replace(partial, target)
+            return True
+        except subprocess.TimeoutExpired:
+            logger.warning(f"⚠️ Thumbnail bei {timestamp_ms} ms: ffmpeg Timeout")
+            return False
+        finally:
+            for partial, _ in partials:
+                if partial.exists():
+                    partial.unlink()
+
+    def extract(self, video_path: str, digest: str, timestamps: List[int]) -> List[int]:
+        """Erzeugt alle Renditions; Returns: Zeitpunkte, für die Bilder vorliegen"""
+        if not self.ffmpeg:
+            return []
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return [ts for ts in timestamps if self._extract_frame(video_path, digest, ts)]
+
+    # ==========================================
+    # Ingest-Job
+    # ==========================================
+
+    async def generate_for_video(self, video_id: str, file_path: str):
+        """Dispatch-Job (vor dem Upload): Hash, Cover-Zeitpunkt, Thumbnails"""
+        try:
+            await self._generate(video_id, file_path)
+        except Exception as e:
+            logger.error(f"❌ Thumbnails für {video_id} fehlgeschlagen: {e}")
+
+    async def _generate(self, video_id: str, file_path: str):
+        db = SessionLocal()
+        try:
+            video = db.query(VideoModel).filter(VideoModel.id == video_id).first()
+            if not video:
+                return
+            # Beim Streaming-Upload schon beim Schreiben berechnet
+            digest = video.content_hash or await asyncio.to_thread(content_hash, file_path)
+            timestamps = frame_timestamps(video.duration_seconds, self.frame_count)
+            frames = await asyncio.to_thread(self.extract, file_path, digest, timestamps)
+
+            video.content_hash = digest
+            video.cover_timestamp_ms = timestamps[0]
+            video.thumbnail_frames = frames or None
+            db.commit()
+            if frames:
+                logger.info(f"🖼️ {len(frames)} Thumbnail-Frames für {video_id}")
+        finally:
+            db.close()
+
+    # ==========================================
+    # Auslieferung / Aufräumen
+    # ==========================================
+
+    def resolve(self, filename: str) -> Optional[Path]:
+        if not THUMBNAIL_FILENAME.match(filename):
+            return None
+        path = self.directory / filename
+        return path if path.is_file() else None
+
+    def urls(self, video: VideoModel) -> Optional[Dict]:
+        """Thumbnail-URLs eines Videos für API-Responses (None = keine Bilder)"""
+        if not video.content_hash or not video.thumbnail_frames:
+            return None
+        base = f"{settings.BACKEND_URL}/api/videos/thumbnails"
+        frames = [
+            {
+                "timestamp_ms": ts,
+                **{
+                    rendition: {fmt: f"{base}/{_filename(video.content_hash, ts, rendition, fmt)}" for fmt in self.formats()}
+                    for rendition in THUMBNAIL_RENDITIONS
+                },
+            }
+            for ts in video.thumbnail_frames
+        ]
+        return {"cover": frames[0], "frames": frames}
+
+    def cover_path(self, video: VideoModel, rendition: str = "large") -> Optional[str]:
+        """JPEG des Cover-Frames (z.B. für YouTube thumbnails.set)"""
+        if not video.content_hash or not video.thumbnail_frames:
+            return None
+        path = self.directory / _filename(video.content_hash, video.thumbnail_frames[0], rendition, "jpg")
+        return str(path) if path.is_file() else None
+
+    def release(self, db: Session, digests: List[Optional[str]]) -> int:
+        """Löscht Thumbnails von Hashes, die kein Video mehr referenziert (nach dem Commit aufrufen)"""
+        digests = {d for d in digests if d}
+        if not digests:
+            return 0
+        still_used = {
+            row[0] for row in db.query(VideoModel.content_hash).filter(VideoModel.content_hash.in_(digests)).distinct()
+        }
+        deleted = 0
+        for digest in digests - still_used:
+            for path in self.directory.glob(f"{digest}_*"):
+                try:
+                    path.unlink()
+                    deleted += 1
+                except OSError as e:
+                    logger.warning(f"⚠️ Thumbnail nicht löschbar: {path} - {e}")
+        return deleted
+
+
+thumbnail_store = ThumbnailStore(
+    directory=settings.THUMBNAIL_DIR,
+    frame_count=settings.THUMBNAIL_FRAMES
+)
@@ -1,14 +1,18 @@
 """
 TikTok Upload Service
 """
-import requests
 import logging
 from pathlib import Path
 from typing import Optional
 
+from config import settings
+from utils.lazy_imports import lazy_module
+
 logger = logging.getLogger(__name__)
 
-TIKTOK_API_BASE = "https://open.tiktokapis.com"
+requests = lazy_module("requests")
+
+TIKTOK_API_BASE = settings.TIKTOK_API_BASE.rstrip("/")
 
 
 def tiktok_upload_video(
@@ -16,7 +20,8 @@ def tiktok_upload_video(
     open_id: str,
     video_path: str,
     caption: str = "",
-    privacy_level: str = "SELF_ONLY"  # SELF_ONLY, MUTUAL_FOLLOW_FRIENDS, PUBLIC_TO_EVERYONE
+    privacy_level: str = "SELF_ONLY",  # SELF_ONLY, MUTUAL_FOLLOW_FRIENDS, PUBLIC_TO_EVERYONE
+    cover_timestamp_ms: Optional[int] = None
 ) -> dict:
     """
     Lädt ein Video auf TikTok hoch
@@ -27,6 +32,7 @@ def tiktok_upload_video(
         video_path: Pfad zur Video-Datei
         caption: Video-Caption (max 2200 Zeichen)
         privacy_level: Privacy-Einstellung
+        cover_timestamp_ms: Cover-Frame (thumbnail_service), sonst 1000 ms
     
     Returns:
         dict: Upload-Response
@@ -50,7 +56,8 @@ def tiktok_upload_video(
             access_token=access_token,
             caption=caption,
             privacy_level=privacy_level,
-            filesize=filesize
+            filesize=filesize,
+            cover_timestamp_ms=cover_timestamp_ms or 1000
         )
         
         upload_url = init_response["data"]["upload_url"]
@@ -82,7 +89,8 @@ def _initialize_upload(
     access_token: str,
     caption: str,
     privacy_level: str,
-    filesize: int
+    filesize: int,
+    cover_timestamp_ms: int = 1000
 ) -> dict:
     """
     Initialisiert den TikTok Upload
@@ -109,7 +117,7 @@ def _initialize_upload(
             "disable_duet": False,
             "disable_comment": False,
             "disable_stitch": False,
-            "video_cover_timestamp_ms": 1000
+            "video_cover_timestamp_ms": cover_timestamp_ms
         },
         "source_info": {
             "source": "FILE_UPLOAD",
@@ -207,7 +207,7 @@ class TokenStorage:
         "token_uri": credentials.token_uri,
         "client_id": credentials.client_id,
         "client_secret": credentials.client_secret,
-        "scopes": list(credentials.scopes) if credentials.scopes else [],
+        "scopes": list(getattr(credentials, "granted_scopes", None) or credentials.scopes or []),
         })
 
         self._save_credentials(
@@ -0,0 +1,449 @@
+"""
+Tracing Service
+Leichtgewichtige, OpenTelemetry-kompatible Spans ohne zusätzliche Abhängigkeiten
+
+- Trace-Kontext über contextvars (W3C traceparent für eingehende Requests)
+- Spans für Requests, Background-Jobs, Plattform-Uploads, ausgehende HTTP-Calls
+  (requests/httpx) und DB-Statements
+- Export im Hintergrund-Thread: JSON-Lines Datei oder OTLP/HTTP (JSON) an einen
+  lokalen Collector – funktioniert also auch offline
+
+TRACING_EXPORTER=none schaltet alles ab (Default).
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, NamedTuple, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_STATEMENT_LENGTH = 500
+EXPORT_BATCH_SIZE = 256
+EXPORT_INTERVAL_SECONDS = 2.0
+EXPORT_QUEUE_SIZE = 10000
+
+
+class SpanContext(NamedTuple):
+    trace_id: str   # 32 hex
+    span_id: str    # 16 hex
+    sampled: bool
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """W3C traceparent: 00-<trace_id>-<span_id>-<flags>"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return SpanContext(parts[1], parts[2], bool(flags & 0x01))
+
+
+class Span:
+    __slots__ = ("name", "context", "parent_span_id", "kind", "attributes", "start_ns", "end_ns", "status", "error")
+
+    def __init__(self, name: str, context: SpanContext, parent_span_id: Optional[str], kind: str, attributes: Dict):
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "UNSET"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = "ERROR"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_span_id,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+            "service": settings.TRACING_SERVICE_NAME,
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+# ==========================================
+# Export
+# ==========================================
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_OTLP_KINDS = {"INTERNAL": 1, "SERVER": 2, "CLIENT": 3}
+_OTLP_STATUS = {"UNSET": 0, "OK": 1, "ERROR": 2}
+
+
+def _to_otlp(spans: List[Span]) -> Dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": settings.TRACING_SERVICE_NAME}}]},
+        "scopeSpans": [{
+            "scope": {"name": __name__},
+            "spans": [{
+                "traceId": span.context.trace_id,
+                "spanId": span.context.span_id,
+                "parentSpanId": span.parent_span_id or "",
+                "name": span.name,
+                "kind": _OTLP_KINDS.get(span.kind, 1),
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                "status": {"code": _OTLP_STATUS[span.status], "message": span.error or ""},
+            } for span in spans],
+        }],
+    }]}
+
+
+class SpanExporter:
+    """Sammelt beendete Spans und exportiert sie gebündelt im Hintergrund"""
+
+    def __init__(self, mode: str, file_path: str, otlp_endpoint: str):
+        self.mode = mode
+        self.file_path = file_path
+        self.otlp_endpoint = otlp_endpoint
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+        self.exported = 0
+
+    def submit(self, span: Span):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _drain(self, block: bool) -> List[Span]:
+        batch = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=EXPORT_INTERVAL_SECONDS))
+            while len(batch) < EXPORT_BATCH_SIZE:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain(block=True)
+            if batch:
+                self._export(batch)
+
+    def flush(self):
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return
+            self._export(batch)
+
+    def _export(self, batch: List[Span]):
+        try:
+            if self.mode == "file":
+                data = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in batch).encode("utf-8")
+                # O_APPEND + ein write() pro Batch: mehrere Worker können dieselbe Datei nutzen
+                fd = os.open(self.file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+            elif self.mode == "otlp":
+                # urllib statt requests: der Export selbst soll nicht getraced werden
+                request = urllib.request.Request(
+                    self.otlp_endpoint,
+                    data=json.dumps(_to_otlp(batch)).encode("utf-8"),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+            self.exported += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning(f"⚠️ Span-Export fehlgeschlagen ({len(batch)} Spans): {e}")
+
+
+# ==========================================
+# Tracer
+# ==========================================
+
+class Tracer:
+    def __init__(self, exporter: Optional[SpanExporter], sample_ratio: float):
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        kind: str = "INTERNAL",
+        attributes: Optional[Dict] = None
+    ) -> Span:
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current else None
+        if parent is not None:
+            context = SpanContext(parent.trace_id, secrets.token_hex(8), parent.sampled)
+            parent_span_id = parent.span_id
+        else:
+            sampled = random.random() < self.sample_ratio
+            context = SpanContext(secrets.token_hex(16), secrets.token_hex(8), sampled)
+            parent_span_id = None
+        return Span(name, context, parent_span_id, kind, dict(attributes or {}))
+
+    def end_span(self, span: Span):
+        if span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if span.context.sampled and self.exporter is not None:
+            self.exporter.submit(span)
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[SpanContext] = None, kind: str = "INTERNAL", **attributes):
+        """Span als Context Manager; Fehler werden am Span vermerkt und weitergereicht"""
+        if not self.enabled:
+            yield None
+            return
+        span = self.start_span(name, parent=parent, kind=kind, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def flush(self):
+        if self.exporter is not None:
+            self.exporter.flush()
+
+    def stats(self) -> Dict:
+        if not self.enabled:
+            return {"exporter": "none"}
+        return {
+            "exporter": self.exporter.mode,
+            "sample_ratio": self.sample_ratio,
+            "exported": self.exporter.exported,
+            "dropped": self.exporter.dropped,
+        }
+
+
+def current_context() -> Optional[SpanContext]:
+    """Trace-Kontext zum Weiterreichen an Background-Jobs"""
+    span = _current_span.get()
+    return span.context if span else None
+
+
+def _build_tracer() -> Tracer:
+    mode = (settings.TRACING_EXPORTER or "none").lower()
+    if mode not in ("file", "otlp"):
+        return Tracer(None, 0.0)
+    return Tracer(
+        SpanExporter(mode, settings.TRACING_FILE, settings.TRACING_OTLP_ENDPOINT),
+        max(0.0, min(1.0, settings.TRACING_SAMPLE_RATIO))
+    )
+
+
+tracer = _build_tracer()
+
+
+# ==========================================
+# ASGI Middleware (Request-Spans)
+# ==========================================
+
+class TracingMiddleware:
+    """Server-Span pro HTTP-Request; übernimmt einen eingehenden traceparent"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        span = tracer.start_span(
+            f"{scope['method']} {scope['path']}",
+            parent=parent,
+            kind="SERVER",
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        token = _current_span.set(span)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.status = "ERROR"
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"traceparent", span.context.to_traceparent().encode())]
+            await send(message)
+            # Span endet mit der Response – Background Tasks laufen danach als eigene Spans
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                self._finish(scope, span)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(scope, span)
+
+    @staticmethod
+    def _finish(scope, span: Span):
+        route = scope.get("route")
+        if route is not None and getattr(route, "path", None):
+            span.name = f"{scope['method']} {route.path}"
+            span.set_attribute("http.route", route.path)
+        tracer.end_span(span)
+
+
+# ==========================================
+# Auto-Instrumentierung: SQLAlchemy + HTTP Clients
+# ==========================================
+
+def instrument_sqlalchemy(engine):
+    """Span pro SQL-Statement – nur innerhalb eines bestehenden Traces"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current_span.get() is None:
+            return
+        span = tracer.start_span(
+            "db.query",
+            kind="CLIENT",
+            attributes={"db.system": engine.dialect.name, "db.statement": statement[:MAX_STATEMENT_LENGTH]},
+        )
+        conn.info.setdefault("_trace_spans", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("_trace_spans")
+        if spans:
+            tracer.end_span(spans.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("_trace_spans") if conn is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_error(exception_context.original_exception)
+            tracer.end_span(span)
+
+
+def _http_span(method: str, url: str):
+    return tracer.span(
+        f"HTTP {method.upper()}",
+        kind="CLIENT",
+        **{"http.method": method.upper(), "http.url": str(url).split("?", 1)[0]}
+    )
+
+
+def instrument_http_clients():
+    """Patcht requests, httpx und httplib2 (YouTube API): Client-Span pro ausgehendem Request"""
+    import httplib2
+    import httpx
+    import requests
+
+    if getattr(requests.Session.send, "_traced", False):
+        return
+
+    original_requests_send = requests.Session.send
+
+    def requests_send(self, request, **kwargs):
+        if _current_span.get() is None:
+            return original_requests_send(self, request, **kwargs)
+        with _http_span(request.method, request.url) as span:
+            response = original_requests_send(self, request, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
+    original_httpx_send = httpx.AsyncClient.send
+
+    async def httpx_send(self, request, *args, **kwargs):
+        if _current_span.get() is None:
+            return await original_httpx_send(self, request, *args, **kwargs)
+        with _http_span(request.method, request.url) as span:
+            response = await original_httpx_send(self, request, *args, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
+    original_httplib2_request = httplib2.Http.request
+
+    def httplib2_request(self, uri, method="GET", *args, **kwargs):
+        if _current_span.get() is None:
+            return original_httplib2_request(self, uri, method, *args, **kwargs)
+        with _http_span(method, uri) as span:
+            response, content = original_httplib2_request(self, uri, method, *args, **kwargs)
+            span.set_attribute("http.status_code", response.status)
+            return response, content
+
+    requests_send._traced = True
+    requests.Session.send = requests_send
+    httpx.AsyncClient.send = httpx_send
+    httplib2.Http.request = httplib2_request
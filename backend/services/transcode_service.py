@@ -0,0 +1,394 @@
+"""
+Transcode Service
+Optionale, plattformspezifische Varianten (ffmpeg) vor dem Upload
+
+- Läuft in einem ProcessPoolExecutor (Größe = CPU-Kerne), nie auf dem Event Loop
+- Varianten werden nach (Content-Hash, Preset) auf Disk gecacht → Re-Posts und
+  Retries transcodieren nie doppelt, auch nicht über Worker-Prozesse hinweg
+- Cache-Größe per LRU begrenzt (mtime = letzter Zugriff)
+- Nur aktiv mit TRANSCODE_ENABLED und installiertem ffmpeg
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from config import settings
+from data.optimizer_config import PLATFORM_CONSTRAINTS
+from services.media_probe_service import MediaProbeError, content_hash as hash_content, probe_media
+from services.preflight_service import fixable_by_transcode, preflight
+
+logger = logging.getLogger(__name__)
+
+GB = 1024 ** 3
+AUDIO_KBPS = 128
+# Größenbudget nicht ganz ausreizen (Container-Overhead, VBV-Schwankungen)
+SIZE_BUDGET_FACTOR = 0.9
+# Gerade benutzte Varianten (laufende Uploads, Instagram holt per URL) nicht verdrängen
+EVICT_GRACE_SECONDS = 3600
+
+
+class TranscodePreset(NamedTuple):
+    name: str
+    version: int                    # erhöhen, wenn sich die ffmpeg-Parameter ändern
+    video_filter: str
+    max_video_kbps: int
+    frame_rate: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}-v{self.version}"
+
+
+TRANSCODE_PRESETS: Dict[str, TranscodePreset] = {
+    # 9:16 H.264 für Reels/TikTok: einpassen + Letterbox statt Beschnitt
+    "vertical_h264": TranscodePreset(
+        name="vertical_h264",
+        version=1,
+        video_filter=(
+            "scale=1080:1920:force_original_aspect_ratio=decrease,"
+            "pad=1080:1920:(ow-iw)/2:(oh-ih)/2,setsar=1"
+        ),
+        max_video_kbps=8000,
+        frame_rate=30,
+    ),
+    # Auflösung behalten, nur Codec + Bitrate begrenzen
+    "h264_capped": TranscodePreset(
+        name="h264_capped",
+        version=1,
+        video_filter="scale=trunc(iw/2)*2:trunc(ih/2)*2,setsar=1",
+        max_video_kbps=20000,
+    ),
+}
+
+PLATFORM_PRESETS: Dict[str, str] = {
+    "tiktok": "vertical_h264",
+    "instagram": "vertical_h264",
+    "youtube": "h264_capped",
+}
+
+
+class Variant(NamedTuple):
+    path: str
+    media: Optional[Dict]
+    preset: str
+    cached: bool
+
+
+# ==========================================
+# Jobs im Prozess-Pool (müssen picklebar sein)
+# ==========================================
+
+def _video_kbps(preset: TranscodePreset, duration: Optional[float]) -> int:
+    """Bitrate = Preset-Obergrenze, bei bekannter Dauer zusätzlich durch das Größenlimit gedeckelt"""
+    limits = [
+        PLATFORM_CONSTRAINTS.get(platform, {}).get("max_file_size_mb")
+        for platform, name in PLATFORM_PRESETS.items() if name == preset.name
+    ]
+    limits = [limit for limit in limits if limit]
+    if not duration or not limits:
+        return preset.max_video_kbps
+    budget_kbps = min(limits) * 1024 * 8 * 1024 / 1000 * SIZE_BUDGET_FACTOR / duration - AUDIO_KBPS
+    return max(300, min(preset.max_video_kbps, int(budget_kbps)))
+
+
+def _ffmpeg_command(preset: TranscodePreset, source: str, target: str, duration: Optional[float], threads: int) -> List[str]:
+    kbps = _video_kbps(preset, duration)
+    video_filter = preset.video_filter
+    if preset.frame_rate:
+        video_filter += f",fps={preset.frame_rate}"
+    return [
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+        "-i", source,
+        "-map", "0:v:0", "-map", "0:a:0?",
+        "-vf", video_filter,
+        "-c:v", "libx264", "-preset", "medium", "-profile:v", "high", "-pix_fmt", "yuv420p",
+        "-b:v", f"{kbps}k", "-maxrate", f"{kbps}k", "-bufsize", f"{kbps * 2}k",
+        "-c:a", "aac", "-b:a", f"{AUDIO_KBPS}k", "-ac", "2",
+        "-movflags", "+faststart",
+        "-threads", str(threads),
+        "-f", "mp4", target,
+    ]
+
+
+def _transcode(preset_name: str, source: str, target: str, duration: Optional[float], threads: int, timeout: int) -> Optional[Dict]:
+    """ffmpeg in eine .part-Datei, danach atomar umbenennen und die Variante proben"""
+    preset = TRANSCODE_PRESETS[preset_name]
+    partial = f"{target}.{os.getpid()}.part"
+    try:
+        completed = subprocess.run(
+            _ffmpeg_command(preset, source, partial, duration, threads),
+            capture_output=True, timeout=timeout
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.decode("utf-8", "replace").strip()[-500:] or "ffmpeg fehlgeschlagen")
+        os.replace(partial, target)
+    finally:
+        if os.path.exists(partial):
+            os.unlink(partial)
+
+    media = probe_media(target)
+    return media.as_columns() if media else None
+
+
+# ==========================================
+# Transcoder
+# ==========================================
+
+class Transcoder:
+    """Prozess-Pool + Variant-Cache mit LRU-Verdrängung"""
+
+    def __init__(
+        self,
+        enabled: bool,
+        max_workers: int,
+        cache_dir: str,
+        cache_max_bytes: int,
+        timeout: int,
+        web_concurrency: int = 1
+    ):
+        self.ffmpeg = shutil.which("ffmpeg")
+        self.enabled = enabled and bool(self.ffmpeg)
+        if enabled and not self.ffmpeg:
+            logger.warning("⚠️ TRANSCODE_ENABLED, aber ffmpeg nicht gefunden – Transcoding deaktiviert")
+        cpus = os.cpu_count() or 1
+        web_concurrency = max(1, web_concurrency)
+        # Jeder uvicorn-Worker hat einen eigenen Pool → Kerne auf die Worker aufteilen
+        self.max_workers = max(1, max_workers or cpus // web_concurrency)
+        # Parallelität kommt aus den Pools → ffmpeg selbst teilt sich die übrigen Kerne
+        self.ffmpeg_threads = max(1, cpus // (self.max_workers * web_concurrency))
+        self.cache_dir = Path(cache_dir)
+        self.cache_max_bytes = cache_max_bytes
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._transcoded = 0
+        self._hits = 0
+        self._failed = 0
+        self._evicted = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Lazy: nur Worker, die wirklich transcodieren, starten Prozesse.
+        # spawn statt fork – der Elternprozess hat Event Loop + Threads
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    async def _run(self, fn, *args):
+        executor = self._pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # Kindprozess abgestürzt (OOM-Killer) → Pool beim nächsten Job neu aufbauen
+            with self._executor_lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+
+    # ==========================================
+    # Auswahl
+    # ==========================================
+
+    @staticmethod
+    def needs_variant(platform: str, media: Optional[Dict], file_size: Optional[int]) -> bool:
+        """
+        Variante nötig, wenn der Preflight nur an behebbaren Regeln scheitert –
+        für Reels/TikTok zusätzlich, wenn das Original kein 9:16 H.264 ist
+        """
+        if platform not in PLATFORM_PRESETS or not media:
+            return False
+        if fixable_by_transcode(platform, media, file_size):
+            return True
+        if PLATFORM_PRESETS[platform] != "vertical_h264":
+            return False
+        width, height = media.get("width"), media.get("height")
+        if media.get("rotation") in (90, 270):
+            width, height = height, width
+        if not width or not height:
+            return False
+        return media.get("video_codec") != "h264" or abs(width / height - 9 / 16) > 0.01
+
+    def preflight(self, platforms: List[str], media: Optional[Dict], file_path: Optional[str]) -> Dict[str, str]:
+        """
+        Preflight aus Sicht des Upload-Jobs: Strecken, deren Verstöße eine Variante
+        behebt, scheitern nicht (nur bei aktivem Transcoding)
+        """
+        blocked = preflight(platforms, media, file_path)
+        if not self.enabled or not blocked:
+            return blocked
+        try:
+            file_size = os.path.getsize(file_path) if file_path else None
+        except OSError:
+            file_size = None
+        return {
+            platform: error for platform, error in blocked.items()
+            if not (platform in PLATFORM_PRESETS and fixable_by_transcode(platform, media, file_size))
+        }
+
+    # ==========================================
+    # Varianten
+    # ==========================================
+
+    async def prepare(
+        self,
+        platforms: List[str],
+        source: str,
+        media: Optional[Dict],
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Variant]:
+        """
+        Erzeugt (oder holt aus dem Cache) die Varianten für alle Plattformen, die eine brauchen
+
+        Args:
+            content_hash: sha256 der Quelle, falls schon bekannt (videos.content_hash)
+
+        Returns:
+            {platform: Variant}; Plattformen ohne Eintrag laden das Original hoch.
+            Fehler beim Transcodieren → Original (der Preflight entscheidet dann).
+        """
+        if not self.enabled:
+            return {}
+        try:
+            file_size = os.path.getsize(source)
+        except OSError:
+            return {}
+
+        wanted = {p: PLATFORM_PRESETS[p] for p in platforms if self.needs_variant(p, media, file_size)}
+        if not wanted:
+            return {}
+
+        if not content_hash:
+            try:
+                content_hash = await self._run(hash_content, source)
+            except Exception as e:
+                logger.error(f"❌ Content-Hash fehlgeschlagen: {e}")
+                return {}
+
+        duration = (media or {}).get("duration_seconds")
+        variants = {}
+        for preset_name in set(wanted.values()):
+            try:
+                variant = await self.get_variant(content_hash, preset_name, source, duration)
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"❌ Transcode {preset_name} fehlgeschlagen: {e}")
+                continue
+            for platform, name in wanted.items():
+                if name == preset_name:
+                    variants[platform] = variant
+        return variants
+
+    async def get_variant(self, content_hash: str, preset_name: str, source: str, duration: Optional[float]) -> Variant:
+        preset = TRANSCODE_PRESETS[preset_name]
+        target = self.cache_dir / f"{content_hash}_{preset.key}.mp4"
+
+        if target.is_file():
+            try:
+                await asyncio.to_thread(os.utime, target)
+                media = await asyncio.to_thread(probe_media, str(target))
+                self._hits += 1
+                logger.info(f"♻️ Variante aus Cache: {target.name}")
+                return Variant(str(target), media.as_columns() if media else None, preset_name, True)
+            except (OSError, MediaProbeError):
+                # Zwischenzeitlich verdrängt oder defekt → neu erzeugen
+                pass
+
+        # Gleiche Variante läuft bereits in diesem Prozess → mitwarten
+        key = target.name
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._create(preset_name, source, str(target), duration))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _create(self, preset_name: str, source: str, target: str, duration: Optional[float]) -> Variant:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        media = await self._run(_transcode, preset_name, source, target, duration, self.ffmpeg_threads, self.timeout)
+        self._transcoded += 1
+        logger.info(f"🎞️ Variante erstellt: {Path(target).name} ({time.perf_counter() - started:.1f}s)")
+        await asyncio.to_thread(self.evict)
+        return Variant(target, media, preset_name, False)
+
+    # ==========================================
+    # LRU-Cache
+    # ==========================================
+
+    def evict(self) -> int:
+        """Verdrängt die am längsten nicht genutzten Varianten, bis der Cache unter dem Limit ist"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".mp4") or not entry.is_file(follow_symlinks=False):
+                        continue
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, entry.path, st.st_size))
+        except FileNotFoundError:
+            return 0
+
+        usage = sum(size for _, _, size in entries)
+        cutoff = time.time() - EVICT_GRACE_SECONDS
+        evicted = 0
+        for mtime, path, size in sorted(entries):
+            if usage <= self.cache_max_bytes or mtime > cutoff:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"⚠️ Variante nicht löschbar: {path} - {e}")
+                continue
+            usage -= size
+            evicted += 1
+
+        if evicted:
+            self._evicted += evicted
+            logger.info(f"🧹 Variant-Cache: {evicted} Varianten verdrängt")
+        return evicted
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "workers": self.max_workers,
+            "in_flight": len(self._inflight),
+            "transcoded": self._transcoded,
+            "cache_hits": self._hits,
+            "failed": self._failed,
+            "evicted": self._evicted,
+            "cache_max_bytes": self.cache_max_bytes,
+        }
+
+
+transcoder = Transcoder(
+    enabled=settings.TRANSCODE_ENABLED,
+    max_workers=settings.TRANSCODE_WORKERS,
+    cache_dir=settings.TRANSCODE_CACHE_DIR,
+    cache_max_bytes=int(settings.TRANSCODE_CACHE_MAX_GB * GB),
+    timeout=settings.TRANSCODE_TIMEOUT_SECONDS,
+    web_concurrency=settings.WEB_CONCURRENCY
+)
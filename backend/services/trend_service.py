@@ -0,0 +1,245 @@
+# backend/services/trend_service.py
+"""
+Trending hashtags computed from our own upload history.
+
+Finished uploads are folded into hourly counters (`hashtag_stats`) exactly once,
+a scheduled job condenses the sliding windows into a compact top-k table
+(`trending_hashtags`), and the endpoint serves from a per-process snapshot of
+that table – no scan of `videos` on the request path. The snapshot is
+reloaded by a scheduler job in every worker, so requests never touch the DB.
+"""
+
+import heapq
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models.database import SessionLocal, HashtagStat, TrendingHashtag, VideoModel
+
+logger = logging.getLogger(__name__)
+
+# Sliding windows served by the endpoint
+TREND_WINDOWS: dict[str, timedelta] = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+DEFAULT_WINDOW = "7d"
+# Videos carry no category yet – all history is counted under "default"
+DEFAULT_CATEGORY = "default"
+TOP_K = 20
+
+# Every worker reloads its snapshot on this interval (scheduler thread, see main.py)
+SNAPSHOT_RELOAD_SECONDS = 300
+
+_snapshot: dict[tuple[str, str, str], list[str]] = {}
+
+
+# ---------------------------------------------------------------------------
+# Incremental ingest (called once per finished upload)
+# ---------------------------------------------------------------------------
+
+def _normalize_tag(tag) -> Optional[str]:
+    tag = str(tag).strip().lstrip("#").replace(" ", "").lower()
+    return tag or None
+
+
+def _bucket_start(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _stat_rows(
+    tags: Iterable,
+    successful: Iterable[str],
+    failed: Iterable[str],
+    bucket_start: datetime,
+    category: str = DEFAULT_CATEGORY,
+) -> list[dict]:
+    unique_tags = {t for t in (_normalize_tag(t) for t in tags or []) if t}
+    successful = set(successful)
+    rows = []
+    for platform in successful | set(failed):
+        for tag in unique_tags:
+            rows.append({
+                "platform": platform,
+                "category": category,
+                "bucket_start": bucket_start,
+                "tag": tag,
+                "uses": 1,
+                "successes": 1 if platform in successful else 0,
+            })
+    return rows
+
+
+def _upsert_stats(db: Session, rows: list[dict]):
+    if not rows:
+        return
+    stmt = pg_insert(HashtagStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_hashtag_stats_bucket",
+        set_={
+            "uses": HashtagStat.uses + stmt.excluded.uses,
+            "successes": HashtagStat.successes + stmt.excluded.successes,
+        },
+    )
+    db.execute(stmt)
+
+
+def record_upload_outcome(
+    db: Session,
+    tags: list,
+    successful: list[str],
+    failed: list[str],
+    finished_at: Optional[datetime] = None,
+):
+    """Fold one finished upload into the hourly counters."""
+    rows = _stat_rows(tags, successful, failed, _bucket_start(finished_at or datetime.now()))
+    if not rows:
+        return
+    try:
+        _upsert_stats(db, rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to record hashtag stats: {e}")
+
+
+def _backfill_from_videos(db: Session, since: datetime) -> int:
+    """One-time seed of the counters from existing videos (only when empty)."""
+    videos = db.query(
+        VideoModel.tags, VideoModel.upload_results, VideoModel.errors,
+        VideoModel.updated_at, VideoModel.created_at,
+    ).filter(
+        VideoModel.created_at >= since,
+        VideoModel.status.in_(("uploaded", "partial", "failed")),
+    ).all()
+
+    merged: dict[tuple, dict] = {}
+    for v in videos:
+        finished_at = v.updated_at or v.created_at
+        for row in _stat_rows(
+            v.tags, (v.upload_results or {}).keys(), (v.errors or {}).keys(), _bucket_start(finished_at)
+        ):
+            key = (row["platform"], row["category"], row["bucket_start"], row["tag"])
+            if key in merged:
+                merged[key]["uses"] += row["uses"]
+                merged[key]["successes"] += row["successes"]
+            else:
+                merged[key] = row
+
+    _upsert_stats(db, list(merged.values()))
+    return len(videos)
+
+
+# ---------------------------------------------------------------------------
+# Top-k aggregation (scheduled job)
+# ---------------------------------------------------------------------------
+
+def _score(uses: int, successes: int) -> float:
+    """Usage weighted by success rate – a tag that keeps failing uploads ranks lower."""
+    success_rate = successes / uses if uses else 0.0
+    return uses * (0.5 + 0.5 * success_rate)
+
+
+def refresh_trending_hashtags(db: Session) -> int:
+    """
+    Recompute the top-k table for every window from the hourly counters.
+    Returns the number of rows written.
+    """
+    now = datetime.now()
+    longest = max(TREND_WINDOWS.values())
+
+    if db.query(HashtagStat.id).first() is None:
+        count = _backfill_from_videos(db, now - longest)
+        logger.info(f"Hashtag stats backfilled from {count} videos")
+
+    # Counters outside the longest window are no longer needed
+    db.query(HashtagStat).filter(
+        HashtagStat.bucket_start < _bucket_start(now - longest)
+    ).delete(synchronize_session=False)
+
+    new_rows: list[TrendingHashtag] = []
+    for window, span in TREND_WINDOWS.items():
+        totals = db.query(
+            HashtagStat.platform,
+            HashtagStat.category,
+            HashtagStat.tag,
+            func.sum(HashtagStat.uses).label("uses"),
+            func.sum(HashtagStat.successes).label("successes"),
+        ).filter(
+            HashtagStat.bucket_start >= _bucket_start(now - span)
+        ).group_by(
+            HashtagStat.platform, HashtagStat.category, HashtagStat.tag
+        ).yield_per(1000)
+
+        # Bounded min-heap per (platform, category): memory stays O(groups * k)
+        heaps: dict[tuple[str, str], list] = defaultdict(list)
+        for r in totals:
+            entry = (_score(r.uses, r.successes), r.tag, int(r.uses), int(r.successes))
+            heap = heaps[(r.platform, r.category)]
+            if len(heap) < TOP_K:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        for (platform, category), heap in heaps.items():
+            for rank, (score, tag, uses, successes) in enumerate(sorted(heap, reverse=True), start=1):
+                new_rows.append(TrendingHashtag(
+                    platform=platform,
+                    category=category,
+                    window=window,
+                    rank=rank,
+                    tag=tag,
+                    uses=uses,
+                    success_rate=round(successes / uses, 4) if uses else 0.0,
+                    score=round(score, 4),
+                    computed_at=now,
+                ))
+
+    # Swap the whole table in one transaction
+    db.query(TrendingHashtag).delete(synchronize_session=False)
+    db.add_all(new_rows)
+    db.commit()
+
+    load_snapshot()
+    logger.info(f"Trending hashtags refreshed ({len(new_rows)} rows)")
+    return len(new_rows)
+
+
+# ---------------------------------------------------------------------------
+# Serving
+# ---------------------------------------------------------------------------
+
+def load_snapshot():
+    """Blocking DB read – call from the scheduler thread, never from a request handler."""
+    global _snapshot
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            TrendingHashtag.platform, TrendingHashtag.category,
+            TrendingHashtag.window, TrendingHashtag.tag,
+        ).order_by(TrendingHashtag.rank).all()
+
+        snapshot: dict[tuple[str, str, str], list[str]] = defaultdict(list)
+        for r in rows:
+            snapshot[(r.platform, r.category, r.window)].append(r.tag)
+        _snapshot = dict(snapshot)
+    except Exception as e:
+        logger.error(f"Failed to load trending hashtags: {e}")
+    finally:
+        db.close()
+
+
+def get_trends(platform: str, category: str, window: str = DEFAULT_WINDOW) -> list[str]:
+    """Top-k tags for platform/category/window, falling back to the 'default' category.
+
+    Reads only the in-memory snapshot; empty until the first scheduled reload.
+    """
+    tags = _snapshot.get((platform, category.lower(), window))
+    if not tags:
+        tags = _snapshot.get((platform, DEFAULT_CATEGORY, window), [])
+    return list(tags)
@@ -0,0 +1,250 @@
+"""
+Upload Stream Service
+Multipart-Body direkt aus dem Request-Stream parsen und den Video-Part sofort
+an seinen endgültigen Ort in TEMP_DIR schreiben
+
+- UploadFile spoolt den Body erst in eine SpooledTemporaryFile, FileService kopiert
+  ihn danach nach TEMP_DIR → jedes Byte zweimal auf Disk. Hier: ein Schreibvorgang
+- Parser: python-multipart (wie Starlette), aber mit eigener Senke statt Spool-Datei
+- sha256 und Größenlimit laufen beim Schreiben mit; der Hash wird als content_hash
+  gespeichert (Thumbnails/Varianten müssen die Datei nicht erneut lesen)
+"""
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import anyio
+from fastapi import HTTPException, Request
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+# Puffer pro Schreibvorgang (ein Thread-Hop pro MB statt pro Netzwerk-Chunk)
+WRITE_BUFFER_BYTES = 1024 * 1024
+# Alle Textfelder zusammen (Titel, Beschreibung, Tags, ...)
+MAX_FIELD_BYTES = 256 * 1024
+
+
+@dataclass(slots=True)
+class StreamedFile:
+    path: str
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+
+
+class _FileSink:
+    """Schreibt und hasht einen Datei-Part (blockierend, läuft im Thread)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes):
+        self.file.write(data)
+        self.digest.update(data)
+
+    def close(self):
+        self.file.close()
+
+
+class DirectUploadParser:
+    """
+    Liest einen multipart/form-data Body mit genau einem Datei-Part
+
+    Args:
+        request: eingehender Request (Body wurde noch nicht gelesen)
+        file_field: Name des Datei-Feldes (z.B. "video")
+        directory: Zielverzeichnis der Datei
+        max_bytes: Obergrenze für die Datei (413 bei Überschreitung)
+        accept: (content_type, filename) -> bool, prüft den Part vor dem ersten Byte
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        file_field: str,
+        directory: Path,
+        max_bytes: int,
+        accept: Optional[Callable[[str, str], bool]] = None
+    ):
+        self.request = request
+        self.file_field = file_field
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.accept = accept
+
+        self.fields: Dict[str, str] = {}
+        self._field_bytes = 0
+        self._events: List[Tuple[str, bytes]] = []
+
+        # Zustand des aktuellen Parts
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._name = ""
+        self._value = bytearray()
+        self._is_file = False
+
+        # Datei
+        self._sink: Optional[_FileSink] = None
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._size = 0
+        self._filename = ""
+        self._content_type = ""
+        self._result: Optional[StreamedFile] = None
+
+    # ==========================================
+    # Parser-Callbacks (sammeln nur, Verarbeitung async in _process)
+    # ==========================================
+
+    def _callbacks(self) -> dict:
+        def event(name):
+            return lambda data=b"", start=0, end=0: self._events.append((name, data[start:end]))
+        return {
+            "on_part_begin": event("part_begin"),
+            "on_header_field": event("header_field"),
+            "on_header_value": event("header_value"),
+            "on_header_end": event("header_end"),
+            "on_headers_finished": event("headers_finished"),
+            "on_part_data": event("part_data"),
+            "on_part_end": event("part_end"),
+        }
+
+    async def parse(self) -> Tuple[Dict[str, str], StreamedFile]:
+        """Returns: (Textfelder, gespeicherte Datei); räumt bei jedem Fehler die Teildatei weg"""
+        content_type, params = parse_options_header(self.request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise HTTPException(status_code=400, detail="Erwartet multipart/form-data mit boundary")
+
+        parser = MultipartParser(boundary, self._callbacks())
+        try:
+            async for chunk in self.request.stream():
+                if chunk:
+                    parser.write(chunk)
+                    await self._process()
+            parser.finalize()
+            await self._process()
+        except MultipartParseError as e:
+            self._discard()
+            raise HTTPException(status_code=400, detail=f"Ungültiger multipart-Body: {e}")
+        except BaseException:
+            self._discard()
+            raise
+
+        if self._result is None:
+            self._discard()
+            raise HTTPException(status_code=400, detail=f"Keine Datei im Feld '{self.file_field}'")
+        return self.fields, self._result
+
+    # ==========================================
+    # Verarbeitung
+    # ==========================================
+
+    async def _process(self):
+        events, self._events = self._events, []
+        for name, data in events:
+            if name == "part_begin":
+                self._headers = {}
+                self._value = bytearray()
+                self._is_file = False
+            elif name == "header_field":
+                self._header_field += data
+            elif name == "header_value":
+                self._header_value += data
+            elif name == "header_end":
+                self._headers[self._header_field.lower()] = self._header_value
+                self._header_field, self._header_value = b"", b""
+            elif name == "headers_finished":
+                self._start_part()
+            elif name == "part_data":
+                if self._is_file:
+                    await self._write(data)
+                else:
+                    self._field_bytes += len(data)
+                    if self._field_bytes > MAX_FIELD_BYTES:
+                        raise HTTPException(status_code=413, detail="Formularfelder zu groß")
+                    self._value += data
+            elif name == "part_end":
+                if self._is_file:
+                    await self._finish_file()
+                else:
+                    self.fields[self._name] = self._value.decode("utf-8", errors="replace")
+
+    def _start_part(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        filename = options.get(b"filename")
+        if filename is None:
+            return
+
+        if self._name != self.file_field or self._sink is not None or self._result is not None:
+            raise HTTPException(status_code=400, detail=f"Unerwartete Datei im Feld '{self._name}'")
+
+        self._filename = filename.decode("utf-8", errors="replace")
+        self._content_type = self._headers.get(b"content-type", b"").decode("latin-1")
+        if self.accept and not self.accept(self._content_type, self._filename):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Hochgeladene Datei ist kein Video (Type: {self._content_type})"
+            )
+
+        path = self.directory / f"{uuid.uuid4()}{Path(self._filename).suffix}"
+        self._sink = _FileSink(path)
+        self._is_file = True
+
+    async def _write(self, data: bytes):
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Datei zu groß (maximal {self.max_bytes // (1024 * 1024)} MB)"
+            )
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= WRITE_BUFFER_BYTES:
+            await self._flush()
+
+    async def _flush(self):
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending, self._pending_size = [], 0
+        await anyio.to_thread.run_sync(self._sink.write, data)
+
+    async def _finish_file(self):
+        await self._flush()
+        sink, self._sink = self._sink, None
+        await anyio.to_thread.run_sync(sink.close)
+        self._is_file = False
+        self._result = StreamedFile(
+            path=str(sink.path),
+            filename=self._filename,
+            content_type=self._content_type,
+            size=self._size,
+            sha256=sink.digest.hexdigest(),
+        )
+
+    def _discard(self):
+        """Teildatei bzw. bereits geschriebene Datei entfernen"""
+        paths = []
+        if self._sink is not None:
+            self._sink.close()
+            paths.append(self._sink.path)
+            self._sink = None
+        if self._result is not None:
+            paths.append(Path(self._result.path))
+            self._result = None
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"⚠️ Teildatei nicht löschbar: {path} - {e}")
@@ -1,17 +1,39 @@
+import asyncio
 import logging
-from typing import List, Optional
+import secrets
+from typing import Dict, List, Optional
 from datetime import datetime
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 from models.database import VideoModel
 from models.video import VideoStatus
 from services.file_service import FileService
-from routers.youtube import upload_to_youtube
+from services.trend_service import record_upload_outcome
+from services.metrics_service import PLATFORM_UPLOAD_SECONDS, PREFLIGHT_REJECTED, timed
+from services.tracing_service import SpanContext, tracer
+from services.media_probe_service import MEDIA_COLUMNS, MediaInfo, media_summary
+from services.preflight_service import preflight
+from services.transcode_service import transcoder
+from services.thumbnail_service import thumbnail_store
+from config import settings
+from routers.youtube import upload_to_youtube, delete_from_youtube
+from services.youtube_service import YouTubeReconnectRequired
 from routers.tiktok import upload_to_tiktok
 from routers.instagram import upload_to_instagram
 
 logger = logging.getLogger(__name__)
 file_service = FileService()
 
+# TikTok (Content Posting API) und Instagram (Graph API) bieten kein Löschen an
+PLATFORM_DELETERS = {
+    "youtube": delete_from_youtube,
+}
+
+
+def _media_columns(media: Optional[MediaInfo]) -> dict:
+    # Bulk-INSERT braucht in jeder Zeile dieselben Keys
+    return media.as_columns() if media else dict.fromkeys(MEDIA_COLUMNS)
+
 
 class VideoService:
 
@@ -24,7 +46,9 @@ class VideoService:
         tags: List[str],
         platforms: List[str],
         privacy_status: str,
-        file_path: Optional[str] = None
+        file_path: Optional[str] = None,
+        media: Optional[MediaInfo] = None,
+        content_hash: Optional[str] = None
     ) -> VideoModel:
         video_id = f"video_{int(datetime.now().timestamp() * 1000)}"
 
@@ -38,7 +62,9 @@ class VideoService:
             privacy_status=privacy_status,
             status=VideoStatus.PENDING.value,
             file_path=file_path,
-            created_at=datetime.now()
+            content_hash=content_hash,
+            created_at=datetime.now(),
+            **(media.as_columns() if media else {})
         )
 
         db.add(db_video)
@@ -48,10 +74,58 @@ class VideoService:
         logger.info(f"✅ Video erstellt: {video_id}")
         return db_video
 
+    @staticmethod
+    def create_videos(db: Session, user_id: str, items: List[dict]) -> List[dict]:
+        """
+        Legt mehrere Videos mit einem einzigen Bulk-INSERT an
+
+        Args:
+            items: Dicts mit title, description, tags, platforms, privacy_status, file_path
+                und optional media (MediaInfo)
+
+        Returns:
+            List[dict]: Die eingefügten Zeilen (inkl. id und created_at)
+        """
+        now = datetime.now()
+        base_id = int(now.timestamp() * 1000)
+
+        # Zufalls-Suffix statt Index: parallele Batches in derselben Millisekunde kollidieren sonst
+        rows = [
+            {
+                "id": f"video_{base_id}_{secrets.token_hex(4)}",
+                "user_id": user_id,
+                "title": item["title"],
+                "description": item.get("description", ""),
+                "tags": item.get("tags", []),
+                "platforms": item["platforms"],
+                "privacy_status": item.get("privacy_status", "private"),
+                "status": VideoStatus.PENDING.value,
+                "file_path": item.get("file_path"),
+                "created_at": now,
+                **_media_columns(item.get("media")),
+            }
+            for item in items
+        ]
+
+        if rows:
+            db.execute(insert(VideoModel), rows)
+            db.commit()
+
+        logger.info(f"✅ {len(rows)} Videos erstellt (Bulk)")
+        return rows
+
     @staticmethod
     def get_video(db: Session, video_id: str) -> Optional[VideoModel]:
         return db.query(VideoModel).filter(VideoModel.id == video_id).first()
 
+    @staticmethod
+    def get_video_version(db: Session, video_id: str) -> Optional[datetime]:
+        """Nur der Versions-Zeitstempel (eine Spalte) – für bedingte GETs; None = Video existiert nicht"""
+        row = db.query(func.coalesce(VideoModel.updated_at, VideoModel.created_at)).filter(
+            VideoModel.id == video_id
+        ).first()
+        return row[0] if row else None
+
     @staticmethod
     def get_user_videos(db: Session, user_id: str) -> List[VideoModel]:
         return db.query(VideoModel).filter(
@@ -59,13 +133,25 @@ class VideoService:
         ).order_by(VideoModel.created_at.desc()).all()
 
     @staticmethod
-    def update_status(db: Session, video_id: str, status: VideoStatus):
-        video = db.query(VideoModel).filter(VideoModel.id == video_id).first()
-        if video:
-            video.status = status.value
-            video.updated_at = datetime.now()
-            db.commit()
+    def update_status(db: Session, video_id: str, status: VideoStatus) -> bool:
+        """
+        Ein als deleting markiertes Video behält seinen Status (bedingtes UPDATE,
+        atomar gegenüber dem Bulk-Delete)
+
+        Returns:
+            bool: False wenn das Video fehlt oder gerade gelöscht wird
+        """
+        updated = db.query(VideoModel).filter(
+            VideoModel.id == video_id,
+            VideoModel.status != VideoStatus.DELETING.value
+        ).update(
+            {VideoModel.status: status.value, VideoModel.updated_at: datetime.now()},
+            synchronize_session=False
+        )
+        db.commit()
+        if updated:
             logger.info(f"📝 Video {video_id} - Status: {status}")
+        return updated > 0
 
     @staticmethod
     def add_upload_result(db: Session, video_id: str, platform: str, result: dict):
@@ -97,6 +183,91 @@ class VideoService:
         else:
             raise ValueError(f"Video {video_id} nicht gefunden")
 
+    @staticmethod
+    async def delete_from_platforms(
+        user_id: str,
+        platforms: List[str],
+        upload_results: dict,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Dict[str, str]:
+        """
+        Löscht ein Video parallel auf allen Plattformen (Best Effort)
+
+        Returns:
+            Dict[str, str]: Plattform -> deleted / failed / unsupported / reconnect_required / skipped
+        """
+        semaphore = semaphore or asyncio.Semaphore(settings.PLATFORM_DELETE_CONCURRENCY)
+
+        async def _delete(platform: str):
+            result = upload_results.get(platform) or {}
+            if not result:
+                logger.info(f"ℹ️ Kein Upload auf {platform} – überspringe")
+                return platform, "skipped"
+
+            deleter = PLATFORM_DELETERS.get(platform)
+            if not deleter:
+                logger.info(f"ℹ️ {platform} unterstützt kein Löschen über die API")
+                return platform, "unsupported"
+
+            platform_video_id = result.get("video_id")
+            if not platform_video_id:
+                logger.info(f"ℹ️ Keine Plattform-Video-ID für {platform} – überspringe")
+                return platform, "skipped"
+
+            async with semaphore:
+                try:
+                    await deleter(user_id, platform_video_id)
+                    logger.info(f"✅ Video von {platform} gelöscht")
+                    return platform, "deleted"
+                except YouTubeReconnectRequired as e:
+                    logger.warning(f"⚠️ {platform}: {e}")
+                    return platform, "reconnect_required"
+                except Exception as e:
+                    logger.warning(f"⚠️ Platform-Delete fehlgeschlagen ({platform}): {str(e)}")
+                    return platform, "failed"
+
+        results = await asyncio.gather(*(_delete(p) for p in platforms))
+        return dict(results)
+
+    @staticmethod
+    async def delete_videos_background(video_ids: List[str], user_id: str, trace_context: Optional[SpanContext] = None):
+        """Background Task: Bulk-Delete auf Plattformen, dann Datei + DB-Zeile"""
+        from models.database import SessionLocal
+        db = SessionLocal()
+
+        with tracer.span("job.bulk_delete", parent=trace_context, user_id=user_id, videos=len(video_ids)):
+            try:
+                videos = db.query(VideoModel).filter(
+                    VideoModel.id.in_(video_ids),
+                    VideoModel.user_id == user_id
+                ).all()
+
+                # Eine gemeinsame Grenze für alle Plattform-Calls des Batches
+                semaphore = asyncio.Semaphore(settings.PLATFORM_DELETE_CONCURRENCY)
+                await asyncio.gather(*(
+                    VideoService.delete_from_platforms(
+                        user_id, v.platforms or [], v.upload_results or {}, semaphore
+                    )
+                    for v in videos
+                ))
+
+                hashes = [v.content_hash for v in videos]
+                for v in videos:
+                    if v.file_path:
+                        file_service.delete_file(v.file_path)
+                    db.delete(v)
+                db.commit()
+                thumbnail_store.release(db, hashes)
+
+                logger.info(f"🗑️ Bulk-Delete abgeschlossen: {len(videos)} Videos (User: {user_id})")
+
+            except Exception as e:
+                db.rollback()
+                logger.error(f"❌ Bulk-Delete fehlgeschlagen: {str(e)}")
+
+            finally:
+                db.close()
+
     @staticmethod
     async def process_video_upload(video_id: str, temp_file_path: str):
         """Background Task: Upload auf alle Plattformen"""
@@ -109,21 +280,48 @@ class VideoService:
                 logger.error(f"❌ Video {video_id} nicht gefunden")
                 return
 
-            VideoService.update_status(db, video_id, VideoStatus.PROCESSING)
+            if not VideoService.update_status(db, video_id, VideoStatus.PROCESSING):
+                logger.warning(f"⚠️ Video {video_id} wird gelöscht – Upload übersprungen")
+                return
 
             successful = []
             failed = []
 
-            if "youtube" in video.platforms:
+            # Optionale Varianten (9:16 H.264, Bitrate nach Größenlimit) – gecacht pro Inhalt
+            media = media_summary(video)
+            variants = await transcoder.prepare(video.platforms, temp_file_path, media, video.content_hash)
+            upload_paths = {platform: variant.path for platform, variant in variants.items()}
+
+            # Preflight: Strecken, die die Plattform sicher ablehnt, gar nicht erst hochladen
+            blocked = {}
+            for platform in video.platforms:
+                variant = variants.get(platform)
+                blocked.update(preflight(
+                    [platform],
+                    variant.media if variant else media,
+                    variant.path if variant else temp_file_path
+                ))
+            for platform, error in blocked.items():
+                logger.warning(f"⛔ {platform} Preflight fehlgeschlagen für {video_id}: {error}")
+                VideoService.add_upload_error(db, video_id, platform, error)
+                PREFLIGHT_REJECTED.labels(platform=platform).inc()
+                failed.append(platform)
+
+            if "youtube" in video.platforms and "youtube" not in blocked:
                 try:
-                    result = upload_to_youtube(
-                        video.user_id,
-                        temp_file_path,
-                        video.title,
-                        video.description or "",
-                        video.tags or [],
-                        video.privacy_status
-                    )
+                    with timed(PLATFORM_UPLOAD_SECONDS, platform="youtube"), \
+                            tracer.span("upload.youtube", video_id=video_id, platform="youtube"):
+                        # Blockierender Google-Client → Thread, damit der Worker weiter Requests bedient
+                        result = await asyncio.to_thread(
+                            upload_to_youtube,
+                            video.user_id,
+                            upload_paths.get("youtube", temp_file_path),
+                            video.title,
+                            video.description or "",
+                            video.tags or [],
+                            video.privacy_status,
+                            thumbnail_path=thumbnail_store.cover_path(video) if settings.YOUTUBE_SET_THUMBNAIL else None
+                        )
                     VideoService.add_upload_result(db, video_id, "youtube", result)
                     successful.append("youtube")
                     logger.info(f"✅ YouTube Upload erfolgreich: {video_id}")
@@ -132,15 +330,18 @@ class VideoService:
                     VideoService.add_upload_error(db, video_id, "youtube", str(e))
                     failed.append("youtube")
 
-            if "tiktok" in video.platforms:
+            if "tiktok" in video.platforms and "tiktok" not in blocked:
                 try:
-                    result = await upload_to_tiktok(
-                        video.user_id,
-                        temp_file_path,
-                        video.title,
-                        video.description or "",
-                        video.tags or []
-                    )
+                    with timed(PLATFORM_UPLOAD_SECONDS, platform="tiktok"), \
+                            tracer.span("upload.tiktok", video_id=video_id, platform="tiktok"):
+                        result = await upload_to_tiktok(
+                            video.user_id,
+                            upload_paths.get("tiktok", temp_file_path),
+                            video.title,
+                            video.description or "",
+                            video.tags or [],
+                            cover_timestamp_ms=video.cover_timestamp_ms
+                        )
                     VideoService.add_upload_result(db, video_id, "tiktok", result)
                     successful.append("tiktok")
                     logger.info(f"✅ TikTok Upload erfolgreich: {video_id}")
@@ -149,13 +350,16 @@ class VideoService:
                     VideoService.add_upload_error(db, video_id, "tiktok", str(e))
                     failed.append("tiktok")
 
-            if "instagram" in video.platforms:
+            if "instagram" in video.platforms and "instagram" not in blocked:
                 try:
-                    result = await upload_to_instagram(
-                        video.user_id,
-                        temp_file_path,
-                        video.title
-                    )
+                    with timed(PLATFORM_UPLOAD_SECONDS, platform="instagram"), \
+                            tracer.span("upload.instagram", video_id=video_id, platform="instagram"):
+                        result = await upload_to_instagram(
+                            video.user_id,
+                            upload_paths.get("instagram", temp_file_path),
+                            video.title,
+                            duration_seconds=video.duration_seconds
+                        )
                     VideoService.add_upload_result(db, video_id, "instagram", result)
                     successful.append("instagram")
                     logger.info(f"✅ Instagram Upload erfolgreich: {video_id}")
@@ -172,6 +376,9 @@ class VideoService:
             else:
                 VideoService.update_status(db, video_id, VideoStatus.FAILED)
 
+            # Hashtag-Trends inkrementell fortschreiben
+            record_upload_outcome(db, video.tags or [], successful, failed)
+
             # file_path aus DB leeren – Datei wird unten gelöscht
             video = VideoService.get_video(db, video_id)
             if video:
@@ -1,18 +1,61 @@
 ﻿"""
 YouTube Upload Service
 """
+import functools
+import json
 import logging
 import os
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google.oauth2.credentials import Credentials
+from typing import TYPE_CHECKING
 from config import settings
+from utils.lazy_imports import lazy_module
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
 
 logger = logging.getLogger(__name__)
 
-# OAuth Scopes
-SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
+# Google SDKs erst beim ersten OAuth-/Upload-Call laden (~0,4 s Importzeit pro Worker)
+google_flow = lazy_module("google_auth_oauthlib.flow")
+discovery = lazy_module("googleapiclient.discovery")
+discovery_cache = lazy_module("googleapiclient.discovery_cache")
+googleapiclient_http = lazy_module("googleapiclient.http")
+
+# OAuth Scopes – force-ssl für videos().delete (youtube.upload allein → 403)
+SCOPES = [
+    'https://www.googleapis.com/auth/youtube.upload',
+    'https://www.googleapis.com/auth/youtube.force-ssl',
+]
+# Jeder dieser Scopes erlaubt das Löschen
+DELETE_SCOPES = {
+    'https://www.googleapis.com/auth/youtube',
+    'https://www.googleapis.com/auth/youtube.force-ssl',
+}
+
+
+class YouTubeReconnectRequired(Exception):
+    """Verbindung stammt aus der Zeit vor dem Delete-Scope → User muss YouTube neu verbinden"""
+
+
+def granted_scopes(credentials) -> set:
+    """Scopes aus Credentials-Objekt oder gespeichertem Token-Dict"""
+    if isinstance(credentials, dict):
+        return set(credentials.get("scopes") or [])
+    return set(getattr(credentials, "granted_scopes", None) or credentials.scopes or [])
+
+
+def can_delete(credentials) -> bool:
+    return bool(granted_scopes(credentials) & DELETE_SCOPES)
+
+
+def connection_needs_reconnect(connection) -> bool:
+    """PlatformConnection-Zeile: YouTube-Token (JSON in access_token) ohne Delete-Scope"""
+    if connection.platform != "youtube":
+        return False
+    try:
+        token = json.loads(connection.access_token or "")
+    except (TypeError, ValueError):
+        return True
+    return not isinstance(token, dict) or not can_delete(token)
 
 
 def get_youtube_auth_url(client_secrets_path: str, user_id: str):
@@ -25,9 +68,9 @@ def get_youtube_auth_url(client_secrets_path: str, user_id: str):
     
     logger.info(f"ðŸ”— Redirect URI: {redirect_uri}")
     
-    flow = Flow.from_client_secrets_file(
+    flow = google_flow.Flow.from_client_secrets_file(
         client_secrets_path,
-        scopes=["https://www.googleapis.com/auth/youtube.upload"],
+        scopes=SCOPES,
         redirect_uri=redirect_uri,
         state=user_id  # State ist bereits "user_517b3b295a111f54"
     )
@@ -55,9 +98,9 @@ def authenticate_youtube_with_code(client_secrets_path: str, code: str, user_id:
         logger.info(f"ðŸ” Authentifiziere YouTube fÃ¼r User {user_id}")
         logger.info(f"ðŸ”— Redirect URI: {redirect_uri}")
         
-        flow = Flow.from_client_secrets_file(
+        flow = google_flow.Flow.from_client_secrets_file(
             client_secrets_path,
-            scopes=["https://www.googleapis.com/auth/youtube.upload"],
+            scopes=SCOPES,
             redirect_uri=redirect_uri  # âœ… Muss identisch sein!
         )
         
@@ -75,10 +118,32 @@ def authenticate_youtube_with_code(client_secrets_path: str, code: str, user_id:
 
 
 
-def build_youtube_service(credentials: Credentials):
+@functools.lru_cache(maxsize=1)
+def _load_discovery_document():
+    """
+    Lädt das mitgelieferte (statische) YouTube Discovery-Dokument einmal pro Prozess
+    
+    Returns:
+        dict oder None, falls die installierte Library kein statisches Dokument enthält
+    """
+    document = discovery_cache.get_static_doc('youtube', 'v3')
+    if not document:
+        logger.warning("⚠️ Kein statisches YouTube Discovery-Dokument gefunden")
+        return None
+    document = json.loads(document)
+    if settings.YOUTUBE_API_ROOT:
+        # Gilt auch für den Media-Upload-Pfad (rootUrl + "upload/...")
+        document["rootUrl"] = settings.YOUTUBE_API_ROOT.rstrip("/") + "/"
+    return document
+
+
+def build_youtube_service(credentials: "Credentials"):
     """
     Erstellt YouTube Service aus Credentials
     
+    Nutzt das einmal geparste Discovery-Dokument – kein Netzwerk-I/O und kein
+    erneutes JSON-Parsing pro Upload.
+    
     Args:
         credentials: Google OAuth2 Credentials
         
@@ -86,8 +151,12 @@ def build_youtube_service(credentials: Credentials):
         YouTube API Service
     """
     try:
-        youtube = build('youtube', 'v3', credentials=credentials)
-        logger.info("âœ… YouTube Service erstellt")
+        document = _load_discovery_document()
+        if document is not None:
+            youtube = discovery.build_from_document(document, credentials=credentials)
+        else:
+            youtube = discovery.build('youtube', 'v3', credentials=credentials)
+        logger.debug("✅ YouTube Service erstellt")
         return youtube
     except Exception as e:
         logger.error(f"âŒ Fehler beim Erstellen des YouTube Service: {str(e)}")
@@ -95,12 +164,13 @@ def build_youtube_service(credentials: Credentials):
 
 
 def upload_video_to_youtube(
-    credentials: Credentials,
+    credentials: "Credentials",
     video_path: str,
     title: str,
     description: str = "",
     tags: list = None,
-    privacy_status: str = "private"
+    privacy_status: str = "private",
+    thumbnail_path: str = None
 ) -> dict:
     """
     LÃ¤dt ein Video auf YouTube hoch
@@ -112,6 +182,7 @@ def upload_video_to_youtube(
         description: Video-Beschreibung
         tags: Liste von Tags
         privacy_status: Privacy Status (public/private/unlisted)
+        thumbnail_path: JPEG für thumbnails.set (optional, Fehler brechen den Upload nicht ab)
         
     Returns:
         Upload-Ergebnis mit Video-ID
@@ -137,7 +208,7 @@ def upload_video_to_youtube(
         }
         
         # Media Upload vorbereiten
-        media = MediaFileUpload(
+        media = googleapiclient_http.MediaFileUpload(
             video_path,
             chunksize=-1,
             resumable=True
@@ -154,6 +225,18 @@ def upload_video_to_youtube(
         
         video_id = response.get('id')
         video_url = f"https://www.youtube.com/watch?v={video_id}"
+
+        thumbnail_set = False
+        if thumbnail_path:
+            try:
+                youtube.thumbnails().set(
+                    videoId=video_id,
+                    media_body=googleapiclient_http.MediaFileUpload(thumbnail_path, mimetype='image/jpeg')
+                ).execute()
+                thumbnail_set = True
+            except Exception as e:
+                # z.B. Kanal nicht verifiziert – Video ist trotzdem hochgeladen
+                logger.warning(f"⚠️ YouTube-Thumbnail nicht gesetzt: {str(e)}")
         
         logger.info(f"âœ… YouTube-Upload erfolgreich: {video_url}")
         
@@ -161,9 +244,26 @@ def upload_video_to_youtube(
             'video_id': video_id,
             'url': video_url,
             'title': title,
-            'privacy_status': privacy_status
+            'privacy_status': privacy_status,
+            'thumbnail_set': thumbnail_set
         }
         
     except Exception as e:
         logger.error(f"âŒ YouTube-Upload fehlgeschlagen: {str(e)}")
         raise
+
+
+def delete_video_from_youtube(credentials: "Credentials", video_id: str):
+    """
+    Löscht ein Video auf YouTube
+
+    Hinweis: Erfordert den Scope youtube oder youtube.force-ssl –
+    Verbindungen mit reinem youtube.upload Scope werden abgelehnt (403).
+    """
+    try:
+        youtube = build_youtube_service(credentials)
+        youtube.videos().delete(id=video_id).execute()
+        logger.info(f"🗑️ YouTube-Video gelöscht: {video_id}")
+    except Exception as e:
+        logger.error(f"❌ YouTube-Löschen fehlgeschlagen: {str(e)}")
+        raise
@@ -1,8 +1,10 @@
 # utils/auth.py
 
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from fastapi import HTTPException
+from fastapi import HTTPException, Header
 import logging
 from config import settings  # ✅ Importiere settings
 
@@ -11,6 +13,11 @@ logger = logging.getLogger(__name__)
 SECRET_KEY = settings.JWT_SECRET  # ✅ JWT_SECRET, nicht JWT_SECRET_KEY!
 ALGORITHM = settings.JWT_ALGORITHM  # ✅ Nutze auch den Algorithm aus config
 
+# Kleiner TTL-Cache bereits verifizierter Tokens (pro Worker)
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_MAX_SIZE = 1024
+_verified_tokens: "OrderedDict[str, tuple[dict, float]]" = OrderedDict()
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """
     Erstellt JWT Access Token
@@ -24,12 +31,9 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     
     to_encode.update({"exp": expire})
     
-    logger.info(f"🔐 Creating token with data: {to_encode}")
-    logger.info(f"🔑 Using SECRET_KEY: {SECRET_KEY[:10]}...")
-    
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     
-    logger.info(f"✅ Token created: {encoded_jwt[:30]}...")
+    logger.debug(f"✅ Token created for user_id={to_encode.get('user_id')}")
     
     return encoded_jwt
 
@@ -39,17 +43,52 @@ def decode_access_token(token: str):
     Dekodiert und validiert JWT Token
     """
     try:
-        logger.info(f"🔓 Decoding token: {token[:30]}...")
-        logger.info(f"🔑 Using SECRET_KEY: {SECRET_KEY[:10]}...")
-        
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         
-        logger.info(f"✅ Token decoded successfully: {payload}")
+        logger.debug(f"✅ Token decoded for user_id={payload.get('user_id')}")
         
         return payload
     except JWTError as e:
-        logger.error(f"❌ JWT decode failed: {str(e)}")
+        logger.warning(f"❌ JWT decode failed: {str(e)}")
         raise HTTPException(401, f"Invalid token: {str(e)}")
 
 
+def verify_access_token(token: str) -> dict:
+    """
+    Verifiziert Signatur + Claims (exp, user_id) – mit TTL-Cache, ohne DB
+    """
+    now = time.time()
+    cached = _verified_tokens.get(token)
+    if cached and cached[1] > now:
+        _verified_tokens.move_to_end(token)
+        return cached[0]
+    
+    payload = decode_access_token(token)
+    if not payload.get("user_id"):
+        raise HTTPException(401, "Invalid token")
+    
+    # Nie länger cachen als das Token selbst gültig ist
+    expires_at = min(now + TOKEN_CACHE_TTL_SECONDS, payload.get("exp", now))
+    _verified_tokens[token] = (payload, expires_at)
+    _verified_tokens.move_to_end(token)
+    while len(_verified_tokens) > TOKEN_CACHE_MAX_SIZE:
+        _verified_tokens.popitem(last=False)
+    
+    return payload
+
+
+async def get_current_user_claims(authorization: str = Header(...)) -> dict:
+    """
+    Leichtgewichtige Auth-Dependency: nur JWT prüfen, keine DB-Queries
+    
+    Returns:
+        dict: {"user_id": ..., "email": ...}
+    """
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(401, "Invalid authorization header")
+    
+    payload = verify_access_token(authorization[len("Bearer "):])
+    return {"user_id": payload["user_id"], "email": payload.get("sub")}
+
+
 
@@ -0,0 +1,82 @@
+"""
+HTTP Caching Helpers
+ETag/Last-Modified und bedingte Requests (If-None-Match / If-Modified-Since)
+
+- weak_etag: aus Versions-Bestandteilen (id, updated_at, Zähler) – kein Hash über den Body,
+  damit ein 304 schon nach einer reinen Versionsabfrage möglich ist
+- If-None-Match hat Vorrang; If-Modified-Since nur ohne ETag-Bedingung (RFC 9110)
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Bei jeder Änderung am Payload-Format erhöhen → alte ETags werden ungültig
+PAYLOAD_VERSION = "1"
+
+# Polling-Endpoints: Browser darf speichern, muss aber jedes Mal revalidieren
+REVALIDATE = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    raw = "|".join(str(part) for part in (PAYLOAD_VERSION, *parts))
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Zeitstempel in der DB sind naive Lokalzeit (datetime.now)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etags: Iterable[str]) -> bool:
+    """Schwacher Vergleich: W/-Präfix wird ignoriert, "*" passt immer"""
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    return any(tag.removeprefix("W/") in candidates for tag in etags)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return etag_matches(if_none_match, [etag])
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # Sekunden-Auflösung: nur "nicht geändert", wenn die Version vor der vollen Sekunde lag
+        return int(_as_utc(last_modified).timestamp()) < int(since.timestamp())
+    return False
+
+
+def cache_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = REVALIDATE,
+    vary: Optional[str] = None
+) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if vary:
+        headers["Vary"] = vary
+    return headers
+
+
+def not_modified(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = REVALIDATE,
+    vary: Optional[str] = None
+) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, last_modified, cache_control, vary))
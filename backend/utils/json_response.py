@@ -0,0 +1,37 @@
+"""
+JSON Responses mit orjson
+Default-Response-Klasse der App + schneller Pfad für heiße Endpoints
+
+- FastJSONResponse rendert per orjson (datetime, Enum, dataclasses nativ, ohne isoformat() pro Zeile)
+- Als default_response_class läuft trotzdem FastAPIs jsonable_encoder davor;
+  heiße Endpoints geben FastJSONResponse(payload) direkt zurück und sparen sich auch den
+  jsonable_encoder-Durchlauf
+- Payloads: slots-Dataclasses aus models.responses (response_model nur noch für die Doku)
+"""
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    """Typen, die orjson nicht selbst kennt"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
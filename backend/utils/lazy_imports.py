@@ -0,0 +1,107 @@
+"""
+Lazy Imports
+Schwere, optionale SDKs erst beim ersten Zugriff laden statt beim Worker-Start
+
+- lazy_module("requests") liefert einen Platzhalter; der erste Attributzugriff
+  importiert das Modul (einmal pro Prozess) und loggt die Ladezeit
+- startup_report: Importzeit von main.py + Liste schwerer Module, die trotzdem
+  beim Start geladen wurden (Regressionen fallen sofort im Log auf)
+
+Detaillierte Aufschlüsselung pro Modul: PYTHONPROFILEIMPORTTIME=1 (wie -X importtime)
+oder benchmarks/startup_budget.py.
+"""
+import importlib
+import logging
+import sys
+import threading
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Module, die nie beim Worker-Start geladen werden sollen
+HEAVY_MODULES = (
+    "openai",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "google.oauth2",
+    "httpx",
+    "requests",
+    "passlib",
+)
+
+_load_times: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """Platzhalter für ein Modul, das beim ersten Attributzugriff importiert wird"""
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            name = self.__dict__["_name"]
+            with _lock:
+                already_loaded = name in sys.modules
+                start = time.perf_counter()
+                module = importlib.import_module(name)
+                if not already_loaded:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    _load_times[name] = elapsed_ms
+                    logger.info(f"📦 {name} bei erster Nutzung geladen ({elapsed_ms:.0f} ms)")
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        # z.B. Monkeypatching (Tracing) landet im echten Modul
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "geladen" if self.__dict__["_module"] is not None else "nicht geladen"
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def eager_heavy_modules() -> List[str]:
+    """Schwere Module, die bereits importiert sind"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+class StartupReport:
+    """Misst die Importzeit von main.py (vom Import dieses Moduls bis mark_imports_done)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports_ms = None
+        self.eager: List[str] = []
+
+    def mark_imports_done(self):
+        self.imports_ms = (time.perf_counter() - self.started) * 1000
+        self.eager = eager_heavy_modules()
+
+    def log(self):
+        if self.imports_ms is None:
+            return
+        logger.info(f"⏱️ Startup-Imports: {self.imports_ms:.0f} ms ({len(sys.modules)} Module)")
+        if self.eager:
+            logger.warning(f"⚠️ Schwere Module beim Start geladen: {', '.join(self.eager)}")
+
+    def stats(self) -> dict:
+        return {
+            "imports_ms": round(self.imports_ms, 1) if self.imports_ms is not None else None,
+            "eager_heavy_modules": self.eager,
+            "lazy_loaded_ms": {name: round(ms, 1) for name, ms in _load_times.items()},
+        }
+
+
+startup_report = StartupReport()
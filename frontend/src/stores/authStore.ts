@@ -7,6 +7,7 @@ export interface ConnectedPlatform {
   username?: string;
   channelId?: string;
   connectedAt?: string;
+  needsReconnect?: boolean;
 }
 
 export interface User {